@@ -20,7 +20,7 @@ class AccountAnalyzer:
         """Fetch the top tweets for an account"""
         reply_tweets = await self.api_client.api_get_account_by_id_top_tweets(screen_name, limit=50, replies=True)
         non_reply_tweets = await self.api_client.api_get_account_by_id_top_tweets(screen_name, limit=50, replies=False)
-        tweets = reply_tweets + non_reply_tweets
+        tweets = (reply_tweets or []) + (non_reply_tweets or [])
         
         return tweets
     
@@ -1,80 +1,283 @@
 import requests
 import aiohttp
-from typing import Optional, Dict, Any
+import asyncio
+import random
+import copy
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, List, Callable, AsyncIterator, Tuple
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
+from config import config
+from rate_limiter import RateLimiter
+from circuit_breaker import CircuitBreakerRegistry
+from response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+BASE_URL = f'{config.SOCIAL_DATA_BASE_URL}/twitter'
+
+
+def endpoint_name(url: str) -> str:
+    """Name the SocialData endpoint a URL targets, used for limits and stats"""
+    parts = url.split('/twitter/', 1)[-1].split('?')[0].split('/')
+    if parts[0] == 'tweets' and len(parts) > 2:
+        return parts[2]
+    if parts[0] == 'community' and len(parts) > 2:
+        return 'community_tweets'
+    return parts[0]
+
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RECENT_RESULTS_LIMIT = 1024
+
+
+def backoff_delay(attempt: int) -> float:
+    """Capped exponential backoff with full jitter"""
+    ceiling = min(config.SOCIALDATA_BACKOFF_CAP, config.SOCIALDATA_BACKOFF_BASE * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), config.SOCIALDATA_RETRY_AFTER_CAP)
+
+
+TWITTER_EPOCH_MS = 1288834974657
+
+
+def snowflake_timestamp(tweet_id: str) -> float:
+    """Creation time encoded in a tweet id"""
+    return ((int(tweet_id) >> 22) + TWITTER_EPOCH_MS) / 1000
+
+
+class SocialDataError(Exception):
+    """Raised when a SocialData request fails for good"""
+    pass
+
+
+class TransientAPIError(Exception):
+    """A retryable SocialData response such as 429 or 5xx"""
+    pass
+
+
 class TwitterAPIClient:
+    # One pooled session and one limiter per process, shared by every client instance
+    _session: Optional[aiohttp.ClientSession] = None
+    limiter: RateLimiter = RateLimiter.from_config()
+    breakers: CircuitBreakerRegistry = CircuitBreakerRegistry.from_config()
+    # Single-flight requests and recently finished results, keyed by url and params
+    _in_flight: Dict[Tuple, Dict[str, Any]] = {}
+    _recent: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+    coalesce_stats: Dict[str, int] = {'sent': 0, 'joined': 0, 'reused': 0}
+    response_cache: ResponseCache = ResponseCache.from_config()
+
     def __init__(self, api_key: str):
         self.api_key = api_key
         
     def get_headers(self):
         return {
             'Authorization': f'Bearer {self.api_key}',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Accept-Encoding': 'br, gzip, deflate'
         }
-        
+
+    @classmethod
+    def open_session(cls) -> aiohttp.ClientSession:
+        """Create the shared keep-alive session if it is not already open"""
+        if cls._session is None or cls._session.closed:
+            try:
+                resolver = aiohttp.AsyncResolver()
+            except Exception as e:
+                logger.warning(f"Async DNS resolver unavailable, using default: {str(e)}")
+                resolver = None
+            connector = aiohttp.TCPConnector(
+                limit=config.HTTP_POOL_LIMIT,
+                limit_per_host=config.HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=config.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+                resolver=resolver
+            )
+            cls._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT)
+            )
+            logger.info("Opened shared SocialData HTTP session")
+        return cls._session
+
+    @classmethod
+    async def close_session(cls):
+        """Close the shared session, releasing pooled connections"""
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+            logger.info("Closed shared SocialData HTTP session")
+        cls._session = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        # Lazily open for code paths that run outside the app lifecycle
+        return self.open_session()
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                        reuse_seconds: float = 0) -> Dict[str, Any]:
+        """Send one GET to SocialData, sharing it with identical concurrent requests.
+
+        Callers asking for the same endpoint and parameters while a request is
+        in flight await that request instead of sending their own. With
+        `reuse_seconds`, a successful result is also handed to identical
+        requests made shortly afterwards. Results are only copied when shared:
+        joined and reused callers get deep copies, the sender gets the decoded
+        object itself unless someone joined, and the remembered result is a
+        copy of its own.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        now = time.monotonic()
+
+        if reuse_seconds:
+            recent = self._recent.get(key)
+            if recent and recent[0] > now:
+                self.coalesce_stats['reused'] += 1
+                return copy.deepcopy(recent[1])
+
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            flight['joined'] += 1
+            self.coalesce_stats['joined'] += 1
+            return copy.deepcopy(await asyncio.shield(flight['task']))
+
+        task = asyncio.ensure_future(self._request_json(url, params))
+        flight = {'task': task, 'joined': 0}
+        self._in_flight[key] = flight
+        self.coalesce_stats['sent'] += 1
+
+        def _finish(done: asyncio.Future):
+            self._in_flight.pop(key, None)
+            if reuse_seconds and not done.cancelled() and done.exception() is None:
+                self._remember(key, copy.deepcopy(done.result()), reuse_seconds)
+
+        task.add_done_callback(_finish)
+        result = await asyncio.shield(task)
+        # Joiners copy the same object, so the sender must not hand it out for mutation
+        return copy.deepcopy(result) if flight['joined'] else result
+
+    async def _get_cached_json(self, url: str) -> Dict[str, Any]:
+        """Serve profile and community lookups from the TTL cache, fetching on a miss"""
+        endpoint = endpoint_name(url)
+        if not self.response_cache.caches(endpoint):
+            return await self._get_json(url, reuse_seconds=config.SOCIALDATA_REUSE_SECONDS)
+
+        # Screen names are case-insensitive
+        key = url.lower()
+        cached = await self.response_cache.get(endpoint, key)
+        if cached is not None:
+            return cached
+
+        data = await self._get_json(url, reuse_seconds=config.SOCIALDATA_REUSE_SECONDS)
+        if isinstance(data, dict) and data.get('status') != 'error':
+            await self.response_cache.set(endpoint, key, data)
+        return data
+
+    @classmethod
+    def _remember(cls, key: Tuple, data: Dict[str, Any], reuse_seconds: float):
+        now = time.monotonic()
+        if len(cls._recent) >= RECENT_RESULTS_LIMIT:
+            for stale in [k for k, (expires, _) in cls._recent.items() if expires <= now]:
+                del cls._recent[stale]
+            while len(cls._recent) >= RECENT_RESULTS_LIMIT:
+                del cls._recent[next(iter(cls._recent))]
+        cls._recent[key] = (now + reuse_seconds, data)
+
+    async def _request_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send one GET to SocialData and return the decoded body.
+
+        Requests are rate limited, retried on 429, 5xx, timeouts and connection
+        errors with capped exponential backoff and jitter (or the server's
+        Retry-After), and fail fast while the endpoint's circuit is open.
+        """
+        endpoint = endpoint_name(url)
+        breaker = self.breakers.get(endpoint)
+        timeout = aiohttp.ClientTimeout(total=config.SOCIALDATA_REQUEST_TIMEOUT)
+        attempt = 0
+        while True:
+            breaker.check()
+            retry_after = None
+            probe = False
+            try:
+                # Pause and budget checks run before the breaker admits the call,
+                # so they can never take the half-open probe slot
+                async with self.limiter.acquire(endpoint, admit=breaker.before_call) as probe:
+                    session = self.get_session()
+                    async with session.get(url, headers=self.get_headers(), params=params or {}, timeout=timeout) as response:
+                        if response.status in RETRYABLE_STATUSES:
+                            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                            raise TransientAPIError(f"HTTP {response.status}")
+                        data = await response.json(content_type=None)
+            except (TransientAPIError, asyncio.TimeoutError, aiohttp.ClientError) as e:
+                breaker.record_failure()
+                attempt += 1
+                error = str(e) or type(e).__name__
+                if attempt > config.SOCIALDATA_MAX_RETRIES:
+                    raise SocialDataError(f"{endpoint} request failed after {attempt} attempts: {error}") from e
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                logger.warning(f"Retrying {endpoint} request in {delay:.1f}s (attempt {attempt}): {error}")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Paused, over budget, undecodable or cancelled: no verdict on the endpoint
+                if probe:
+                    breaker.release_probe()
+                raise
+
+            breaker.record_success()
+            if isinstance(data, dict) and data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
+                self.limiter.record_insufficient_balance()
+            return data
+
+    @classmethod
+    def get_state(cls) -> Dict[str, Any]:
+        """Limiter, budget and circuit state shared by all clients"""
+        return {
+            'limiter': cls.limiter.state(),
+            'circuits': cls.breakers.state(),
+            'coalescing': dict(cls.coalesce_stats),
+            'response_cache': cls.response_cache.state()
+        }
+
     async def api_get_account_by_id(self, account_id: str) -> Optional[Dict[str, Any]]:
         try:
-            url = f'https://api.socialdata.tools/twitter/user/{account_id}'
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.get_headers()) as response:
-                    data = await response.json()
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting user details")
-                        return None
-                    return data
+            url = f'{BASE_URL}/user/{account_id}'
+            data = await self._get_cached_json(url)
+            if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
+                logger.error("Insufficient balance when getting user details")
+                return None
+            return data
         except Exception as e:
             logger.error(f"Error getting user details: {str(e)}")
             return None
     
     async def api_get_account_by_screen_name(self, screen_name: str) -> Optional[Dict[str, Any]]:
         try:
-            url = f'https://api.socialdata.tools/twitter/user/{screen_name}'
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.get_headers()) as response:
-                    data = await response.json()
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting user details")
-                        return None
-                    return data
+            url = f'{BASE_URL}/user/{screen_name}'
+            data = await self._get_cached_json(url)
+            if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
+                logger.error("Insufficient balance when getting user details")
+                return None
+            return data
         except Exception as e:
             logger.error(f"Error getting user details: {str(e)}")
             return None
     async def api_get_list_tweets(self, list_id: str, limit: int = 100) -> Optional[Dict[str, Any]]:
         try:
-            all_tweets = []
-            next_cursor = None
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    url = f'https://api.socialdata.tools/twitter/list/{list_id}/tweets'
-                    params = {}
-                    if next_cursor:
-                        params['cursor'] = next_cursor
-                        
-                    async with session.get(url, headers=self.get_headers(), params=params) as response:
-                        data = await response.json()
-                        
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting list tweets")
-                        return None
-                    
-                    if 'tweets' in data:
-                        all_tweets.extend(data['tweets'])
-                        
-                        # Break if we've reached the desired limit
-                        if len(all_tweets) >= limit:
-                            all_tweets = all_tweets[:limit]
-                            break
-                    
-                    next_cursor = data.get('next_cursor')
-                    if not next_cursor:
-                        break
-                   
-            return all_tweets
+            return await self.iter_list_tweets(list_id, max_items=limit).collect()
         except Exception as e:
             logger.error(f"Error getting list tweets: {str(e)}")
             return None
@@ -83,112 +286,37 @@ class TwitterAPIClient:
 
     async def api_get_account_by_id_top_tweets(self, screen_name: str, limit: int = 50, replies: bool = False) -> Optional[Dict[str, Any]]:
         try:
-            all_tweets = []
-            next_cursor = None
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    url = f'https://api.socialdata.tools/twitter/search'
-                    params = {
-                        'query': f'from:{screen_name} {"-filter:replies" if not replies else "filter:replies"}',
-                        'type': 'Top'
-                    }
-                    if next_cursor:
-                        params['cursor'] = next_cursor
-                        
-                    async with session.get(url, headers=self.get_headers(), params=params) as response:
-                        data = await response.json()
-                        
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting user's top tweets")
-                        return None
-                    
-                    if 'tweets' in data:
-                        all_tweets.extend(data['tweets'])
-                        
-                        # Break if we've reached the desired limit
-                        if len(all_tweets) >= limit:
-                            all_tweets = all_tweets[:limit]
-                            break
-                    
-                    next_cursor = data.get('next_cursor')
-                    if not next_cursor:
-                        break
-            
-            return all_tweets
+            params = {
+                'query': f'from:{screen_name} {"-filter:replies" if not replies else "filter:replies"}',
+                'type': 'Top'
+            }
+            return await self.paginate(f'{BASE_URL}/search', params=params, max_items=limit).collect()
         except Exception as e:
             logger.error(f"Error getting user's top tweets: {str(e)}")
             return None
 
     async def api_get_tweet(self, tweet_id: str) -> Optional[Dict[str, Any]]:
         try:
-            url = f'https://api.socialdata.tools/twitter/tweets/{tweet_id}'
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.get_headers()) as response:
-                    data = await response.json()
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting tweet details")
-                        return None
-                    
-                    return data
+            url = f'{BASE_URL}/tweets/{tweet_id}'
+            data = await self._get_json(url, reuse_seconds=config.SOCIALDATA_REUSE_SECONDS)
+            if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
+                logger.error("Insufficient balance when getting tweet details")
+                return None
+            return data
         except Exception as e:
             logger.error(f"Error getting tweet details: {str(e)}")
             return None
         
     async def api_get_thread_tweets(self, thread_id: str) -> Optional[Dict[str, Any]]:
         try:
-            all_tweets = []
-            next_cursor = None
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    url = f'https://api.socialdata.tools/twitter/thread/{thread_id}'
-                    params = {'cursor': next_cursor} if next_cursor else {}
-                    
-                    async with session.get(url, headers=self.get_headers(), params=params) as response:
-                        data = await response.json()
-                        
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting thread tweets")
-                        return None
-                    
-                    if 'tweets' in data:
-                        all_tweets.extend(data['tweets'])
-                    
-                    next_cursor = data.get('next_cursor')
-                    if not next_cursor:
-                        break
-            
-            
-            return all_tweets
+            return await self.paginate(f'{BASE_URL}/thread/{thread_id}').collect()
         except Exception as e:
             logger.error(f"Error getting thread tweets: {str(e)}")
             return None
      
     async def api_get_tweet_comments(self, tweet_id: str, to_user: Optional[str] = None, since_timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
         try:
-            all_comments = []
-            next_cursor = None
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    if to_user:
-                        url = f'https://api.socialdata.tools/twitter/search?query=conversation_id:{tweet_id} to:{to_user} {"since_time:",since_timestamp if since_timestamp else ""}'
-                    else:
-                        url = f'https://api.socialdata.tools/twitter/search?query=conversation_id:{tweet_id} {"since_time:",since_timestamp if since_timestamp else ""}'
-                        
-                    params = {'cursor': next_cursor} if next_cursor else {}
-                    async with session.get(url, headers=self.get_headers(), params=params) as response:
-                        data = await response.json()
-                        
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting tweet comments")
-                        return None
-                    
-                    if 'tweets' in data:
-                        all_comments.extend(data['tweets'])
-                    
-                    next_cursor = data.get('next_cursor')
-                    if not next_cursor:
-                        break
-                   
+            all_comments = await self.iter_tweet_comments(tweet_id, to_user, since_timestamp).collect()
             return {'data': all_comments}
         except Exception as e:
             logger.error(f"Error getting comments: {str(e)}")
@@ -196,28 +324,7 @@ class TwitterAPIClient:
             
     async def api_get_tweet_retweeters(self, tweet_id: str) -> Optional[Dict[str, Any]]:
         try:
-            all_retweeters = []
-            next_cursor = None
-            
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    url = f'https://api.socialdata.tools/twitter/tweets/{tweet_id}/retweeted_by'
-                    params = {'cursor': next_cursor} if next_cursor else {}
-                    
-                    async with session.get(url, headers=self.get_headers(), params=params) as response:
-                        data = await response.json()
-                        
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting tweet retweeters")
-                        return None
-                    
-                    if 'users' in data:
-                        all_retweeters.extend(data['users'])
-                    
-                    next_cursor = data.get('next_cursor')
-                    if not next_cursor:
-                        break
-                    
+            all_retweeters = await self.iter_tweet_retweeters(tweet_id).collect()
             return {'data': all_retweeters}
         except Exception as e:
             logger.error(f"Error getting retweeters: {str(e)}")
@@ -225,63 +332,15 @@ class TwitterAPIClient:
         
     async def api_get_tweet_quotes(self, tweet_id: str) -> Optional[Dict[str, Any]]:
         try:
-            all_quotes = []
-            next_cursor = None
-            
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    url = f'https://api.socialdata.tools/twitter/tweets/{tweet_id}/quotes'
-                    params = {'cursor': next_cursor} if next_cursor else {}
-                    
-                    async with session.get(url, headers=self.get_headers(), params=params) as response:
-                        data = await response.json()
-                        
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting tweet quotes")
-                        return None
-                    
-                    if 'tweets' in data:
-                        all_quotes.extend(data['tweets'])
-                    
-                    next_cursor = data.get('next_cursor')
-                    if not next_cursor:
-                        break
-                    
+            all_quotes = await self.iter_tweet_quotes(tweet_id).collect()
             return {'data': all_quotes}
         except Exception as e:
             logger.error(f"Error getting quote tweets: {str(e)}")
             return None
+
     async def api_get_latest_user_tweets(self, username: str, since_timestamp: Optional[int] = None) -> Optional[list]:
         try:
-            all_tweets = []
-            next_cursor = None
-            
-            query = f'from:{username}'
-            if since_timestamp:
-                query += f' since_time:{since_timestamp}'
-                
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    url = f'https://api.socialdata.tools/twitter/search'
-                    params = {'query': query}
-                    if next_cursor:
-                        params['cursor'] = next_cursor
-                        
-                    async with session.get(url, headers=self.get_headers(), params=params) as response:
-                        data = await response.json()
-                        
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting user tweets")
-                        return None
-                    
-                    if 'tweets' in data:
-                        all_tweets.extend(data['tweets'])
-                    
-                    next_cursor = data.get('next_cursor')
-                    if not next_cursor:
-                        break
-            
-            return all_tweets
+            return await self.iter_latest_user_tweets(username, since_timestamp).collect()
         except Exception as e:
             logger.error(f"Error getting user tweets: {str(e)}")
             return None
@@ -290,53 +349,142 @@ class TwitterAPIClient:
     async def api_get_community_top_tweets(self, community_id: str, limit: int = 100) -> Optional[list[Dict[str, Any]]]:
         """Get top tweets from a Twitter community"""
         try:
-            all_tweets = []
-            next_cursor = None
-            
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    url = f'https://api.socialdata.tools/twitter/community/{community_id}/tweets'
-                    params = {
-                        'type': 'Top'
-                    }
-                    if next_cursor:
-                        params['cursor'] = next_cursor
-                        
-                    async with session.get(url, headers=self.get_headers(), params=params) as response:
-                        data = await response.json()
-                        
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting community top tweets")
-                        return None
-                    
-                    if 'tweets' in data:
-                        all_tweets.extend(data['tweets'])
-                        
-                        # Break if we've reached the desired limit
-                        if len(all_tweets) >= limit:
-                            all_tweets = all_tweets[:limit]
-                            break
-                    
-                    next_cursor = data.get('next_cursor')
-                    if not next_cursor:
-                        break
-            
-            return all_tweets
+            params = {'type': 'Top'}
+            return await self.paginate(f'{BASE_URL}/community/{community_id}/tweets', params=params, max_items=limit).collect()
         except Exception as e:
             logger.error(f"Error getting community top tweets: {str(e)}")
             return None
 
+    ### STREAMING PAGINATION ###
+    def paginate(self, url: str, items_key: str = 'tweets', params: Optional[Dict[str, Any]] = None,
+                 max_pages: Optional[int] = None, max_items: Optional[int] = None,
+                 stop: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 cursor: Optional[str] = None) -> 'CursorPaginator':
+        """Page through a cursor-based SocialData endpoint"""
+        return CursorPaginator(self, url, items_key, params, max_pages, max_items, stop, cursor)
+
+    def iter_tweet_comments(self, tweet_id: str, to_user: Optional[str] = None, since_timestamp: Optional[str] = None,
+                            since_id: Optional[str] = None, **kwargs) -> 'CursorPaginator':
+        query = f'conversation_id:{tweet_id}'
+        if to_user:
+            query += f' to:{to_user}'
+        # since_id is exact, since_time only second-granular
+        if since_id:
+            query += f' since_id:{since_id}'
+        elif since_timestamp:
+            query += f' since_time:{since_timestamp}'
+        return self.paginate(f'{BASE_URL}/search', params={'query': query}, **kwargs)
+
+    def iter_tweet_retweeters(self, tweet_id: str, **kwargs) -> 'CursorPaginator':
+        return self.paginate(f'{BASE_URL}/tweets/{tweet_id}/retweeted_by', items_key='users', **kwargs)
+
+    def iter_tweet_quotes(self, tweet_id: str, **kwargs) -> 'CursorPaginator':
+        return self.paginate(f'{BASE_URL}/tweets/{tweet_id}/quotes', **kwargs)
+
+    def iter_latest_user_tweets(self, username: str, since_timestamp: Optional[int] = None, **kwargs) -> 'CursorPaginator':
+        query = f'from:{username}'
+        if since_timestamp:
+            query += f' since_time:{since_timestamp}'
+        return self.paginate(f'{BASE_URL}/search', params={'query': query}, **kwargs)
+
+    def iter_list_tweets(self, list_id: str, **kwargs) -> 'CursorPaginator':
+        return self.paginate(f'{BASE_URL}/list/{list_id}/tweets', **kwargs)
+
     async def api_get_community(self, community_id: str) -> Optional[Dict[str, Any]]:
         """Get community details"""
         try:
-            url = f'https://api.socialdata.tools/twitter/community/{community_id}'
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.get_headers()) as response:
-                    data = await response.json()
-                    if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
-                        logger.error("Insufficient balance when getting community details")
-                        return None
-                    return data
+            url = f'{BASE_URL}/community/{community_id}'
+            data = await self._get_cached_json(url)
+            if data.get('status') == 'error' and data.get('message') == 'Insufficient balance':
+                logger.error("Insufficient balance when getting community details")
+                return None
+            return data
         except Exception as e:
             logger.error(f"Error getting community details: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+
+class CursorPaginator:
+    """Async iterator over the pages of a cursor-based endpoint.
+
+    Yields one list of items per page so callers can persist results as they
+    arrive. Paging ends when the cursor runs out, `max_pages` or `max_items`
+    is reached, or `stop` returns True for an item; that item and everything
+    after it is dropped. An error response raises `SocialDataError`.
+    `cursor` holds the cursor for the next page, `page_cursor` the one that
+    fetched the page last yielded, and `pages` the number of pages fetched,
+    so callers can resume or count calls.
+    """
+
+    def __init__(self, client: TwitterAPIClient, url: str, items_key: str = 'tweets',
+                 params: Optional[Dict[str, Any]] = None, max_pages: Optional[int] = None,
+                 max_items: Optional[int] = None, stop: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 cursor: Optional[str] = None):
+        self.client = client
+        self.url = url
+        self.items_key = items_key
+        self.params = params or {}
+        self.max_pages = max_pages
+        self.max_items = max_items
+        self.stop = stop
+        self.cursor = cursor
+        self.page_cursor = None
+        self.pages = 0
+        self.items = 0
+        self.exhausted = False
+
+    def __aiter__(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._iter_pages()
+
+    async def _iter_pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        while True:
+            params = dict(self.params)
+            if self.cursor:
+                params['cursor'] = self.cursor
+
+            data = await self.client._get_json(self.url, params)
+            self.pages += 1
+
+            if data.get('status') == 'error':
+                # Raise rather than end quietly, so callers keep their cursor and resume
+                if data.get('message') == 'Insufficient balance':
+                    logger.error(f"Insufficient balance when paging {self.url}")
+                else:
+                    logger.warning(f"Error response when paging {self.url}: {data.get('message')}")
+                raise SocialDataError(data.get('message') or f"Error response when paging {self.url}")
+
+            page = data.get(self.items_key) or []
+            next_cursor = data.get('next_cursor')
+            stopped = False
+
+            if self.stop:
+                for i, item in enumerate(page):
+                    if self.stop(item):
+                        page = page[:i]
+                        stopped = True
+                        break
+
+            if self.max_items is not None and self.items + len(page) >= self.max_items:
+                page = page[:self.max_items - self.items]
+                stopped = True
+
+            self.items += len(page)
+            self.page_cursor = params.get('cursor')
+            self.cursor = next_cursor
+            if page:
+                yield page
+
+            if stopped:
+                return
+            if not next_cursor:
+                self.exhausted = True
+                return
+            if self.max_pages is not None and self.pages >= self.max_pages:
+                return
+
+    async def collect(self) -> List[Dict[str, Any]]:
+        """Drain all remaining pages into a single list"""
+        results = []
+        async for page in self:
+            results.extend(page)
+        return results
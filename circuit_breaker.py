@@ -0,0 +1,119 @@
+import logging
+import time
+from typing import Dict, Any, Optional
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its endpoint's circuit is open"""
+    pass
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast for `reset_timeout` seconds. The first call after that is let
+    through as a probe (half-open): success closes the circuit, failure opens
+    it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.total_failures = 0
+        self.total_rejections = 0
+
+    def check(self):
+        """Fail fast if a call would be rejected, without claiming the probe slot"""
+        if self.state == self.HALF_OPEN or (
+            self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+        ):
+            self.total_rejections += 1
+            raise CircuitOpenError(f"Circuit {self.state.replace('_', '-')} for SocialData endpoint '{self.name}'")
+
+    def before_call(self) -> bool:
+        """Admit a call, returning True if it is the half-open probe"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                logger.info(f"Circuit for {self.name} half-open, sending probe request")
+                return True
+            else:
+                self.total_rejections += 1
+                raise CircuitOpenError(f"Circuit open for SocialData endpoint '{self.name}'")
+        elif self.state == self.HALF_OPEN:
+            # A probe is already in flight
+            self.total_rejections += 1
+            raise CircuitOpenError(f"Circuit half-open for SocialData endpoint '{self.name}'")
+        return False
+
+    def release_probe(self):
+        """Hand back the probe slot when the probe ended without a verdict.
+
+        The circuit returns to open with its cooldown already elapsed, so the
+        next call becomes the probe.
+        """
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+            logger.info(f"Circuit for {self.name} probe ended without a result, reopening")
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            logger.error(
+                f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures"
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'total_failures': self.total_failures,
+            'total_rejections': self.total_rejections,
+            'retry_in': (
+                max(round(self.reset_timeout - (time.monotonic() - self.opened_at), 1), 0)
+                if self.state == self.OPEN else None
+            )
+        }
+
+
+class CircuitBreakerRegistry:
+    """Lazily creates one breaker per endpoint"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_config(cls) -> 'CircuitBreakerRegistry':
+        return cls(config.SOCIALDATA_BREAKER_THRESHOLD, config.SOCIALDATA_BREAKER_RESET_SECONDS)
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+        return self._breakers[endpoint]
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.snapshot() for name, breaker in self._breakers.items()}
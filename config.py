@@ -8,7 +8,94 @@ class EnvConfig:
         self.ENVIRONMENT = os.getenv("ENVIRONMENT", "dev")
         self.ADMIN_SECRET = os.getenv("ADMIN_SECRET")
         self.SOCIAL_DATA_API_KEY = os.getenv("SOCIAL_DATA_API_KEY")
+        # Point at tools/socialdata_stub.py for offline runs
+        self.SOCIAL_DATA_BASE_URL = os.getenv("SOCIAL_DATA_BASE_URL", "https://api.socialdata.tools").rstrip("/")
         self.ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+
+        # Shared SocialData HTTP session
+        self.HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+        self.HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "30"))
+        self.HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+        self.HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+        self.HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "60"))
+
+        # SocialData rate limiting and credit budget
+        self.SOCIALDATA_REQUESTS_PER_SECOND = float(os.getenv("SOCIALDATA_REQUESTS_PER_SECOND", "10"))
+        self.SOCIALDATA_BURST = int(os.getenv("SOCIALDATA_BURST", "20"))
+        self.SOCIALDATA_MAX_CONCURRENCY = int(os.getenv("SOCIALDATA_MAX_CONCURRENCY", "10"))
+        # e.g. "search=5,retweeted_by=3"
+        self.SOCIALDATA_ENDPOINT_CONCURRENCY = {
+            name.strip(): int(limit)
+            for name, limit in (
+                item.split("=") for item in os.getenv("SOCIALDATA_ENDPOINT_CONCURRENCY", "").split(",") if "=" in item
+            )
+        }
+        self.SOCIALDATA_DAILY_CREDIT_BUDGET = int(os.getenv("SOCIALDATA_DAILY_CREDIT_BUDGET", "0"))  # 0 = unlimited
+        self.SOCIALDATA_BALANCE_PAUSE_SECONDS = int(os.getenv("SOCIALDATA_BALANCE_PAUSE_SECONDS", "900"))
+
+        # SocialData retries and circuit breaker
+        self.SOCIALDATA_REQUEST_TIMEOUT = float(os.getenv("SOCIALDATA_REQUEST_TIMEOUT", "30"))
+        self.SOCIALDATA_MAX_RETRIES = int(os.getenv("SOCIALDATA_MAX_RETRIES", "3"))
+        self.SOCIALDATA_BACKOFF_BASE = float(os.getenv("SOCIALDATA_BACKOFF_BASE", "0.5"))
+        self.SOCIALDATA_BACKOFF_CAP = float(os.getenv("SOCIALDATA_BACKOFF_CAP", "30"))
+        self.SOCIALDATA_RETRY_AFTER_CAP = float(os.getenv("SOCIALDATA_RETRY_AFTER_CAP", "120"))
+        self.SOCIALDATA_BREAKER_THRESHOLD = int(os.getenv("SOCIALDATA_BREAKER_THRESHOLD", "5"))
+        self.SOCIALDATA_BREAKER_RESET_SECONDS = float(os.getenv("SOCIALDATA_BREAKER_RESET_SECONDS", "60"))
+        # Window in which identical single-object lookups reuse a finished result
+        self.SOCIALDATA_REUSE_SECONDS = float(os.getenv("SOCIALDATA_REUSE_SECONDS", "5"))
+
+        # Profile and community lookup cache, TTLs in seconds per endpoint
+        self.RESPONSE_CACHE_TTLS = {
+            name.strip(): int(ttl)
+            for name, ttl in (
+                item.split("=") for item in os.getenv("RESPONSE_CACHE_TTLS", "user=900,community=3600").split(",") if "=" in item
+            )
+        }
+        self.RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+        self.RESPONSE_CACHE_PERSIST = os.getenv("RESPONSE_CACHE_PERSIST", "false").lower() == "true"
+        self.RESPONSE_CACHE_PURGE_INTERVAL = float(os.getenv("RESPONSE_CACHE_PURGE_INTERVAL", "3600"))
+
+        # Database connection pool
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+        # Monitoring worker pool
+        self.MONITOR_WORKERS = int(os.getenv("MONITOR_WORKERS", "8"))
+        self.MONITOR_RUN_TIMEOUT = float(os.getenv("MONITOR_RUN_TIMEOUT", "300"))
+        # Connections one monitoring run may hold at once, and connections kept free for API requests
+        self.MONITOR_DB_SESSIONS_PER_RUN = int(os.getenv("MONITOR_DB_SESSIONS_PER_RUN", "3"))
+        self.MONITOR_DB_RESERVED_CONNECTIONS = int(os.getenv("MONITOR_DB_RESERVED_CONNECTIONS", "6"))
+
+        # Periodic loops, in seconds; jitter is added at random to each interval
+        self.TWEET_CHECK_INTERVAL = float(os.getenv("TWEET_CHECK_INTERVAL", "60"))
+        self.TWEET_CHECK_JITTER = float(os.getenv("TWEET_CHECK_JITTER", "5"))
+        self.ACCOUNT_CHECK_INTERVAL = float(os.getenv("ACCOUNT_CHECK_INTERVAL", "180"))
+        self.ACCOUNT_CHECK_JITTER = float(os.getenv("ACCOUNT_CHECK_JITTER", "30"))
+        self.ACCOUNT_CHECK_CONCURRENCY = int(os.getenv("ACCOUNT_CHECK_CONCURRENCY", "5"))
+        # SocialData lists used for batched new-tweet discovery, e.g. "1234567890,9876543210"
+        self.DISCOVERY_LIST_IDS = [item.strip() for item in os.getenv("DISCOVERY_LIST_IDS", "").split(",") if item.strip()]
+        self.DISCOVERY_LIST_MAX_PAGES = int(os.getenv("DISCOVERY_LIST_MAX_PAGES", "10"))
+
+        # Tweet refresh policy: "age" for fixed 5/15/60 minute tiers, "velocity" to adapt to engagement
+        self.POLLING_POLICY = os.getenv("POLLING_POLICY", "age")
+        # Engagement points a velocity-polled tweet should gain between checks
+        self.POLLING_TARGET_DELTA = float(os.getenv("POLLING_TARGET_DELTA", "20"))
+
+        # Stop monitoring saturated tweets early and extend the window of ones still growing
+        self.SATURATION_DETECTION = os.getenv("SATURATION_DETECTION", "true").lower() == "true"
+        self.SATURATION_MIN_AGE_HOURS = float(os.getenv("SATURATION_MIN_AGE_HOURS", "2"))
+        self.SATURATION_STOP_RATIO = float(os.getenv("SATURATION_STOP_RATIO", "0.02"))
+        self.SATURATION_EXTEND_RATIO = float(os.getenv("SATURATION_EXTEND_RATIO", "0.1"))
+        self.SATURATION_EXTEND_HOURS = float(os.getenv("SATURATION_EXTEND_HOURS", "24"))
+        self.SATURATION_MAX_HOURS = float(os.getenv("SATURATION_MAX_HOURS", "72"))
+        # Recent snapshots the engagement curve is fitted to
+        self.SATURATION_MAX_SNAPSHOTS = int(os.getenv("SATURATION_MAX_SNAPSHOTS", "24"))
+
+        # Seconds a due tweet waits when the credit budget cannot cover it this cycle
+        self.PLANNER_DEFER_SECONDS = int(os.getenv("PLANNER_DEFER_SECONDS", "300"))
+
+        # Tweets whose analyzed history is kept in memory and updated incrementally
+        self.ANALYZED_HISTORY_CACHE_SIZE = int(os.getenv("ANALYZED_HISTORY_CACHE_SIZE", "100"))
         
         if self.ENVIRONMENT == "prod":
             self.DB_PATH = os.getenv("DB_PATH_PROD") 
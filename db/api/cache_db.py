@@ -0,0 +1,56 @@
+from typing import Optional, Dict, Any, Tuple
+import json
+import logging
+from datetime import datetime
+from sqlalchemy import select, delete
+from db.migrations import get_async_session
+from db.schemas import APIResponseCache
+
+logger = logging.getLogger(__name__)
+
+class APICacheRepository():
+    async def get_cached_response(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Get an unexpired cached response and its expiry timestamp"""
+        now = int(datetime.now().timestamp())
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(APIResponseCache).filter(
+                    APIResponseCache.cache_key == cache_key,
+                    APIResponseCache.expires_at > now
+                )
+            )
+            entry = result.scalars().first()
+            return (json.loads(entry.data_json), entry.expires_at) if entry else None
+
+    async def save_cached_response(self, cache_key: str, endpoint: str, data_json: str, expires_at: int) -> None:
+        """Insert or refresh a cached response"""
+        now = int(datetime.now().timestamp())
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(APIResponseCache).filter(APIResponseCache.cache_key == cache_key)
+            )
+            entry = result.scalars().first()
+            if entry:
+                entry.endpoint = endpoint
+                entry.data_json = data_json
+                entry.expires_at = expires_at
+                entry.updated_at = now
+            else:
+                session.add(APIResponseCache(
+                    cache_key=cache_key,
+                    endpoint=endpoint,
+                    data_json=data_json,
+                    expires_at=expires_at,
+                    updated_at=now
+                ))
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        """Delete expired cache rows"""
+        now = int(datetime.now().timestamp())
+        async with get_async_session() as session:
+            result = await session.execute(
+                delete(APIResponseCache).where(APIResponseCache.expires_at <= now)
+            )
+            await session.commit()
+            return result.rowcount
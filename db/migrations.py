@@ -4,7 +4,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy import text
 from .schemas import Base
 from config import config
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 # Create and store engine once at import time
 if not config.DB_PATH.startswith("postgresql+asyncpg://"):
@@ -16,8 +16,8 @@ engine = create_async_engine(
     db_url,
     echo=False,  # Set to True for SQL query logging
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW
 )
 
 # Create a single global sessionmaker
@@ -33,6 +33,21 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
+@asynccontextmanager
+async def session_scope(session: Optional[AsyncSession] = None) -> AsyncGenerator[AsyncSession, None]:
+    """Join the caller's session, or open one that commits when the block succeeds.
+
+    A joined session is only flushed, so several repository calls can share
+    one transaction that the caller commits as a unit of work.
+    """
+    if session is not None:
+        yield session
+        await session.flush()
+        return
+    async with AsyncSessionLocal() as own_session:
+        yield own_session
+        await own_session.commit()
+
 def migrations():
     metadata = Base.metadata
 
@@ -48,8 +63,10 @@ def migrations():
 
         # Create indexes
         """CREATE INDEX IF NOT EXISTS idx_tweet_details ON tweet_details (tweet_id, captured_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_tweet_metrics ON tweet_metrics (tweet_id, captured_at)""",
         """CREATE INDEX IF NOT EXISTS idx_tweet_comments ON tweet_comments (tweet_id, captured_at)""",
         """CREATE INDEX IF NOT EXISTS idx_tweet_retweeters ON tweet_retweeters (tweet_id, captured_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_tweet_quotes ON tweet_quotes (tweet_id, captured_at)""",
         """CREATE INDEX IF NOT EXISTS idx_monitored_accounts ON monitored_accounts (account_id, screen_name)""",
         """CREATE INDEX IF NOT EXISTS idx_ai_analysis ON ai_analysis (tweet_id, created_at)""",
         """CREATE INDEX IF NOT EXISTS idx_users ON users (id, email)""",
@@ -59,6 +76,7 @@ def migrations():
         """CREATE INDEX IF NOT EXISTS idx_workshop_generation ON workshop_generation (user_id, created_at)""",
         """CREATE INDEX IF NOT EXISTS idx_workshop_reply ON workshop_reply (user_id, created_at)""",
         """CREATE INDEX IF NOT EXISTS idx_workshop_visualization ON workshop_visualization (user_id, created_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_api_response_cache_expires ON api_response_cache (expires_at)""",
         
         # Add style_analysis column to account_analysis table if it doesn't exist
         """DO $$ 
@@ -130,7 +148,163 @@ def migrations():
         END $$;""",
 
         # Update existing rows to have a status if they don't
-        """UPDATE community_analysis SET status = 'completed' WHERE status IS NULL;"""
+        """UPDATE community_analysis SET status = 'completed' WHERE status IS NULL;""",
+
+        # Add discovery_list_id column to monitored_accounts if it doesn't exist
+        """DO $$ 
+        BEGIN 
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns 
+                WHERE table_name='monitored_accounts' AND column_name='discovery_list_id'
+            ) THEN
+                ALTER TABLE monitored_accounts ADD COLUMN discovery_list_id VARCHAR;
+            END IF;
+        END $$;""",
+
+        # Add monitoring_reason column to monitored_tweets if it doesn't exist
+        """DO $$ 
+        BEGIN 
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns 
+                WHERE table_name='monitored_tweets' AND column_name='monitoring_reason'
+            ) THEN
+                ALTER TABLE monitored_tweets ADD COLUMN monitoring_reason VARCHAR;
+            END IF;
+        END $$;""",
+
+        # Add monitoring_decided_at column to monitored_tweets if it doesn't exist
+        """DO $$ 
+        BEGIN 
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns 
+                WHERE table_name='monitored_tweets' AND column_name='monitoring_decided_at'
+            ) THEN
+                ALTER TABLE monitored_tweets ADD COLUMN monitoring_decided_at INTEGER;
+            END IF;
+        END $$;""",
+
+        # Add monitor_until column to monitored_tweets if it doesn't exist
+        """DO $$ 
+        BEGIN 
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns 
+                WHERE table_name='monitored_tweets' AND column_name='monitor_until'
+            ) THEN
+                ALTER TABLE monitored_tweets ADD COLUMN monitor_until INTEGER;
+            END IF;
+        END $$;""",
+
+        # Add content_hash column to tweet_details if it doesn't exist
+        """DO $$ 
+        BEGIN 
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns 
+                WHERE table_name='tweet_details' AND column_name='content_hash'
+            ) THEN
+                ALTER TABLE tweet_details ADD COLUMN content_hash VARCHAR;
+            END IF;
+        END $$;""",
+
+        # Backfill tweet_metrics from the stored detail snapshots once
+        """DO $$ 
+        BEGIN 
+            IF NOT EXISTS (SELECT 1 FROM tweet_metrics) THEN
+                INSERT INTO tweet_metrics (
+                    tweet_id, captured_at, views_count, favorite_count, retweet_count,
+                    quote_count, reply_count, bookmark_count, author_followers
+                )
+                SELECT
+                    tweet_id,
+                    captured_at,
+                    (data_json::jsonb->>'views_count')::bigint,
+                    (data_json::jsonb->>'favorite_count')::bigint,
+                    (data_json::jsonb->>'retweet_count')::bigint,
+                    (data_json::jsonb->>'quote_count')::bigint,
+                    (data_json::jsonb->>'reply_count')::bigint,
+                    (data_json::jsonb->>'bookmark_count')::bigint,
+                    (data_json::jsonb->'user'->>'followers_count')::bigint
+                FROM tweet_details;
+            END IF;
+        END $$;""",
+
+        # Add latest snapshot columns to monitored_tweets and fill them from stored snapshots
+        """DO $$ 
+        BEGIN 
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns 
+                WHERE table_name='monitored_tweets' AND column_name='latest_captured_at'
+            ) THEN
+                ALTER TABLE monitored_tweets
+                    ADD COLUMN latest_captured_at INTEGER,
+                    ADD COLUMN views_count BIGINT,
+                    ADD COLUMN favorite_count BIGINT,
+                    ADD COLUMN retweet_count BIGINT,
+                    ADD COLUMN quote_count BIGINT,
+                    ADD COLUMN reply_count BIGINT,
+                    ADD COLUMN bookmark_count BIGINT,
+                    ADD COLUMN author_id VARCHAR,
+                    ADD COLUMN author_followers BIGINT,
+                    ADD COLUMN author_profile_image_url VARCHAR,
+                    ADD COLUMN text VARCHAR,
+                    ADD COLUMN tweet_created_at INTEGER;
+
+                UPDATE monitored_tweets m SET
+                    latest_captured_at = d.captured_at,
+                    author_id = COALESCE(d.data->>'author_id', d.data->'user'->>'id_str'),
+                    author_profile_image_url = d.data->'user'->>'profile_image_url_https',
+                    text = COALESCE(d.data->>'full_text', d.data->>'text'),
+                    tweet_created_at = CASE
+                        WHEN d.data->>'tweet_created_at' ~ '^\\d{4}-\\d{2}-\\d{2}T'
+                        THEN EXTRACT(EPOCH FROM (d.data->>'tweet_created_at')::timestamptz)::integer
+                    END
+                FROM (
+                    SELECT DISTINCT ON (tweet_id) tweet_id, captured_at, data_json::jsonb AS data
+                    FROM tweet_details
+                    ORDER BY tweet_id, captured_at DESC
+                ) d
+                WHERE m.tweet_id = d.tweet_id;
+
+                UPDATE monitored_tweets m SET
+                    latest_captured_at = GREATEST(m.latest_captured_at, t.captured_at),
+                    views_count = t.views_count,
+                    favorite_count = t.favorite_count,
+                    retweet_count = t.retweet_count,
+                    quote_count = t.quote_count,
+                    reply_count = t.reply_count,
+                    bookmark_count = t.bookmark_count,
+                    author_followers = t.author_followers
+                FROM (
+                    SELECT DISTINCT ON (tweet_id) *
+                    FROM tweet_metrics
+                    ORDER BY tweet_id, captured_at DESC
+                ) t
+                WHERE m.tweet_id = t.tweet_id;
+            END IF;
+        END $$;""",
+
+        # Feed indexes, created after the columns they cover exist
+        """CREATE INDEX IF NOT EXISTS idx_monitored_tweets_account_time ON monitored_tweets (account_id, tweet_created_at)""",
+        """CREATE INDEX IF NOT EXISTS idx_monitored_tweets_account_views ON monitored_tweets (account_id, views_count)""",
+
+        # Fill the per-user daily post counts once from existing feeds
+        """DO $$ 
+        BEGIN 
+            IF NOT EXISTS (SELECT 1 FROM user_post_days) THEN
+                INSERT INTO user_post_days (user_id, day, post_count)
+                SELECT user_id, day, COUNT(*)
+                FROM (
+                    SELECT
+                        i.user_id,
+                        to_char(timezone('UTC', to_timestamp(COALESCE(t.tweet_created_at, t.created_at))), 'YYYY-MM-DD') AS day
+                    FROM user_tracked_items i
+                    JOIN monitored_tweets t ON
+                        (i.tracked_type = 'tweet' AND t.tweet_id = i.tracked_id)
+                        OR (i.tracked_type = 'account' AND t.account_id = i.tracked_id)
+                    WHERE t.latest_captured_at IS NOT NULL
+                ) posts
+                GROUP BY user_id, day;
+            END IF;
+        END $$;"""
     ]
 
 async def connect_and_migrate(db_url: str):
@@ -11,6 +11,8 @@ class MonitoredAccount(Base):
     last_check = Column(Integer)
     is_active = Column(Boolean, default=False)
     account_details = Column(String)
+    # SocialData list whose timeline covers this account; membership is managed on X
+    discovery_list_id = Column(String, nullable=True)
 
 class MonitoredTweet(Base):
     __tablename__ = 'monitored_tweets'
@@ -20,6 +22,24 @@ class MonitoredTweet(Base):
     created_at = Column(Integer, nullable=False)
     last_check = Column(Integer)
     is_active = Column(Boolean, default=True)
+    # Why monitoring last stopped or was extended on its own, e.g. engagement saturated
+    monitoring_reason = Column(String, nullable=True)
+    monitoring_decided_at = Column(Integer, nullable=True)
+    # End of the monitoring window when extended past the default
+    monitor_until = Column(Integer, nullable=True)
+    # Latest snapshot, kept in step with tweet_metrics/tweet_details so feeds need no JSON
+    latest_captured_at = Column(Integer, nullable=True)
+    views_count = Column(BigInteger, nullable=True)
+    favorite_count = Column(BigInteger, nullable=True)
+    retweet_count = Column(BigInteger, nullable=True)
+    quote_count = Column(BigInteger, nullable=True)
+    reply_count = Column(BigInteger, nullable=True)
+    bookmark_count = Column(BigInteger, nullable=True)
+    author_id = Column(String, nullable=True)
+    author_followers = Column(BigInteger, nullable=True)
+    author_profile_image_url = Column(String, nullable=True)
+    text = Column(String, nullable=True)
+    tweet_created_at = Column(Integer, nullable=True)  # Unix time the tweet was posted
 
 class TweetDetail(Base):
     __tablename__ = 'tweet_details'
@@ -27,6 +47,22 @@ class TweetDetail(Base):
     tweet_id = Column(String, ForeignKey('monitored_tweets.tweet_id'), nullable=False)
     data_json = Column(String, nullable=False)
     captured_at = Column(Integer, nullable=False)
+    # Hash of the non-metric fields; full JSON is only stored again when it changes
+    content_hash = Column(String, nullable=True)
+
+class TweetMetric(Base):
+    # Engagement counters of each poll that changed them
+    __tablename__ = 'tweet_metrics'
+    id = Column(Integer, primary_key=True)
+    tweet_id = Column(String, ForeignKey('monitored_tweets.tweet_id'), nullable=False)
+    captured_at = Column(Integer, nullable=False)
+    views_count = Column(BigInteger)
+    favorite_count = Column(BigInteger)
+    retweet_count = Column(BigInteger)
+    quote_count = Column(BigInteger)
+    reply_count = Column(BigInteger)
+    bookmark_count = Column(BigInteger)
+    author_followers = Column(BigInteger)
 
 class TweetComment(Base):
     __tablename__ = 'tweet_comments'
@@ -49,6 +85,15 @@ class TweetRetweeter(Base):
     data_json = Column(String, nullable=False)
     captured_at = Column(Integer, nullable=False)
 
+class TweetStreamMark(Base):
+    __tablename__ = 'tweet_stream_marks'
+    tweet_id = Column(String, ForeignKey('monitored_tweets.tweet_id'), primary_key=True)
+    stream = Column(String, primary_key=True)  # comments, retweeters, quotes
+    last_id = Column(String, nullable=True)  # Newest item id ingested by a completed pass
+    cursor = Column(String, nullable=True)  # Cursor where an interrupted pass stopped
+    pending_id = Column(String, nullable=True)  # Newest id seen by the interrupted pass
+    updated_at = Column(Integer, nullable=False)
+
 class AIAnalysis(Base):
     __tablename__ = 'ai_analysis'
     id = Column(Integer, primary_key=True)
@@ -114,6 +159,13 @@ class UserTrackedItem(Base):
     tracked_account_name = Column(String, nullable=True)  # Only for accounts
     captured_at = Column(Integer, nullable=False)
 
+class UserPostDay(Base):
+    # Posts per day in a user's feed, kept up to date for streaks
+    __tablename__ = "user_post_days"
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(String, primary_key=True)  # YYYY-MM-DD in UTC
+    post_count = Column(Integer, nullable=False, default=0)
+
 class APICall(Base):
     __tablename__ = 'api_calls'
     monitor_timestamp = Column(Integer, primary_key=True)
@@ -123,6 +175,14 @@ class APICall(Base):
     comment_api_calls = Column(Integer)
     total_api_calls = Column(Integer)
 
+class APIResponseCache(Base):
+    __tablename__ = 'api_response_cache'
+    cache_key = Column(String, primary_key=True)
+    endpoint = Column(String, nullable=False)
+    data_json = Column(String, nullable=False)
+    expires_at = Column(Integer, nullable=False)
+    updated_at = Column(Integer, nullable=False)
+
 class Refinement(Base):
     __tablename__ = 'workshop_refinements'
     id = Column(Integer, primary_key=True)
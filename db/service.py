@@ -1,5 +1,6 @@
 import time
 import asyncio
+import random
 from typing import Dict, Optional, List, Tuple, Any
 import logging
 from db.migrations import get_async_session
@@ -133,6 +134,13 @@ class Service:
             logger.error(f"Error checking tweet tracking limit for user {user_id}: {str(e)}")
             raise
 
+    async def _refresh_streaks(self, user_id: str):
+        """Recount daily posts after the user's feed gained or lost tweets"""
+        try:
+            await self.monitor.tweet_data.rebuild_user_post_days(user_id)
+        except Exception as e:
+            logger.error(f"Error refreshing streaks for user {user_id}: {str(e)}")
+
     async def handle_account_monitoring(self, user_id: str, account_identifier: str, action: str) -> bool:
         """Handle starting or stopping monitoring of an account"""
         try:
@@ -144,12 +152,14 @@ class Service:
                 
                 if account_id:  
                     await self.user_repository.add_tracked_item(user_id, "account", account_id, account_identifier)
+                    await self._refresh_streaks(user_id)
                     logger.info(f"Started monitoring account {account_identifier} for user {user_id}")
                     return True
                 return False
 
             elif action == "stop":
                 success = await self.user_repository.remove_tracked_item(user_id, "account", account_identifier)
+                await self._refresh_streaks(user_id)
                 if success:
                     logger.info(f"Stopped monitoring account {account_identifier} for user {user_id}")
                 return success
@@ -186,16 +196,16 @@ class Service:
                 monitoring_run = await self.monitor.monitor_tweet(tweet_id=tweet_id)
                 
                 if monitoring_run.details_saved:
-                    details, screen_name = await self.monitor._fetch_tweet_details(tweet_id)
-                    
                     # Add to user's tracked items
-                    await self.user_repository.add_tracked_item(user_id, "tweet", tweet_id, screen_name)
+                    await self.user_repository.add_tracked_item(user_id, "tweet", tweet_id, monitoring_run.screen_name)
+                    await self._refresh_streaks(user_id)
                     logger.info(f"Started monitoring tweet {tweet_id} for user {user_id}")
                     return True
                 return False
 
             elif action == "stop":
                 success = await self.user_repository.remove_tracked_item(user_id, "tweet", tweet_id)
+                await self._refresh_streaks(user_id)
                 if success:
                     is_tweet_tracked = await self.user_repository.is_tweet_tracked(tweet_id)
                     if not is_tweet_tracked:
@@ -271,10 +281,11 @@ class Service:
             logger.error(f"Error analyzing tweet {tweet_id}: {str(e)}")
             raise
 
-    async def get_user_feed(self, user_id: str, skip: int = 0, limit: int = 20, type: str = "time", sort: str = "desc") -> Dict:
+    async def get_user_feed(self, user_id: str, skip: int = 0, limit: int = 20, type: str = "time", sort: str = "desc",
+                            cursor: Optional[str] = None) -> Dict:
         """Get paginated feed for a user"""
         try:
-            feed = await self.analysis.get_user_feed(user_id, skip, limit, type, sort)
+            feed = await self.analysis.get_user_feed(user_id, skip, limit, type, sort, cursor=cursor)
             logger.info(f"Retrieved paginated feed for user {user_id}")
             return feed
         except Exception as e:
@@ -293,6 +304,9 @@ class Service:
             if not history:
                 logger.warning(f"Tweet history not found for {tweet_id}")
                 return None
+
+            # Whether the tweet is still monitored, and why not if it stopped on its own
+            history['monitoring'] = await self.monitor.tweet_data.get_monitoring_status(tweet_id)
                 
             logger.info(f"Retrieved {format} history for tweet {tweet_id}")
             return history
@@ -303,11 +317,21 @@ class Service:
 
 
         ### ADMIN FUNCTIONs ###
+    async def set_account_discovery_list(self, account_id: str, list_id: Optional[str]) -> bool:
+        """Record that an account was added to (or removed from) a discovery list on X"""
+        if list_id and list_id not in config.DISCOVERY_LIST_IDS:
+            raise ValueError(f"List {list_id} is not configured in DISCOVERY_LIST_IDS")
+        success = await self.monitor.accounts.set_discovery_list(account_id, list_id)
+        if success:
+            logger.info(f"Set discovery list of account {account_id} to {list_id or 'none'}")
+        return success
+
     async def handle_all_accounts(self, action: str) -> bool:
         """Handle starting or stopping monitoring of all accounts"""
         try:
             if action == "start":
                 self.monitor.accounts.start_all_accounts()
+                self.monitor.scheduler.invalidate()
                 logger.info("Started monitoring all accounts")
                 return True
             elif action == "stop":
@@ -427,6 +451,30 @@ class Service:
 
 
 
+    ### API CLIENT ###
+    def get_api_client_state(self) -> Dict[str, Any]:
+        """Get SocialData rate limiter, budget, pause and circuit state"""
+        return self.api_client.get_state()
+
+    def resume_api_client(self) -> Dict[str, Any]:
+        """Clear an insufficient balance pause so monitoring can continue"""
+        self.api_client.limiter.resume()
+        logger.info("Resumed SocialData API calls")
+        return self.api_client.get_state()
+
+    def get_scheduler_state(self) -> Dict[str, Any]:
+        """Get tweet refresh schedule size and lag"""
+        return self.monitor.scheduler.state()
+
+    def get_budget_plan(self) -> Dict[str, Any]:
+        """Get the credit budget level, latest poll plan and spend by stream"""
+        return self.monitor.planner.state()
+
+    def get_worker_pool_state(self) -> Dict[str, Any]:
+        """Get monitoring worker pool queue depth, throughput and run durations"""
+        return self.monitor.pool.state()
+
+
     ### STRIPE ###
     async def create_checkout_session(self, user_id: str) -> Dict[str, Any]:
         """Create a checkout session for a user"""
@@ -459,19 +507,35 @@ class Service:
             logger.error(f"Error in account check at {timestamp}: {str(e)}")
 
 
-    async def handle_periodic_checks(self):
-        """Periodic task to check and update tweets and accounts"""
+    async def purge_response_cache(self, timestamp: int):
+        """Single run of expired response cache cleanup"""
+        try:
+            purged = await self.api_client.response_cache.purge_expired()
+            logger.info(f"Purged {purged} expired cached responses at {timestamp}")
+        except Exception as e:
+            logger.error(f"Error purging response cache at {timestamp}: {str(e)}")
+
+    async def _run_periodically(self, name: str, check, interval: float, jitter: float):
+        """Run one check forever, sleeping interval plus random jitter between runs"""
         while True:
             timestamp = int(time.time())
-            
             try:
-                await self.check_single_tweet(timestamp)
+                await check(timestamp)
             except Exception as e:
-                logger.error(f"Error checking tweets at {int(time.time())}: {str(e)}")
+                logger.error(f"Error in {name} loop at {int(time.time())}: {str(e)}")
+            await asyncio.sleep(interval + random.uniform(0, jitter))
 
-            try:
-                await self.check_account(timestamp)
-            except Exception as e:
-                logger.error(f"Error checking accounts at {int(time.time())}: {str(e)}")
-            await asyncio.sleep(60)
-   
+    async def handle_periodic_checks(self):
+        """Periodic task to check and update tweets and accounts.
+
+        Tweet refresh and account discovery run as independent loops so a
+        slow account sweep never delays due tweet refreshes.
+        """
+        await asyncio.gather(
+            self._run_periodically("tweet check", self.check_single_tweet,
+                                   config.TWEET_CHECK_INTERVAL, config.TWEET_CHECK_JITTER),
+            self._run_periodically("account check", self.check_account,
+                                   config.ACCOUNT_CHECK_INTERVAL, config.ACCOUNT_CHECK_JITTER),
+            self._run_periodically("response cache purge", self.purge_response_cache,
+                                   config.RESPONSE_CACHE_PURGE_INTERVAL, 0)
+        )
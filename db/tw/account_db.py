@@ -2,15 +2,16 @@ from typing import List, Dict, Any, Optional
 import json
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.migrations import get_async_session
+from db.migrations import get_async_session, session_scope
 from db.schemas import MonitoredAccount, AccountAnalysis
 from datetime import datetime
 
 
 class AccountRepository():
     async def upsert_account(self, account_id: str, screen_name: str, account_details: Dict[str, Any],
-                            is_active: Optional[bool] = None, update_existing: bool = True) -> None:
-        async with get_async_session() as session:
+                            is_active: Optional[bool] = None, update_existing: bool = True,
+                            session: Optional[AsyncSession] = None) -> None:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(MonitoredAccount).filter(MonitoredAccount.account_id == account_id)
             )
@@ -32,7 +33,6 @@ class AccountRepository():
                     account_details=json.dumps(account_details)
                 )
                 session.add(new_account)
-            await session.commit()
 
     async def stop_monitoring_account(self, account_id: str):
         async with get_async_session() as session:
@@ -65,9 +65,23 @@ class AccountRepository():
                 'is_active': account.is_active,
                 'last_check': account.last_check,
                 'created_at': account.created_at,
+                'discovery_list_id': account.discovery_list_id,
                 'account_details': json.loads(account.account_details) if account.account_details else None
             } for account in accounts]
 
+    async def set_discovery_list(self, account_id: str, list_id: Optional[str]) -> bool:
+        """Record which list timeline covers an account, or None to use per-account search"""
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(MonitoredAccount).filter(MonitoredAccount.account_id == account_id)
+            )
+            account = result.scalars().first()
+            if not account:
+                return False
+            account.discovery_list_id = list_id
+            await session.commit()
+            return True
+
     async def save_account_analysis(
         self, 
         user_id: str,
@@ -212,6 +226,27 @@ class AccountRepository():
                 }
             return None
         
+    async def get_accounts_by_ids(self, account_ids: List[str]) -> List[Dict[str, Any]]:
+        """Like get_account_by_id for several accounts in one query, in the order given"""
+        if not account_ids:
+            return []
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(MonitoredAccount).filter(MonitoredAccount.account_id.in_(account_ids))
+            )
+            accounts = {account.account_id: account for account in result.scalars().all()}
+            return [
+                {
+                    'account_id': account.account_id,
+                    'screen_name': account.screen_name,
+                    'is_active': account.is_active,
+                    'last_check': account.last_check,
+                    'created_at': account.created_at,
+                    'account_details': json.loads(account.account_details) if account.account_details else None
+                }
+                for account in (accounts.get(account_id) for account_id in account_ids) if account
+            ]
+
     async def get_account_by_screen_name(self, screen_name: str) -> Optional[Dict[str, Any]]:
         async with get_async_session() as session:
             result = await session.execute(
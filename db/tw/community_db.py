@@ -99,6 +99,32 @@ class CommunityRepository:
                 }
             return None
 
+    async def get_latest_community_analyses(self, community_ids: List[str], user_id: str) -> List[Dict[str, Any]]:
+        """Latest analysis of each community for a user in one query, in the order given"""
+        if not community_ids:
+            return []
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(CommunityAnalysis)
+                .filter(
+                    CommunityAnalysis.community_id.in_(community_ids),
+                    CommunityAnalysis.user_id == user_id
+                )
+                .order_by(CommunityAnalysis.community_id, CommunityAnalysis.created_at.desc())
+                .distinct(CommunityAnalysis.community_id)
+            )
+            analyses = {analysis.community_id: analysis for analysis in result.scalars().all()}
+            return [
+                {
+                    'id': analysis.id,
+                    'community_id': analysis.community_id,
+                    'details': analysis.details,
+                    'created_at': analysis.created_at,
+                    'updated_at': analysis.updated_at
+                }
+                for analysis in (analyses.get(community_id) for community_id in community_ids) if analysis
+            ]
+
     async def delete_community_analysis(self, user_id: str, community_id: str) -> Dict[str, Any]:
         async with get_async_session() as session:
             result = await session.execute(
@@ -1,14 +1,78 @@
+import asyncio
 import json
-import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
+from config import config
 from db.migrations import get_async_session
-from db.tw.tweet_db import TweetDataRepository
+from db.tw.tweet_db import TweetDataRepository, format_tweet_time
 from db.users.user_db import UserDataRepository
 from db.tw.account_db import AccountRepository
 from db.tw.community_db import CommunityRepository
 
 
+# Top amplifier groups in AI analysis input and the stream each comes from
+AMPLIFIER_STREAMS = {
+    'commenters': 'comments',
+    'retweeters': 'retweeters',
+    'quoters': 'quotes',
+}
+
+
+class AnalyzedHistory:
+    """Parsed history of one tweet, extended with only the rows captured since the last update"""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.engagement_metrics: Dict[int, Dict[str, Any]] = {}
+        self.engagement_changes: Dict[int, Dict[str, Any]] = {}
+        self.user_followers: Dict[int, Any] = {}
+        self.metrics_since: Optional[int] = None
+        self.tracking: Dict[str, Dict[int, List[Dict[str, Any]]]] = {stream: {} for stream in AMPLIFIER_STREAMS.values()}
+        self.verified: Dict[str, Dict[int, int]] = {stream: {} for stream in AMPLIFIER_STREAMS.values()}
+        self.seen: Dict[str, set] = {stream: set() for stream in AMPLIFIER_STREAMS.values()}
+        self.rows_since: Dict[str, Optional[int]] = {stream: None for stream in AMPLIFIER_STREAMS.values()}
+        # screen_name -> profile picture of the first item seen from that user, per stream
+        self.profile_images: Dict[str, Dict[str, str]] = {stream: {} for stream in AMPLIFIER_STREAMS.values()}
+
+    def add_metrics(self, captured_at: int, metrics: Dict[str, Any], followers: Optional[int]):
+        if self.metrics_since is not None and captured_at <= self.metrics_since:
+            return
+        if self.metrics_since is not None:
+            previous = self.engagement_metrics[self.metrics_since]
+            self.engagement_changes[captured_at] = {
+                metric: (metrics[metric] or 0) - (previous[metric] or 0)
+                for metric in metrics.keys()
+            }
+        self.engagement_metrics[captured_at] = metrics
+        if followers is not None:
+            self.user_followers[captured_at] = followers
+        self.metrics_since = captured_at
+
+    def add_item(self, stream: str, key: Any, captured_at: int, item: Dict[str, Any]):
+        self.rows_since[stream] = max(self.rows_since[stream] or captured_at, captured_at)
+        if key in self.seen[stream]:
+            return
+        self.seen[stream].add(key)
+        self.tracking[stream].setdefault(captured_at, []).append(item)
+        self.verified[stream].setdefault(captured_at, 0)
+        if item['verified']:
+            self.verified[stream][captured_at] += 1
+        if item.get('screen_name'):
+            self.profile_images[stream].setdefault(item['screen_name'], item['profile_image_url_https'])
+
+    def tracking_copy(self, stream: str) -> Dict[int, List[Dict[str, Any]]]:
+        """A stream's tracked items, copied so callers can't alter the cached history"""
+        return {
+            captured_at: [dict(item) for item in items]
+            for captured_at, items in self.tracking[stream].items()
+        }
+
+
+# Shared by every repository instance; least recently used tweets are evicted first
+_analyzed_histories: "OrderedDict[str, AnalyzedHistory]" = OrderedDict()
+
+
 class TweetStructuredRepository():
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -29,11 +93,11 @@ class TweetStructuredRepository():
             'bookmark_count': tweet_details.get('bookmark_count', 0)
         }
     
-    async def get_streak_data(self, feed_data: List[Dict]) -> Dict[str, Any]:
-        """Get streak data for a user's tweets"""
-        # Get all monitored tweets for the user
-        
-        if not feed_data:
+    async def get_streak_data(self, user_id: str) -> Dict[str, Any]:
+        """Get streak data for a user's tweets from their daily post counts"""
+        contribution_map = dict(sorted((await self.tweet_data.get_user_post_days(user_id)).items()))
+
+        if not contribution_map:
             return {
                 "current_streak": 0,
                 "longest_streak": 0,
@@ -42,16 +106,6 @@ class TweetStructuredRepository():
                 "contribution_map": {}
             }
 
-        # Create contribution map
-        contribution_map = {}
-        
-        for item in feed_data:
-            if 'created_at' in item:
-                # Parse ISO format date string (2025-03-18T12:28:44.000000Z)
-                created_date = datetime.strptime(item['created_at'].split('T')[0], '%Y-%m-%d')
-                tweet_date = created_date.strftime('%Y-%m-%d')
-                contribution_map[tweet_date] = contribution_map.get(tweet_date, 0) + 1
-
         current_streak = 0
         today = datetime.now()
         today = today.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -66,11 +120,10 @@ class TweetStructuredRepository():
         # Calculate longest streak
         longest_streak = 0
         current_longest = 0
-        dates = sorted(contribution_map.keys())
+        prev_date = None
 
-        for i in range(len(dates)):
-            current_date = datetime.strptime(dates[i], '%Y-%m-%d')
-            prev_date = datetime.strptime(dates[i-1], '%Y-%m-%d') if i > 0 else None
+        for date_str in contribution_map:
+            current_date = datetime.strptime(date_str, '%Y-%m-%d')
 
             if prev_date and (current_date - prev_date).days == 1:
                 current_longest += 1
@@ -78,153 +131,98 @@ class TweetStructuredRepository():
                 current_longest = 1
 
             longest_streak = max(longest_streak, current_longest)
+            prev_date = current_date
 
         # Calculate average posts per day (last 30 days)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
+        thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
         posts_last_30_days = sum(
             count for date, count in contribution_map.items()
-            if datetime.strptime(date, '%Y-%m-%d') >= thirty_days_ago
+            if date >= thirty_days_ago
         )
         average_posts = round(posts_last_30_days / 30, 1)
 
         return {
             "current_streak": current_streak,
             "longest_streak": longest_streak,
-            "total_posts": len(feed_data),
+            "total_posts": sum(contribution_map.values()),
             "average_posts_per_day": average_posts,
             "contribution_map": contribution_map
         }
 
-    async def get_user_feed(self, user_id: str, skip: int = 0, limit: int = 20, type: str = "time", sort: str = "desc") -> Dict[str, Any]:
-        """Get latest data for all monitored tweets for a user with pagination"""
-        logger = logging.getLogger(__name__)
-        # Get all monitored tweets for the user
-        monitored_tweets = await self.tweet_data.get_tweets_for_user(user_id)
-        total_count = len(monitored_tweets) if monitored_tweets else 0
-        
+    async def get_user_feed(self, user_id: str, skip: int = 0, limit: int = 20, type: str = "time", sort: str = "desc",
+                            cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get latest data for all monitored tweets for a user with pagination.
+
+        Sorting and pagination happen in the database; pass the returned
+        `next_cursor` to get the following page without an offset scan.
+        """
+        tweets, next_cursor = await self.tweet_data.get_feed_page(user_id, limit, type, sort, cursor=cursor, skip=skip)
+        total_count = await self.tweet_data.count_feed_tweets(user_id)
+
         tracked_items = await self.user_data.get_tracked_items(user_id)
         tracked_accounts = []
-        community_analyses = []
-
-        if tracked_items.get('analysis'):
-            for account_id in tracked_items['analysis']:
-                account = await self.accounts.get_account_by_id(account_id)
-                if account:
-                    tracked_accounts.append({
-                        'account_id': account['account_id'],
-                        'screen_name': account['screen_name'],
-                        'is_active': account['is_active'],
-                        'last_check': account['last_check'],
-                        'created_at': account['created_at'],
-                        'account_details': account['account_details'],
-                        'tracking_type': 'analysis'
-                    })
-
-        
-        if tracked_items.get('accounts'):
-            for account_id in tracked_items['accounts']:
-                account = await self.accounts.get_account_by_id(account_id)
-                if account:
-                    tracked_accounts.append({
-                        'account_id': account['account_id'],
-                        'screen_name': account['screen_name'],
-                        'is_active': account['is_active'],
-                        'last_check': account['last_check'],
-                        'created_at': account['created_at'],
-                        'account_details': account['account_details'],
-                        'tracking_type': 'account'
-                    })
+        for tracking_type, key in (('analysis', 'analysis'), ('account', 'accounts')):
+            for account in await self.accounts.get_accounts_by_ids(tracked_items.get(key, [])):
+                tracked_accounts.append({**account, 'tracking_type': tracking_type})
 
         # Get tracked community analyses
-        if tracked_items.get('community_analysis'):
-            for community_id in tracked_items['community_analysis']:
-                analysis = await self.community.get_community_analysis(community_id, user_id)
-                if analysis:
-                    community_analyses.append({
-                        'id': analysis['id'],
-                        'account_id': analysis['community_id'],
-                        'details': analysis['details'],
-                        'created_at': analysis['created_at'],
-                        'updated_at': analysis['updated_at']
-                    })
-
-        feed_data = []
-
-        if monitored_tweets:
-            for tweet in monitored_tweets:
-                # Get latest tweet details
-                latest_details = await self.tweet_data.get_latest_tweet_details(tweet['tweet_id'])
-                if not latest_details:
-                    logger.warning(f"No details found for tweet_id: {tweet['tweet_id']}")
-                    continue
-
-                tweet_data = latest_details
-                captured_at = int(datetime.now().timestamp())
-                engagement = await self.process_engagement_metrics(tweet_data)
-
-                feed_item = {
-                    'tweet_id': tweet['tweet_id'],
-                    'is_monitored': bool(tweet['is_active']),
-                    'tracking_type': tweet['tracking_type'],
-                    'tracked_id': tweet['tracked_id'],
-                    'author': {
-                        'id': tweet_data.get('author_id') or tweet_data.get('user', {}).get('id'),
-                        'screen_name': tweet_data.get('user', {}).get('screen_name') or tweet_data.get('author_username'),
-                        'followers_count': tweet_data.get('user', {}).get('followers_count', 0),
-                        'profile_image_url_https': tweet_data.get('user', {}).get('profile_image_url_https', '').replace('_normal', '')
-                    },
-                    'engagement_metrics': engagement,
-                    'total_comments': tweet_data.get('reply_count', 0),
-                    'total_retweeters': tweet_data.get('retweet_count', 0),
-                    'total_quotes': tweet_data.get('quote_count', 0),
-                    'last_updated': captured_at,
-                    'created_at': tweet_data.get('tweet_created_at')
-                }
-
-                text = tweet_data.get('full_text') or tweet_data.get('text')
-                if text:
-                    feed_item['text'] = text
-
-                feed_data.append(feed_item)
-
-        # Separate individual tweets and account tweets
-        individual_tweets = [tweet for tweet in feed_data if tweet['tracking_type'] == 'individual']
-        account_tweets = [tweet for tweet in feed_data if tweet['tracking_type'] == 'account']
-        
-        # Define reverse_sort before using it
-        reverse_sort = sort.lower() == "desc"
-        
-        # Sort based on type and sort parameters
-        if type == "time":
-            sort_key = 'created_at'
-            # Sort account tweets
-            account_tweets = sorted(account_tweets, key=lambda x: x[sort_key], reverse=reverse_sort)
-        else:  # type == "view"
-            # Sort account tweets by views count
-            account_tweets = sorted(account_tweets, key=lambda x: x['engagement_metrics']['views_count'], reverse=reverse_sort)
-        
-        # Combine with individual tweets always at the start
-        sorted_feed = individual_tweets + account_tweets
-        
-        # Apply pagination AFTER sorting
-        paginated_feed = sorted_feed[skip:skip + limit] if sorted_feed else []
+        community_analyses = [
+            {
+                'id': analysis['id'],
+                'account_id': analysis['community_id'],
+                'details': analysis['details'],
+                'created_at': analysis['created_at'],
+                'updated_at': analysis['updated_at']
+            }
+            for analysis in await self.community.get_latest_community_analyses(
+                tracked_items.get('community_analysis', []), user_id
+            )
+        ]
+
+        captured_at = int(datetime.now().timestamp())
+        paginated_feed = []
+        for tweet in tweets:
+            feed_item = {
+                'tweet_id': tweet['tweet_id'],
+                'is_monitored': bool(tweet['is_active']),
+                'tracking_type': tweet['tracking_type'],
+                'tracked_id': tweet['tracked_id'],
+                'author': {
+                    'id': tweet['author_id'],
+                    'screen_name': tweet['author_screen_name'],
+                    'followers_count': tweet['author_followers'] or 0,
+                    'profile_image_url_https': (tweet['author_profile_image_url'] or '').replace('_normal', '')
+                },
+                'engagement_metrics': await self.process_engagement_metrics(tweet),
+                'total_comments': tweet['reply_count'] or 0,
+                'total_retweeters': tweet['retweet_count'] or 0,
+                'total_quotes': tweet['quote_count'] or 0,
+                'last_updated': captured_at,
+                'created_at': format_tweet_time(tweet['tweet_created_at'])
+            }
+            if tweet['text']:
+                feed_item['text'] = tweet['text']
+            paginated_feed.append(feed_item)
 
-        # Get streak data using feed_data (all feed items, not just paginated ones)
-        streak_data = await self.get_streak_data(feed_data)
+        # Streaks cover every tweet in the feed, not just this page
+        streak_data = await self.get_streak_data(user_id)
 
         return {
             'total_count': total_count,
             'tweets': paginated_feed,
+            'next_cursor': next_cursor,
             'tracked_accounts': tracked_accounts,
             'streak_data': streak_data,
             'communities': community_analyses
         }
 
-
     async def get_raw_tweet_history(self, tweet_id: str) -> Dict[str, Any]:
         """Get raw, unprocessed history data for a tweet"""
-        # Get latest tweet details
+        # Get stored tweet details, kept whenever non-metric fields changed
         details = await self.tweet_data.get_all_tweet_details(tweet_id)
+
+        # Get engagement counters of every poll that changed them
+        metrics = await self.tweet_data.get_tweet_snapshots(tweet_id)
         
         # Get comments
         comments = await self.tweet_data.get_tweet_comments(tweet_id)
@@ -241,6 +239,7 @@ class TweetStructuredRepository():
                 {'data': json.loads(d[0]), 'captured_at': d[1]} 
                 for d in details
             ],
+            'metrics': metrics,
             'comments': [
                 {'data': json.loads(comment.data_json), 'captured_at': comment.captured_at} 
                 for comment in comments
@@ -255,146 +254,89 @@ class TweetStructuredRepository():
             ]
         }
 
+    def _analyzed_history(self, tweet_id: str) -> AnalyzedHistory:
+        history = _analyzed_histories.pop(tweet_id, None) or AnalyzedHistory()
+        _analyzed_histories[tweet_id] = history
+        while len(_analyzed_histories) > config.ANALYZED_HISTORY_CACHE_SIZE:
+            _analyzed_histories.popitem(last=False)
+        return history
+
+    @staticmethod
+    def _engagement_item(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Summary of a comment or quote"""
+        user = data.get('user', {})
+        return {
+            'id': data['id'],
+            'favorite_count': data.get('favorite_count', 0),
+            'views_count': data.get('views_count', 0),
+            'bookmark_count': data.get('bookmark_count', 0),
+            'screen_name': user.get('screen_name'),
+            'followers_count': user.get('followers_count', 0),
+            'verified': user.get('verified', False),
+            'profile_image_url_https': user.get('profile_image_url_https', '').replace('_normal', '')
+        }
+
+    async def _update_analyzed_history(self, tweet_id: str, history: AnalyzedHistory):
+        """Fold snapshots, comments, retweeters and quotes captured since the last update into the history"""
+        for snapshot in await self.tweet_data.get_tweet_snapshots(tweet_id, since=history.metrics_since):
+            history.add_metrics(snapshot['captured_at'], await self.process_engagement_metrics(snapshot), snapshot['author_followers'])
+
+        for comment_row in await self.tweet_data.get_tweet_comments(tweet_id, since=history.rows_since['comments']):
+            comment = json.loads(comment_row.data_json)
+            history.add_item('comments', comment['id'], comment_row.captured_at, self._engagement_item(comment))
+
+        # Retweeter rows hold the retweeting user
+        for retweeter_row in await self.tweet_data.get_tweet_retweeters(tweet_id, since=history.rows_since['retweeters']):
+            retweeter = json.loads(retweeter_row.data_json)
+            if not retweeter.get('screen_name'):
+                continue
+            history.add_item('retweeters', retweeter['screen_name'], retweeter_row.captured_at, {
+                'screen_name': retweeter['screen_name'],
+                'followers_count': retweeter.get('followers_count', 0),
+                'verified': retweeter.get('verified', False),
+                'profile_image_url_https': retweeter.get('profile_image_url_https', '').replace('_normal', '')
+            })
+
+        for quote_row in await self.tweet_data.get_tweet_quotes(tweet_id, since=history.rows_since['quotes']):
+            quote = json.loads(quote_row.data_json)
+            history.add_item('quotes', quote['id'], quote_row.captured_at, self._engagement_item(quote))
+
     async def get_analyzed_tweet_history(self, tweet_id: str) -> Dict[str, Any]:
-        """Get processed and analyzed history data for a tweet"""
+        """Get processed and analyzed history data for a tweet.
+
+        The parsed history is memoized per tweet; each call only reads and
+        parses rows captured after the newest ones it already holds.
+        """
         # Get latest tweet details
-        details = await self.tweet_data.get_all_tweet_details(tweet_id)
+        detail = await self.tweet_data.get_latest_tweet_details(tweet_id)
 
-        if not details:
+        if not detail:
+            _analyzed_histories.pop(tweet_id, None)
             return {}
             
-        engagement_metrics = {}
-        full_text = None
+        full_text = detail.get('full_text')
         user_info = None
-        user_followers = {}
-        
-        for detail_json, captured_at in details:
-            detail = json.loads(detail_json)
-            engagement_metrics[captured_at] = await self.process_engagement_metrics(detail)
-            
-            if detail.get('full_text'):
-                full_text = detail['full_text']
-            if detail.get('user'):
-                user_info = {
-                    'id': detail['user'].get('id'),
-                    'screen_name': detail['user'].get('screen_name'),
-                    'profile_image_url_https': detail['user'].get('profile_image_url_https', '').replace('_normal', '')
-                }
-                user_followers[captured_at] = detail['user'].get('followers_count', 0)
-            
-        engagement_changes = {}
-        timestamps = sorted(engagement_metrics.keys())
-        for i in range(1, len(timestamps)):
-            prev_ts = timestamps[i-1]
-            curr_ts = timestamps[i]
-            
-            engagement_changes[curr_ts] = {
-                metric: (engagement_metrics[curr_ts][metric] or 0) - (engagement_metrics[prev_ts][metric] or 0)
-                for metric in engagement_metrics[curr_ts].keys()
+
+        if detail.get('user'):
+            user_info = {
+                'id': detail['user'].get('id'),
+                'screen_name': detail['user'].get('screen_name'),
+                'profile_image_url_https': detail['user'].get('profile_image_url_https', '').replace('_normal', '')
             }
-            
-        comments_tracking = {}
-        verified_replies = {}
 
-        # Get comments
-        comments = await self.tweet_data.get_tweet_comments(tweet_id)
-        
-        existing_comment_ids = set()
-        for comment_json, captured_at in comments:
-            comment = json.loads(comment_json)
-            if comment['id'] not in existing_comment_ids:
-                if captured_at not in comments_tracking:
-                    comments_tracking[captured_at] = []
-                    verified_replies[captured_at] = 0
-                
-                is_verified = comment.get('user', {}).get('verified', False)
-                if is_verified:
-                    verified_replies[captured_at] += 1
-                    
-                comments_tracking[captured_at].append({
-                    'id': comment['id'],
-                    'favorite_count': comment.get('favorite_count', 0),
-                    'views_count': comment.get('views_count', 0),
-                    'bookmark_count': comment.get('bookmark_count', 0),
-                    'screen_name': comment.get('user', {}).get('screen_name'),
-                    'followers_count': comment.get('user', {}).get('followers_count', 0),
-                    'verified': is_verified,
-                    'profile_image_url_https': comment.get('user', {}).get('profile_image_url_https', '').replace('_normal', '')
-                })
-                existing_comment_ids.add(comment['id'])
-        
-        retweeters_tracking = {}
-        verified_retweets = {}
-        
-        # Get retweeters
-        retweeters = await self.tweet_data.get_tweet_retweeters(tweet_id)
-        
-        existing_retweeter_names = set()
-        for retweeter in retweeters:
-            # Check if retweeter is already a dictionary, if not convert it to JSON
-            if isinstance(retweeter, dict):
-                retweeter_data = retweeter
-                captured_at = int(datetime.now().timestamp())  # Use current timestamp as fallback
-            else:
-                # Assuming retweeter has data and timestamp attributes
-                retweeter_data = json.loads(retweeter.data) if hasattr(retweeter, 'data') else {}
-                captured_at = retweeter.captured_at if hasattr(retweeter, 'captured_at') else int(datetime.now().timestamp())
-
-            if retweeter_data.get('screen_name') and retweeter_data['screen_name'] not in existing_retweeter_names:
-                if captured_at not in retweeters_tracking:
-                    retweeters_tracking[captured_at] = []
-                    verified_retweets[captured_at] = 0
-                    
-                is_verified = retweeter_data.get('verified', False)
-                if is_verified:
-                    verified_retweets[captured_at] += 1
-                    
-                retweeters_tracking[captured_at].append({
-                    'screen_name': retweeter_data['screen_name'],
-                    'followers_count': retweeter_data.get('followers_count', 0),
-                    'verified': is_verified,
-                    'profile_image_url_https': retweeter_data.get('profile_image_url_https', '').replace('_normal', '')
-                })
-                existing_retweeter_names.add(retweeter_data['screen_name'])
+        history = self._analyzed_history(tweet_id)
+        async with history.lock:
+            await self._update_analyzed_history(tweet_id, history)
 
-        quotes_tracking = {}
-        verified_quotes = {}
-        
-        # Get quotes
-        quotes = await self.tweet_data.get_tweet_quotes(tweet_id)
-        
-        existing_quote_ids = set()
-        for quote_obj in quotes:
-            quote = json.loads(quote_obj.data_json)  # Assuming TweetQuote has a quote_json field
-            if quote['id'] not in existing_quote_ids:
-                captured_at = quote_obj.captured_at  # Assuming TweetQuote has a captured_at field
-                
-                if captured_at not in quotes_tracking:
-                    quotes_tracking[captured_at] = []
-                    verified_quotes[captured_at] = 0
-                    
-                is_verified = quote.get('user', {}).get('verified', False)
-                if is_verified:
-                    verified_quotes[captured_at] += 1
-                    
-                quotes_tracking[captured_at].append({
-                    'id': quote['id'],
-                    'favorite_count': quote.get('favorite_count', 0),
-                    'views_count': quote.get('views_count', 0),
-                    'bookmark_count': quote.get('bookmark_count', 0),
-                    'screen_name': quote.get('user', {}).get('screen_name'),
-                    'followers_count': quote.get('user', {}).get('followers_count', 0),
-                    'verified': is_verified,
-                    'profile_image_url_https': quote.get('user', {}).get('profile_image_url_https', '').replace('_normal', '')
-                })
-                existing_quote_ids.add(quote['id'])
-        
-        for ts in engagement_metrics:
-            engagement_metrics[ts].update({
-                'verified_replies': verified_replies.get(ts, 0),
-                'verified_retweets': verified_retweets.get(ts, 0),
-                'verified_quotes': verified_quotes.get(ts, 0)
-            })
+        engagement_metrics = {
+            ts: {
+                **metrics,
+                'verified_replies': history.verified['comments'].get(ts, 0),
+                'verified_retweets': history.verified['retweeters'].get(ts, 0),
+                'verified_quotes': history.verified['quotes'].get(ts, 0)
+            }
+            for ts, metrics in history.engagement_metrics.items()
+        }
 
         ai_analysis_row = await self.tweet_data.get_ai_analysis(tweet_id)
         
@@ -404,42 +346,11 @@ class TweetStructuredRepository():
             input_data = json.loads(ai_analysis_row[1])
             
             # Add profile pictures to top amplifiers
-            if 'top_amplifiers' in input_data:
-                # Add profile pics for commenters
-                if 'commenters' in input_data['top_amplifiers']:
-                    for commenter in input_data['top_amplifiers']['commenters']:
-                        # Look up commenter in comments_tracking to get profile pic
-                        for ts, comments in comments_tracking.items():
-                            for comment in comments:
-                                if comment['screen_name'] == commenter['screen_name']:
-                                    commenter['profile_image_url_https'] = comment['profile_image_url_https']
-                                    break
-                            if 'profile_image_url' in commenter:
-                                break
-                
-                # Add profile pics for retweeters  
-                if 'retweeters' in input_data['top_amplifiers']:
-                    for retweeter in input_data['top_amplifiers']['retweeters']:
-                        # Look up retweeter in retweeters_tracking to get profile pic
-                        for ts, retweeters in retweeters_tracking.items():
-                            for rt in retweeters:
-                                if rt['screen_name'] == retweeter['screen_name']:
-                                    retweeter['profile_image_url_https'] = rt['profile_image_url_https']
-                                    break
-                            if 'profile_image_url' in retweeter:
-                                break
-
-                # Add profile pics for quoters
-                if 'quoters' in input_data['top_amplifiers']:
-                    for quoter in input_data['top_amplifiers']['quoters']:
-                        # Look up quoter in quotes_tracking to get profile pic
-                        for ts, quotes in quotes_tracking.items():
-                            for quote in quotes:
-                                if quote['screen_name'] == quoter['screen_name']:
-                                    quoter['profile_image_url_https'] = quote['profile_image_url_https']
-                                    break
-                            if 'profile_image_url' in quoter:
-                                break
+            for group, stream in AMPLIFIER_STREAMS.items():
+                for amplifier in input_data.get('top_amplifiers', {}).get(group, []):
+                    image = history.profile_images[stream].get(amplifier.get('screen_name'))
+                    if image is not None:
+                        amplifier['profile_image_url_https'] = image
             
             ai_analysis = {
                 'analysis': ai_analysis_row[0],
@@ -450,13 +361,13 @@ class TweetStructuredRepository():
             'tweet_id': tweet_id,
             'full_text': full_text,
             'user': user_info,
-            'timestamps': timestamps,
+            'timestamps': list(engagement_metrics.keys()),
             'engagement_metrics': engagement_metrics,
-            'engagement_changes': engagement_changes,
-            'comments_tracking': comments_tracking,
-            'retweeters_tracking': retweeters_tracking,
-            'quotes_tracking': quotes_tracking,
-            'user_followers': user_followers,
+            'engagement_changes': {ts: dict(changes) for ts, changes in history.engagement_changes.items()},
+            'comments_tracking': history.tracking_copy('comments'),
+            'retweeters_tracking': history.tracking_copy('retweeters'),
+            'quotes_tracking': history.tracking_copy('quotes'),
+            'user_followers': dict(history.user_followers),
             'ai_analysis': ai_analysis
         }
 
@@ -1,13 +1,90 @@
-from datetime import datetime
+import base64
+from datetime import datetime, timezone
+import hashlib
 import json
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Set
 import logging
-from sqlalchemy import select
-from db.migrations import get_async_session
-from db.schemas import MonitoredTweet, TweetDetail, TweetComment, TweetQuote, TweetRetweeter, AIAnalysis, UserTrackedItem
+from sqlalchemy import select, delete, func, and_, or_, literal, cast, tuple_, union_all, BigInteger
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.migrations import get_async_session, session_scope
+from db.schemas import MonitoredAccount, MonitoredTweet, TweetDetail, TweetMetric, TweetComment, TweetQuote, TweetRetweeter, AIAnalysis, UserTrackedItem, UserPostDay, TweetStreamMark
 
 logger = logging.getLogger(__name__)
 
+METRIC_KEYS = ('favorite_count', 'retweet_count', 'reply_count', 'quote_count', 'bookmark_count', 'views_count')
+
+# Columns of tweet_metrics besides the tweet counters
+SNAPSHOT_KEYS = METRIC_KEYS + ('author_followers',)
+
+
+def metrics_from_details(details: Dict[str, Any]) -> Dict[str, Any]:
+    """The counters tracked in tweet_metrics, taken from a tweet's details"""
+    return {
+        **{key: details.get(key) for key in METRIC_KEYS},
+        'author_followers': (details.get('user') or {}).get('followers_count')
+    }
+
+
+def content_hash(details: Dict[str, Any]) -> str:
+    """Hash of a tweet's details without its counters or the author's counters"""
+    content = {key: value for key, value in details.items() if key not in METRIC_KEYS and key != 'user'}
+    content['user'] = {key: value for key, value in (details.get('user') or {}).items() if not key.endswith('_count')}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def parse_tweet_time(value: Optional[str]) -> Optional[int]:
+    """Unix time from a tweet_created_at string (ISO 8601 or the classic Twitter format)"""
+    if not value:
+        return None
+    for fmt in ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z', '%a %b %d %H:%M:%S %z %Y'):
+        try:
+            return int(datetime.strptime(value.replace('Z', '+0000'), fmt).timestamp())
+        except ValueError:
+            continue
+    return None
+
+
+def format_tweet_time(timestamp: Optional[int]) -> Optional[str]:
+    """tweet_created_at string in the format SocialData returns"""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000000Z')
+
+
+def encode_feed_cursor(position: List[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_feed_cursor(cursor: str) -> List[Any]:
+    """Position encoded by encode_feed_cursor; raises ValueError for a malformed cursor"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid feed cursor")
+    if not isinstance(position, list) or len(position) != 4:
+        raise ValueError("Invalid feed cursor")
+    # feed_group, sort_key, tweet_id, item_id
+    for value, types in zip(position, (int, (int, float), str, int)):
+        if isinstance(value, bool) or not isinstance(value, types):
+            raise ValueError("Invalid feed cursor")
+    return position
+
+
+def _metric_row(row: TweetMetric) -> Dict[str, Any]:
+    return {'captured_at': row.captured_at, **{key: getattr(row, key) for key in SNAPSHOT_KEYS}}
+
+
+# Rows per INSERT statement; keeps bind parameters well under the postgres limit
+INSERT_CHUNK_SIZE = 1000
+
+# Table and item id column of each ingested stream
+STREAM_MODELS = {
+    'comments': (TweetComment, TweetComment.comment_id),
+    'retweeters': (TweetRetweeter, TweetRetweeter.user_id),
+    'quotes': (TweetQuote, TweetQuote.quote_id),
+}
+
 class TweetDataRepository():
     async def get_tweet_by_id(self, tweet_id: str) -> Optional[Dict[str, Any]]:
         async with get_async_session() as session:
@@ -38,52 +115,140 @@ class TweetDataRepository():
             tweets = result.scalars().all()
             return [tweet.__dict__ for tweet in tweets]
     
-    async def get_tweets_for_user(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get tweets for a user based on their tracked items"""
+    def _feed_query(self, user_id: str, type: str = "time", sort: str = "desc"):
+        """Union of a user's individually tracked tweets and tweets of tracked accounts.
+
+        Rows carry a sort key that always orders ascending: individual tweets
+        come first, most recently tracked on top, then account tweets by post
+        time or views in the requested direction.
+        """
+        columns = [
+            MonitoredTweet.tweet_id,
+            MonitoredTweet.created_at,
+            MonitoredTweet.is_active,
+            MonitoredTweet.latest_captured_at,
+            *[getattr(MonitoredTweet, key) for key in SNAPSHOT_KEYS],
+            MonitoredTweet.author_id,
+            MonitoredTweet.user_screen_name.label('author_screen_name'),
+            MonitoredTweet.author_profile_image_url,
+            MonitoredTweet.text,
+            MonitoredTweet.tweet_created_at,
+            UserTrackedItem.tracked_id,
+            UserTrackedItem.id.label('item_id'),
+        ]
+        if type == "time":
+            value = func.coalesce(MonitoredTweet.tweet_created_at, MonitoredTweet.created_at)
+        else:
+            value = func.coalesce(MonitoredTweet.views_count, 0)
+        account_sort_key = value if sort.lower() == "asc" else -value
+
+        individual = (
+            select(
+                *columns,
+                literal('individual').label('tracking_type'),
+                literal(0).label('feed_group'),
+                cast(-UserTrackedItem.id, BigInteger).label('sort_key')
+            )
+            .join(UserTrackedItem, and_(
+                UserTrackedItem.tracked_type == 'tweet',
+                UserTrackedItem.tracked_id == MonitoredTweet.tweet_id
+            ))
+            .where(UserTrackedItem.user_id == user_id, MonitoredTweet.latest_captured_at.isnot(None))
+        )
+        accounts = (
+            select(
+                *columns,
+                literal('account').label('tracking_type'),
+                literal(1).label('feed_group'),
+                cast(account_sort_key, BigInteger).label('sort_key')
+            )
+            .join(UserTrackedItem, and_(
+                UserTrackedItem.tracked_type == 'account',
+                UserTrackedItem.tracked_id == MonitoredTweet.account_id
+            ))
+            .where(UserTrackedItem.user_id == user_id, MonitoredTweet.latest_captured_at.isnot(None))
+        )
+        return union_all(individual, accounts).subquery()
+
+    async def get_feed_page(self, user_id: str, limit: int = 20, type: str = "time", sort: str = "desc",
+                            cursor: Optional[str] = None, skip: int = 0) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of a user's feed and the cursor of the next page.
+
+        With a cursor the page starts right after the row it points to
+        (keyset pagination); without one, `skip` rows are skipped.
+        """
+        feed = self._feed_query(user_id, type, sort)
+        order = (feed.c.feed_group, feed.c.sort_key, feed.c.tweet_id, feed.c.item_id)
+        query = select(feed).order_by(*order).limit(limit + 1)
+        if cursor:
+            query = query.where(tuple_(*order) > tuple_(*decode_feed_cursor(cursor)))
+        elif skip:
+            query = query.offset(skip)
+
+        async with get_async_session() as session:
+            result = await session.execute(query)
+            rows = [dict(row) for row in result.mappings().all()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_feed_cursor([last['feed_group'], last['sort_key'], last['tweet_id'], last['item_id']])
+        return rows, next_cursor
+
+    async def count_feed_tweets(self, user_id: str) -> int:
+        """Feed rows a user can page through; tweets without a snapshot yet are not in the feed"""
+        feed = self._feed_query(user_id)
         async with get_async_session() as session:
-            tracked_items_result = await session.execute(
-                select(UserTrackedItem).where(UserTrackedItem.user_id == user_id)
+            result = await session.execute(select(func.count()).select_from(feed))
+            return result.scalar() or 0
+
+    @staticmethod
+    def _post_day(timestamp):
+        """UTC day of a post time, as a SQL expression"""
+        return func.to_char(func.timezone('UTC', func.to_timestamp(timestamp)), 'YYYY-MM-DD')
+
+    async def rebuild_user_post_days(self, user_id: str):
+        """Recount a user's posts per day from their feed, after tracked items changed"""
+        feed = self._feed_query(user_id)
+        day = self._post_day(func.coalesce(feed.c.tweet_created_at, feed.c.created_at))
+        async with get_async_session() as session:
+            await session.execute(delete(UserPostDay).where(UserPostDay.user_id == user_id))
+            await session.execute(
+                insert(UserPostDay).from_select(
+                    ['user_id', 'day', 'post_count'],
+                    select(literal(user_id), day, func.count()).select_from(feed).group_by(day)
+                )
             )
-            tracked_items = tracked_items_result.scalars().all()
-            
-            tweets = []
-            for item in tracked_items:
-                if item.tracked_type == 'account':
-                    # Get tweets for tracked account
-                    account_tweets = await session.execute(
-                        select(MonitoredTweet)
-                        .where(MonitoredTweet.account_id == item.tracked_id)
-                        .order_by(MonitoredTweet.created_at.desc())
-                    )
-                    for tweet in account_tweets.scalars():
-                        tweets.append({
-                            'tweet_id': tweet.tweet_id,
-                            'created_at': tweet.created_at,
-                            'is_active': tweet.is_active,
-                            'tracking_type': 'account',
-                            'tracked_id': item.tracked_id
-                        })
-                elif item.tracked_type == 'tweet':
-                    # Get individual tracked tweet
-                    tweet_result = await session.execute(
-                        select(MonitoredTweet)
-                        .where(MonitoredTweet.tweet_id == item.tracked_id)
-                    )
-                    tweet = tweet_result.scalars().first()
-                    if tweet:
-                        tweets.insert(0, {
-                            'tweet_id': tweet.tweet_id,
-                            'created_at': tweet.created_at,
-                            'is_active': tweet.is_active,
-                            'tracking_type': 'individual',
-                            'tracked_id': item.tracked_id
-                        })
-                
-
-            return tweets
-
-    async def add_account_info_to_monitored_tweet(self, account_id: str, tweet_id: str, screen_name: Optional[str] = None):
+            await session.commit()
+
+    async def _count_new_post(self, session: AsyncSession, tweet: MonitoredTweet):
+        """Add a newly snapshotted tweet to the daily post counts of every user whose feed has it"""
+        day = datetime.fromtimestamp(tweet.tweet_created_at or tweet.created_at, timezone.utc).strftime('%Y-%m-%d')
+        conditions = [and_(UserTrackedItem.tracked_type == 'tweet', UserTrackedItem.tracked_id == tweet.tweet_id)]
+        if tweet.account_id:
+            conditions.append(and_(UserTrackedItem.tracked_type == 'account', UserTrackedItem.tracked_id == tweet.account_id))
+        statement = insert(UserPostDay).from_select(
+            ['user_id', 'day', 'post_count'],
+            select(UserTrackedItem.user_id, literal(day), func.count())
+            .where(or_(*conditions))
+            .group_by(UserTrackedItem.user_id)
+        )
+        await session.execute(statement.on_conflict_do_update(
+            index_elements=[UserPostDay.user_id, UserPostDay.day],
+            set_={'post_count': UserPostDay.post_count + statement.excluded.post_count}
+        ))
+
+    async def get_user_post_days(self, user_id: str) -> Dict[str, int]:
+        """Posts per UTC day in a user's feed"""
         async with get_async_session() as session:
+            result = await session.execute(
+                select(UserPostDay.day, UserPostDay.post_count).where(UserPostDay.user_id == user_id)
+            )
+            return {day: count for day, count in result.all()}
+
+    async def add_account_info_to_monitored_tweet(self, account_id: str, tweet_id: str, screen_name: Optional[str] = None, session: Optional[AsyncSession] = None):
+        async with session_scope(session) as session:
             tweet = await session.execute(
                 select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id)
             )
@@ -102,7 +267,6 @@ class TweetDataRepository():
                     created_at=int(datetime.now().timestamp())
                 )
                 session.add(new_tweet)
-            await session.commit()
     
     async def add_monitored_tweet(self, tweet_id: str, screen_name: Optional[str] = None):
         async with get_async_session() as session:
@@ -114,6 +278,8 @@ class TweetDataRepository():
             if existing_tweet:
                 existing_tweet.user_screen_name = screen_name
                 existing_tweet.is_active = True
+                existing_tweet.monitoring_reason = None
+                existing_tweet.monitoring_decided_at = None
             else:
                 new_tweet = MonitoredTweet(
                     tweet_id=tweet_id,
@@ -124,15 +290,46 @@ class TweetDataRepository():
                 session.add(new_tweet)
             await session.commit()
 
-    async def stop_monitoring_tweet(self, tweet_id: str):
-        async with get_async_session() as session:
+    async def stop_monitoring_tweet(self, tweet_id: str, reason: Optional[str] = None, session: Optional[AsyncSession] = None):
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id)
             )
             tweet = result.scalars().first()
             if tweet:
                 tweet.is_active = False
-                await session.commit()
+                if reason:
+                    tweet.monitoring_reason = reason
+                    tweet.monitoring_decided_at = int(datetime.now().timestamp())
+
+    async def set_monitor_until(self, tweet_id: str, until: int, reason: Optional[str] = None, session: Optional[AsyncSession] = None):
+        """Extend the monitoring window of a tweet"""
+        async with session_scope(session) as session:
+            result = await session.execute(
+                select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id)
+            )
+            tweet = result.scalars().first()
+            if tweet:
+                tweet.monitor_until = until
+                tweet.monitoring_reason = reason
+                tweet.monitoring_decided_at = int(datetime.now().timestamp())
+
+    async def get_monitoring_status(self, tweet_id: str) -> Optional[Dict[str, Any]]:
+        """Get whether a tweet is still monitored and why monitoring stopped or was extended"""
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id)
+            )
+            tweet = result.scalars().first()
+            if not tweet:
+                return None
+            return {
+                'is_active': tweet.is_active,
+                'last_check': tweet.last_check,
+                'monitor_until': tweet.monitor_until,
+                'reason': tweet.monitoring_reason,
+                'decided_at': tweet.monitoring_decided_at
+            }
 
     async def start_monitoring_tweet(self, tweet_id: str):
         async with get_async_session() as session:
@@ -142,22 +339,23 @@ class TweetDataRepository():
             tweet = result.scalars().first()
             if tweet:
                 tweet.is_active = True
+                tweet.monitoring_reason = None
+                tweet.monitoring_decided_at = None
                 await session.commit()
 
-    async def update_tweet_last_check(self, tweet_id: str, timestamp: Optional[int] = None):
+    async def update_tweet_last_check(self, tweet_id: str, timestamp: Optional[int] = None, session: Optional[AsyncSession] = None):
         if timestamp is None:
             timestamp = int(datetime.now().timestamp())
-        async with get_async_session() as session:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id)
             )
             tweet = result.scalars().first()
             if tweet:
                 tweet.last_check = timestamp
-                await session.commit()
     
-    async def get_all_tweet_details(self, tweet_id: str) -> List[Tuple[str, int]]:
-        async with get_async_session() as session:
+    async def get_all_tweet_details(self, tweet_id: str, session: Optional[AsyncSession] = None) -> List[Tuple[str, int]]:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(TweetDetail.data_json, TweetDetail.captured_at)
                 .where(TweetDetail.tweet_id == tweet_id)
@@ -165,8 +363,36 @@ class TweetDataRepository():
             )
             return result.all()
 
-    async def get_latest_tweet_details(self, tweet_id: str) -> Optional[Dict[str, Any]]:
-        async with get_async_session() as session:
+    async def get_tweet_snapshots(self, tweet_id: str, session: Optional[AsyncSession] = None,
+                                  since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the engagement counters of every stored snapshot, or those after `since`, oldest first.
+
+        With `limit`, only the most recent `limit` snapshots are returned.
+        """
+        query = select(TweetMetric).where(TweetMetric.tweet_id == tweet_id)
+        if since is not None:
+            query = query.where(TweetMetric.captured_at > since)
+        async with session_scope(session) as session:
+            if limit is None:
+                result = await session.execute(query.order_by(TweetMetric.captured_at))
+                return [_metric_row(row) for row in result.scalars().all()]
+            result = await session.execute(query.order_by(TweetMetric.captured_at.desc()).limit(limit))
+            return [_metric_row(row) for row in reversed(result.scalars().all())]
+
+    async def get_latest_tweet_metrics(self, tweet_id: str, session: Optional[AsyncSession] = None) -> Optional[Dict[str, Any]]:
+        """Get the most recent engagement counters of a tweet"""
+        async with session_scope(session) as session:
+            result = await session.execute(
+                select(TweetMetric)
+                .where(TweetMetric.tweet_id == tweet_id)
+                .order_by(TweetMetric.captured_at.desc())
+                .limit(1)
+            )
+            row = result.scalars().first()
+            return _metric_row(row) if row else None
+
+    async def get_latest_tweet_details(self, tweet_id: str, session: Optional[AsyncSession] = None) -> Optional[Dict[str, Any]]:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(TweetDetail)
                 .where(TweetDetail.tweet_id == tweet_id)
@@ -176,112 +402,190 @@ class TweetDataRepository():
             detail = result.scalars().first()
             return json.loads(detail.data_json) if detail else None
     
-    async def save_tweet_details(self, tweet_id: str, details: Dict[str, Any], timestamp: Optional[int] = None):
-        """Save tweet details with timestamp"""
+    async def save_tweet_details(self, tweet_id: str, details: Dict[str, Any], timestamp: Optional[int] = None,
+                                 session: Optional[AsyncSession] = None) -> Dict[str, bool]:
+        """Save tweet details with timestamp.
+
+        Counters go to tweet_metrics when any of them changed; the full JSON
+        is only stored when something besides the counters changed.
+        Returns which of the two were written.
+        """
         if timestamp is None:
             timestamp = int(datetime.now().timestamp())
-        async with get_async_session() as session:
-            new_detail = TweetDetail(
-                tweet_id=tweet_id,
-                data_json=json.dumps(details),
-                captured_at=timestamp
+        metrics = metrics_from_details(details)
+        details_hash = content_hash(details)
+        async with session_scope(session) as session:
+            latest_metrics = await self.get_latest_tweet_metrics(tweet_id, session=session)
+            result = await session.execute(
+                select(TweetDetail.content_hash)
+                .where(TweetDetail.tweet_id == tweet_id)
+                .order_by(TweetDetail.captured_at.desc())
+                .limit(1)
             )
-            session.add(new_detail)
-            await session.commit()
+            latest_hash = result.scalars().first()
+
+            metrics_changed = not latest_metrics or any(latest_metrics[key] != metrics[key] for key in SNAPSHOT_KEYS)
+            content_changed = latest_hash != details_hash
+            if metrics_changed:
+                session.add(TweetMetric(tweet_id=tweet_id, captured_at=timestamp, **metrics))
+            if content_changed:
+                session.add(TweetDetail(
+                    tweet_id=tweet_id,
+                    data_json=json.dumps(details),
+                    captured_at=timestamp,
+                    content_hash=details_hash
+                ))
+
+            result = await session.execute(
+                select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id)
+            )
+            tweet = result.scalars().first()
+            if tweet:
+                first_snapshot = tweet.latest_captured_at is None
+                self._apply_latest_snapshot(tweet, details, metrics, timestamp, content_changed)
+                if first_snapshot:
+                    # The tweet enters feeds now, so it starts counting toward streaks
+                    await self._count_new_post(session, tweet)
+        return {'metrics': metrics_changed, 'details': content_changed}
+
+    @staticmethod
+    def _apply_latest_snapshot(tweet: MonitoredTweet, details: Dict[str, Any], metrics: Dict[str, Any],
+                               timestamp: int, content_changed: bool):
+        """Copy the snapshot onto the monitored tweet row so feeds can read it without JSON"""
+        tweet.latest_captured_at = timestamp
+        for key, value in metrics.items():
+            setattr(tweet, key, value)
+        if content_changed or tweet.text is None:
+            user = details.get('user') or {}
+            tweet.author_id = details.get('author_id') or user.get('id_str')
+            tweet.author_profile_image_url = user.get('profile_image_url_https')
+            tweet.text = details.get('full_text') or details.get('text')
+            tweet.tweet_created_at = parse_tweet_time(details.get('tweet_created_at'))
     
     async def remove_all_tweet_data(self, tweet_id: str):
         """Remove all data related to a tweet from all tables"""
         try:
             async with get_async_session() as session:
-                await session.execute(
-                    select(TweetDetail).where(TweetDetail.tweet_id == tweet_id).delete()
-                )
-                await session.execute(
-                    select(TweetComment).where(TweetComment.tweet_id == tweet_id).delete()
-                )
-                await session.execute(
-                    select(TweetRetweeter).where(TweetRetweeter.tweet_id == tweet_id).delete()
-                )
-                await session.execute(
-                    select(AIAnalysis).where(AIAnalysis.tweet_id == tweet_id).delete()
-                )
-                await session.execute(
-                    select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id).delete()
+                result = await session.execute(
+                    select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id)
                 )
+                tweet = result.scalars().first()
+                feed_users = []
+                if tweet and tweet.latest_captured_at is not None:
+                    # Users whose feed showed the tweet, so their post counts get recounted
+                    conditions = [and_(UserTrackedItem.tracked_type == 'tweet', UserTrackedItem.tracked_id == tweet_id)]
+                    if tweet.account_id:
+                        conditions.append(and_(UserTrackedItem.tracked_type == 'account', UserTrackedItem.tracked_id == tweet.account_id))
+                    result = await session.execute(select(UserTrackedItem.user_id).where(or_(*conditions)).distinct())
+                    feed_users = result.scalars().all()
+
+                for model in (TweetDetail, TweetMetric, TweetComment, TweetQuote, TweetRetweeter, TweetStreamMark, AIAnalysis, MonitoredTweet):
+                    await session.execute(delete(model).where(model.tweet_id == tweet_id))
                 await session.commit()
-                logger.info(f"Successfully removed all data for tweet {tweet_id}")
+
+            for user_id in feed_users:
+                await self.rebuild_user_post_days(user_id)
+            logger.info(f"Successfully removed all data for tweet {tweet_id}")
         except Exception as e:
             logger.error(f"Error removing data for tweet {tweet_id}: {str(e)}")
             raise
     
-    async def get_tweet_comments(self, tweet_id: str) -> List[Dict[str, Any]]:
+    async def get_tweet_comments(self, tweet_id: str, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rows for a tweet, only those captured at or after `since` if given, oldest first"""
+        query = select(TweetComment).where(TweetComment.tweet_id == tweet_id)
+        if since is not None:
+            query = query.where(TweetComment.captured_at >= since)
         async with get_async_session() as session:
-            result = await session.execute(
-                select(TweetComment).where(TweetComment.tweet_id == tweet_id)
-            )
+            result = await session.execute(query.order_by(TweetComment.captured_at))
             return result.scalars().all()
 
-    async def save_tweet_comments(self, tweet_id: str, comments: List[Dict[str, Any]], timestamp: Optional[int] = None):
-        """Save tweet comments with timestamp"""
-        if timestamp is None:
-            timestamp = int(datetime.now().timestamp())
+    async def _insert_stream_rows(self, stream: str, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows in chunked multi-row statements, skipping ones already saved; returns rows inserted"""
+        model, id_column = STREAM_MODELS[stream]
+        inserted = 0
         async with get_async_session() as session:
-            for comment in comments:
-                comment_id = str(comment['id'])
-                new_comment = TweetComment(
-                    comment_id=comment_id,
-                    tweet_id=tweet_id,
-                    data_json=json.dumps(comment),
-                    captured_at=timestamp
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                statement = (
+                    insert(model)
+                    .values(rows[start:start + INSERT_CHUNK_SIZE])
+                    .on_conflict_do_nothing()
+                    .returning(id_column)
                 )
-                session.add(new_comment)
+                result = await session.execute(statement)
+                inserted += len(result.scalars().all())
             await session.commit()
+        return inserted
+
+    async def save_tweet_comments(self, tweet_id: str, comments: List[Dict[str, Any]], timestamp: Optional[int] = None) -> int:
+        """Save tweet comments with timestamp, returning how many were new"""
+        if timestamp is None:
+            timestamp = int(datetime.now().timestamp())
+        return await self._insert_stream_rows('comments', [
+            {
+                'comment_id': str(comment['id']),
+                'tweet_id': tweet_id,
+                'data_json': json.dumps(comment),
+                'captured_at': timestamp
+            } for comment in comments
+        ])
 
-    async def get_tweet_quotes(self, tweet_id: str) -> List[Dict[str, Any]]:
+    async def get_tweet_quotes(self, tweet_id: str, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rows for a tweet, only those captured at or after `since` if given, oldest first"""
+        query = select(TweetQuote).where(TweetQuote.tweet_id == tweet_id)
+        if since is not None:
+            query = query.where(TweetQuote.captured_at >= since)
         async with get_async_session() as session:
-            result = await session.execute(
-                select(TweetQuote).where(TweetQuote.tweet_id == tweet_id)
-            )
+            result = await session.execute(query.order_by(TweetQuote.captured_at))
             return result.scalars().all()
 
-    async def save_tweet_quotes(self, tweet_id: str, quotes: List[Dict[str, Any]], timestamp: Optional[int] = None):
-        """Save tweet quotes with timestamp"""
+    async def save_tweet_quotes(self, tweet_id: str, quotes: List[Dict[str, Any]], timestamp: Optional[int] = None) -> int:
+        """Save tweet quotes with timestamp, returning how many were new"""
         if timestamp is None:
             timestamp = int(datetime.now().timestamp())
+        return await self._insert_stream_rows('quotes', [
+            {
+                'quote_id': str(quote['id']),
+                'tweet_id': tweet_id,
+                'data_json': json.dumps(quote),
+                'captured_at': timestamp
+            } for quote in quotes
+        ])
+
+    async def get_tweet_retweeters(self, tweet_id: str, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rows for a tweet, only those captured at or after `since` if given, oldest first"""
+        query = select(TweetRetweeter).where(TweetRetweeter.tweet_id == tweet_id)
+        if since is not None:
+            query = query.where(TweetRetweeter.captured_at >= since)
         async with get_async_session() as session:
-            for quote in quotes:
-                quote_id = str(quote['id'])
-                new_quote = TweetQuote(
-                    quote_id=quote_id,
-                    tweet_id=tweet_id,
-                    data_json=json.dumps(quote),
-                    captured_at=timestamp
-                )
-                session.add(new_quote)
-            await session.commit()
-    async def get_tweet_retweeters(self, tweet_id: str) -> List[Dict[str, Any]]:
-        async with get_async_session() as session:
-            result = await session.execute(
-                select(TweetRetweeter).where(TweetRetweeter.tweet_id == tweet_id)
-            )
+            result = await session.execute(query.order_by(TweetRetweeter.captured_at))
             return result.scalars().all()
 
-    async def save_tweet_retweeters(self, tweet_id: str, retweeters: List[Dict[str, Any]], timestamp: Optional[int] = None):
-        """Save tweet retweeters with timestamp"""
+    async def save_tweet_retweeters(self, tweet_id: str, retweeters: List[Dict[str, Any]], timestamp: Optional[int] = None) -> int:
+        """Save tweet retweeters with timestamp, returning how many were new"""
         if timestamp is None:
             timestamp = int(datetime.now().timestamp())
+        return await self._insert_stream_rows('retweeters', [
+            {
+                'user_id': str(retweeter['id']),
+                'tweet_id': tweet_id,
+                'data_json': json.dumps(retweeter),
+                'captured_at': timestamp
+            } for retweeter in retweeters
+        ])
+
+    async def get_saved_stream_ids(self, tweet_id: str, stream: str, item_ids: List[str]) -> Set[str]:
+        """Which of the given comment, retweeter or quote ids are already saved for a tweet"""
+        if not item_ids:
+            return set()
+        model, id_column = STREAM_MODELS[stream]
         async with get_async_session() as session:
-            for retweeter in retweeters:
-                # Convert user_id to string if it's not already
-                user_id = str(retweeter['id'])
-                new_retweeter = TweetRetweeter(
-                    user_id=user_id,  # Now guaranteed to be a string
-                    tweet_id=tweet_id,
-                    data_json=json.dumps(retweeter),
-                    captured_at=timestamp
+            result = await session.execute(
+                select(id_column).where(
+                    model.tweet_id == tweet_id,
+                    id_column.in_(item_ids)
                 )
-                session.add(new_retweeter)
-            await session.commit()
+            )
+            return set(result.scalars().all())
 
     async def get_monitored_tweets(self) -> List[Dict[str, Any]]:
         async with get_async_session() as session:
@@ -308,6 +612,30 @@ class TweetDataRepository():
                 'last_check': tweet.last_check,
                 'is_active': tweet.is_active
             } for tweet in tweets]
+    async def get_refreshable_tweets(self, tweet_ids: Optional[List[str]] = None,
+                                     created_after: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get active tweets of active accounts, optionally limited to ids or a creation cutoff"""
+        async with get_async_session() as session:
+            query = (
+                select(MonitoredTweet)
+                .join(MonitoredAccount, MonitoredAccount.account_id == MonitoredTweet.account_id)
+                .where(MonitoredTweet.is_active == True, MonitoredAccount.is_active == True)
+            )
+            if tweet_ids is not None:
+                query = query.where(MonitoredTweet.tweet_id.in_(tweet_ids))
+            if created_after is not None:
+                query = query.where(MonitoredTweet.created_at >= created_after)
+            result = await session.execute(query)
+            return [{
+                'tweet_id': tweet.tweet_id,
+                'user_screen_name': tweet.user_screen_name,
+                'account_id': tweet.account_id,
+                'created_at': tweet.created_at,
+                'last_check': tweet.last_check,
+                'is_active': tweet.is_active,
+                'monitor_until': tweet.monitor_until
+            } for tweet in result.scalars().all()]
+
     async def save_ai_analysis(self, tweet_id: str, analysis: str, input_data: Dict[str, Any]):
         timestamp = int(datetime.now().timestamp())
         
@@ -350,10 +678,53 @@ class TweetDataRepository():
             analysis = result.scalars().first()
             return (analysis.analysis, analysis.input_data) if analysis else None
 
-    async def get_latest_monitoring_run(self, tweet_id: str) -> Optional[Dict[str, Any]]:
-        async with get_async_session() as session:
+    async def get_latest_monitoring_run(self, tweet_id: str, session: Optional[AsyncSession] = None) -> Optional[Dict[str, Any]]:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(MonitoredTweet).where(MonitoredTweet.tweet_id == tweet_id)
             )
             tweet = result.scalars().first()
             return (tweet.last_check,) if tweet else None
+
+    async def get_stream_marks(self, tweet_id: str, session: Optional[AsyncSession] = None) -> Dict[str, Dict[str, Any]]:
+        """Get the ingestion high-water mark of each stream for a tweet"""
+        async with session_scope(session) as session:
+            result = await session.execute(
+                select(TweetStreamMark).where(TweetStreamMark.tweet_id == tweet_id)
+            )
+            return {
+                mark.stream: {
+                    'last_id': mark.last_id,
+                    'cursor': mark.cursor,
+                    'pending_id': mark.pending_id,
+                    'updated_at': mark.updated_at
+                } for mark in result.scalars().all()
+            }
+
+    async def save_stream_mark(self, tweet_id: str, stream: str, last_id: Optional[str],
+                               cursor: Optional[str] = None, pending_id: Optional[str] = None):
+        """Save the ingestion high-water mark of a stream for a tweet"""
+        timestamp = int(datetime.now().timestamp())
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(TweetStreamMark).where(
+                    TweetStreamMark.tweet_id == tweet_id,
+                    TweetStreamMark.stream == stream
+                )
+            )
+            mark = result.scalars().first()
+            if mark:
+                mark.last_id = last_id
+                mark.cursor = cursor
+                mark.pending_id = pending_id
+                mark.updated_at = timestamp
+            else:
+                session.add(TweetStreamMark(
+                    tweet_id=tweet_id,
+                    stream=stream,
+                    last_id=last_id,
+                    cursor=cursor,
+                    pending_id=pending_id,
+                    updated_at=timestamp
+                ))
+            await session.commit()
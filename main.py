@@ -18,8 +18,11 @@ from routers.tweet_router import router as tweet_router
 from routers.workshop_router import router as workshop_router
 from routers.stripe_router import router as stripe_payment_router
 from routers.community_router import router as community_router
+from routers.admin_router import router as admin_router
 
 from db.service import Service
+from api_client import TwitterAPIClient
+from worker_pool import monitor_pool
 
 tracemalloc.start()
 load_dotenv()
@@ -54,6 +57,7 @@ app.include_router(community_router)
 app.include_router(tweet_router)
 app.include_router(workshop_router)
 app.include_router(stripe_payment_router)
+app.include_router(admin_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -75,6 +79,9 @@ async def startup_event():
         # Run migrations
         await connect_and_migrate(config.DB_PATH)
         logger.info("Database migrations completed successfully")
+
+        # Open the pooled SocialData session shared by all API clients
+        TwitterAPIClient.open_session()
         
         # Start periodic checks
         asyncio.create_task(service.handle_periodic_checks())
@@ -83,5 +90,14 @@ async def startup_event():
         logger.error(f"Error during startup: {str(e)}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop monitoring workers and release pooled HTTP connections on shutdown"""
+    try:
+        await monitor_pool.stop()
+        await TwitterAPIClient.close_session()
+    except Exception as e:
+        logger.error(f"Error during shutdown: {str(e)}")
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=3001)
\ No newline at end of file
@@ -7,7 +7,14 @@ from db.tw.tweet_db import TweetDataRepository
 from db.tw.structured import TweetStructuredRepository
 from db.tw.account_db import AccountRepository
 from db.api.api_db import APICallLogRepository
-from api_client import TwitterAPIClient
+from db.migrations import session_scope
+from api_client import TwitterAPIClient, CursorPaginator, snowflake_timestamp
+from scheduler import refresh_scheduler
+from saturation import SaturationDetector
+from planner import budget_planner
+from polling import engagement_score
+from worker_pool import monitor_pool
+from config import config
 from analysis.ai import AIAnalyzer
 from analysis.account import AccountAnalyzer
 import json
@@ -20,10 +27,12 @@ logger = logging.getLogger(__name__)
 class MonitoringRun:
     def __init__(self, tweet_id: str, run_timestamp: float):
         self.tweet_id = tweet_id
+        self.screen_name: Optional[str] = None
         self.timestamp = run_timestamp
         self.details_saved = False
         self.comments_saved = False
         self.retweeters_saved = False
+        self.quotes_saved = False
         self.errors: List[str] = []
         self.api_calls = {
             'monitor_timestamp': run_timestamp,
@@ -53,6 +62,10 @@ class TweetMonitor:
         self.api_logger = APICallLogRepository()
         self.api_client = TwitterAPIClient(api_key)
         self.ai_analyze = AIAnalyzer(self.tweet_analysis)
+        self.scheduler = refresh_scheduler
+        self.pool = monitor_pool
+        self.planner = budget_planner
+        self.saturation = SaturationDetector.from_config() if config.SATURATION_DETECTION else None
         self.logger = logging.getLogger(__name__)
         
 
@@ -60,8 +73,9 @@ class TweetMonitor:
     
 
     async def get_latest_user_tweets(self, username: str, since_time: Optional[str] = None) -> List[Dict[str, Any]]:
+        pages = self.api_client.iter_latest_user_tweets(username, since_time)
         try:
-            tweets = await self.api_client.api_get_latest_user_tweets(username, since_time)
+            tweets = await pages.collect()
             if tweets:
                 self.logger.info(f"Retrieved {len(tweets)} tweets for user {username}")
                 return tweets
@@ -71,32 +85,8 @@ class TweetMonitor:
         except Exception as e:
             self.logger.error(f"Error getting tweets for user {username}: {str(e)}")
             return []
-
-    def _needs_update(self, tweet: Dict) -> bool:
-        if not tweet['last_check']:
-            return True
-
-        current_time = datetime.now().timestamp()
-        tweet_age = current_time - tweet['created_at']
-        last_check = tweet['last_check']
-        hours_old = tweet_age / 3600
-        
-        # If over 24 hours old, stop checking
-        if hours_old > 24:
-            return False
-
-        # Over 3 hours old - check once per hour
-        if hours_old > 3:
-            return last_check + 3600 < current_time
-            
-        # Over 1 hour old - check every 15 minutes
-        elif hours_old > 1:
-            return last_check + 900 < current_time
-            
-        # In the first hour - check every 5 minutes
-        else:
-            return last_check + 300 < current_time
-
+        finally:
+            self.planner.record_discovery(pages.pages)
 
     async def _process_monitoring_results(self, results):
         """Process and log API calls from monitoring results"""
@@ -116,6 +106,7 @@ class TweetMonitor:
                             f"Monitoring run for tweet {result.tweet_id} had critical issues: "
                             f"{'; '.join(result.error_messages)}"
                         )
+                    self.planner.record_run(result.api_calls)
                     # Sum up API calls from each result
                     tweet_details_calls += result.api_calls['tweet_details_calls']
                     retweet_api_calls += result.api_calls['retweet_api_calls']
@@ -161,36 +152,173 @@ class TweetMonitor:
             self.logger.error(f"Error fetching tweet details for {tweet_id}: {str(e)}")
             return None, None
 
-    async def _fetch_tweet_comments(self, tweet_id: str, screen_name: Optional[str], since_timestamp: Optional[str] = None) -> List[Dict]:
+    def _stream_paginator(self, tweet_id: str, stream: str, screen_name: Optional[str],
+                          since_timestamp: Optional[str], last_id: Optional[str],
+                          cursor: Optional[str] = None) -> CursorPaginator:
+        """Build a paginator that stops once it reaches items at or below the stream's mark"""
+        stop = None
+        if last_id:
+            if stream == 'retweeters':
+                # Retweeter ids are user ids, so only position tells us what is new
+                stop = lambda item: item.get('id_str') == last_id
+            else:
+                stop = lambda item: int(item['id_str']) <= int(last_id)
+
+        if stream == 'comments':
+            return self.api_client.iter_tweet_comments(
+                tweet_id, screen_name,
+                since_timestamp=None if last_id else since_timestamp,
+                since_id=last_id,
+                stop=stop,
+                cursor=cursor
+            )
+        if stream == 'retweeters':
+            return self.api_client.iter_tweet_retweeters(tweet_id, stop=stop, cursor=cursor)
+        return self.api_client.iter_tweet_quotes(tweet_id, stop=stop, cursor=cursor)
+
+    async def _stream_pass(self, tweet_id: str, stream: str, pages: CursorPaginator, save,
+                           progress: Dict[str, Any], run_timestamp: Optional[int]):
+        """Save one paginated pass page by page, tracking the newest id seen and rows saved"""
+        progress['newest_id'] = None
+        async for page in pages:
+            if progress['newest_id'] is None:
+                progress['newest_id'] = page[0]['id_str']
+            if stream != 'retweeters':
+                progress['newest_id'] = max([progress['newest_id']] + [item['id_str'] for item in page], key=int)
+
+            # Look up only this page's ids, so the cost follows new data rather than history
+            seen = progress.setdefault('ids', set())
+            unseen = [item['id_str'] for item in page if item['id_str'] not in seen]
+            saved = await self.tweet_data.get_saved_stream_ids(tweet_id, stream, unseen)
+            seen.update(saved)
+
+            new_items = [item for item in page if item['id_str'] not in seen]
+            if new_items:
+                # Rows another run saved in the meantime are skipped by the insert
+                inserted = await save(tweet_id, new_items, run_timestamp)
+                seen.update(item['id_str'] for item in new_items)
+                progress['saved'] = progress.get('saved', 0) + inserted
+
+    @staticmethod
+    def _newer_id(stream: str, first: Optional[str], second: Optional[str]) -> Optional[str]:
+        if not first or not second:
+            return first or second
+        if stream == 'retweeters':
+            # Positional ids: the first argument always comes from the newer pass
+            return first
+        return max(first, second, key=int)
+
+    async def _save_stream_mark_safely(self, tweet_id: str, stream: str, last_id: Optional[str],
+                                       cursor: Optional[str] = None, pending_id: Optional[str] = None):
         try:
-            comments = await self.api_client.api_get_tweet_comments(tweet_id, screen_name, since_timestamp)
-            
-            return comments['data'] if comments else []
+            await self.tweet_data.save_stream_mark(tweet_id, stream, last_id, cursor, pending_id)
         except Exception as e:
-            self.logger.error(f"Error fetching comments for {tweet_id}: {str(e)}")
-            return []
-
-    async def _fetch_tweet_retweeters(self, tweet_id: str) -> List[Dict]:
+            self.logger.error(f"Error saving {stream} mark for {tweet_id}: {str(e)}")
+
+    async def _ingest_stream(self, monitoring_run: MonitoringRun, tweet_id: str, stream: str,
+                             screen_name: Optional[str], since_timestamp: Optional[str],
+                             mark: Optional[Dict[str, Any]], run_timestamp: Optional[int]) -> int:
+        """Ingest new comments, retweeters or quotes down to the stream's high-water mark.
+
+        If the previous pass was interrupted, it is first resumed from its saved
+        cursor so the gap down to the old mark gets filled; the fresh pass from
+        the top then only needs to reach what that interrupted pass already saw.
+        """
+        calls_key, saved_attr, save = {
+            'comments': ('comment_api_calls', 'comments_saved', self.tweet_data.save_tweet_comments),
+            'retweeters': ('retweet_api_calls', 'retweeters_saved', self.tweet_data.save_tweet_retweeters),
+            'quotes': ('quote_api_calls', 'quotes_saved', self.tweet_data.save_tweet_quotes),
+        }[stream]
+
+        mark = mark or {}
+        last_id = mark.get('last_id')
+        progress: Dict[str, Any] = {}
         try:
-            retweeters = await self.api_client.api_get_tweet_retweeters(tweet_id)
-            return retweeters['data'] if retweeters else []
+            if mark.get('cursor'):
+                self.logger.info(f"Resuming interrupted {stream} pass for tweet {tweet_id}")
+                pages = self._stream_paginator(tweet_id, stream, screen_name, since_timestamp, last_id, mark['cursor'])
+                try:
+                    await self._stream_pass(tweet_id, stream, pages, save, progress, run_timestamp)
+                except Exception:
+                    await self._save_stream_mark_safely(
+                        tweet_id, stream, last_id, pages.page_cursor or mark['cursor'], mark.get('pending_id')
+                    )
+                    raise
+                finally:
+                    monitoring_run.api_calls[calls_key] += pages.pages
+                # Gap closed: everything down to the old mark is ingested
+                last_id = self._newer_id(stream, mark.get('pending_id'), last_id)
+
+            pages = self._stream_paginator(tweet_id, stream, screen_name, since_timestamp, last_id)
+            try:
+                await self._stream_pass(tweet_id, stream, pages, save, progress, run_timestamp)
+            except Exception:
+                # Keep the last good cursor so the next run resumes instead of restarting
+                if pages.page_cursor and progress.get('newest_id'):
+                    await self._save_stream_mark_safely(tweet_id, stream, last_id, pages.page_cursor, progress['newest_id'])
+                else:
+                    await self._save_stream_mark_safely(tweet_id, stream, last_id)
+                raise
+            finally:
+                monitoring_run.api_calls[calls_key] += pages.pages
+
+            # Only a completed pass may advance the mark
+            await self.tweet_data.save_stream_mark(tweet_id, stream, self._newer_id(stream, progress.get('newest_id'), last_id))
+            setattr(monitoring_run, saved_attr, True)
+            if progress.get('saved'):
+                self.logger.info(f"Successfully saved {progress['saved']} new {stream} for tweet {tweet_id}")
+            else:
+                self.logger.info(f"No new {stream} found for tweet {tweet_id}")
         except Exception as e:
-            self.logger.error(f"Error fetching retweeters for {tweet_id}: {str(e)}")
-            return []
-        
-    async def _fetch_tweet_quotes(self, tweet_id: str) -> List[Dict]:
+            monitoring_run.add_error(stream, str(e), critical=False)
+            self.logger.error(f"Error saving {stream} for {tweet_id}: {str(e)}")
+        return progress.get('saved', 0)
+
+    async def _check_saturation(self, tweet_id: str, checked_at: int, current: Dict[str, Any]) -> bool:
+        """Stop or extend monitoring from the tweet's engagement curve; True if monitoring stopped"""
+        if not self.saturation:
+            return False
+        created_at = self.scheduler.created_at(tweet_id)
+        if created_at is None or checked_at - created_at < self.saturation.min_age:
+            return False
         try:
-            quotes = await self.api_client.api_get_tweet_quotes(tweet_id)
-            return quotes['data'] if quotes else []
+            async with session_scope() as session:
+                snapshots = await self.tweet_data.get_tweet_snapshots(
+                    tweet_id, session=session, limit=self.saturation.max_snapshots
+                )
+                # Unchanged counters are not stored, so the current poll may be missing
+                if not snapshots or snapshots[-1]['captured_at'] < checked_at:
+                    snapshots.append(current)
+                decision = self.saturation.evaluate(created_at, snapshots, checked_at, self.scheduler.window_end(tweet_id))
+                if not decision:
+                    return False
+                if decision['action'] == 'stop':
+                    await self.tweet_data.stop_monitoring_tweet(tweet_id, reason=decision['reason'], session=session)
+                else:
+                    await self.tweet_data.set_monitor_until(tweet_id, decision['until'], decision['reason'], session=session)
+            if decision['action'] == 'stop':
+                self.scheduler.drop(tweet_id)
+                self.planner.forget(tweet_id)
+                self.logger.info(f"Stopped monitoring tweet {tweet_id}: {decision['reason']}")
+                return True
+            self.scheduler.extend(tweet_id, decision['until'])
+            self.logger.info(f"Extended monitoring of tweet {tweet_id} until {decision['until']}: {decision['reason']}")
         except Exception as e:
-            self.logger.error(f"Error fetching quotes for {tweet_id}: {str(e)}")
-            return []
+            self.logger.error(f"Error checking engagement saturation for {tweet_id}: {str(e)}")
+        return False
 
     async def monitor_tweet(self, tweet_id: str, tweet: Optional[Dict] = None, run_timestamp: Optional[int] = None) -> MonitoringRun:
         try:
             self.logger.info(f"Starting monitoring run for tweet {tweet_id}")
             monitoring_run = MonitoringRun(tweet_id, run_timestamp)
-            latest_tweet_details = await self.tweet_data.get_latest_tweet_details(tweet_id)
+            # One session for the run's reads and one transaction for its writes,
+            # instead of a connection checkout and commit per repository call
+            async with session_scope() as session:
+                latest_metrics = await self.tweet_data.get_latest_tweet_metrics(tweet_id, session=session)
+                # Read the previous check before this run overwrites it
+                latest_run = await self.tweet_data.get_latest_monitoring_run(tweet_id, session=session)
+                marks = await self.tweet_data.get_stream_marks(tweet_id, session=session)
+            since_timestamp = str(latest_run[0]) if latest_run and latest_run[0] else None
             if tweet:
                 details = tweet
                 screen_name = tweet['user']['screen_name']
@@ -205,24 +333,40 @@ class TweetMonitor:
                     account_id = user_data.get('id_str')
                     screen_name = user_data.get('screen_name')
 
-                    if user_data:
-                        await self.accounts.upsert_account(account_id, screen_name, user_data, is_active=True, update_existing=True)
+                    async with session_scope() as session:
+                        if user_data:
+                            await self.accounts.upsert_account(account_id, screen_name, user_data, is_active=True,
+                                                               update_existing=True, session=session)
 
-                    if account_id and screen_name:
-                        self.logger.info(f"Adding account info to monitored tweet {tweet_id}")
-                        await self.tweet_data.add_account_info_to_monitored_tweet(account_id, tweet_id, screen_name)
+                        if account_id and screen_name:
+                            self.logger.info(f"Adding account info to monitored tweet {tweet_id}")
+                            await self.tweet_data.add_account_info_to_monitored_tweet(account_id, tweet_id, screen_name, session=session)
 
-                    self.logger.info(f"Saving tweet details for {tweet_id}")
-                    
-                    await self.tweet_data.save_tweet_details(
-                        tweet_id=tweet_id,
-                        details=details,
-                        timestamp=run_timestamp
-                    )
+                        self.logger.info(f"Saving tweet details for {tweet_id}")
+
+                        await self.tweet_data.save_tweet_details(
+                            tweet_id=tweet_id,
+                            details=details,
+                            timestamp=run_timestamp,
+                            session=session
+                        )
 
-                    await self.tweet_data.update_tweet_last_check(tweet_id, run_timestamp)
+                        await self.tweet_data.update_tweet_last_check(tweet_id, run_timestamp, session=session)
+                    checked_at = run_timestamp or int(datetime.now().timestamp())
+                    snapshots = [dict(details, captured_at=checked_at)]
+                    if latest_metrics and latest_run and latest_run[0]:
+                        # The previous snapshot was captured at the previous check
+                        snapshots.append(dict(latest_metrics, captured_at=latest_run[0]))
+                    if latest_metrics:
+                        # Before the finish checks below, so a finished tweet stays forgotten
+                        self.planner.record_value(tweet_id, engagement_score(details) - engagement_score(latest_metrics))
+                    if not await self._check_saturation(tweet_id, checked_at, snapshots[0]):
+                        if not self.scheduler.record_check(tweet_id, checked_at, snapshots=snapshots):
+                            # Its window is over, so its poll value is no longer needed
+                            self.planner.forget(tweet_id)
                     
                     monitoring_run.details_saved = True
+                    monitoring_run.screen_name = screen_name
                     self.logger.info(f"Successfully saved details for tweet {tweet_id}")
                 except Exception as e:
                     monitoring_run.add_error("details", str(e), critical=True)
@@ -232,147 +376,48 @@ class TweetMonitor:
                 self.logger.error(f"Failed to fetch details for tweet {tweet_id}")
                 return monitoring_run
 
+            # Check if tweet details exist and compare engagement metrics
+            comments_needs_update = True
+            retweets_needs_update = True
+            quotes_needs_update = True
+            
             try:
-                latest_run = await self.tweet_data.get_latest_monitoring_run(tweet_id)
-                
-                since_timestamp = str(latest_run[0]) if latest_run else None
-
-                # Check if tweet details exist and compare engagement metrics
-                comments_needs_update = True
-                retweets_needs_update = True
-                quotes_needs_update = True
-                
-                if latest_tweet_details:
-                    try:
-                        quotes_needs_update = latest_tweet_details.get('quote_count') != details.get('quote_count')
-                        comments_needs_update = latest_tweet_details.get('reply_count') != details.get('reply_count')
-                        retweets_needs_update = latest_tweet_details.get('retweet_count') != details.get('retweet_count')
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error comparing tweet engagement for {tweet_id}: {str(e)}")
-            except Exception as e:
-                self.logger.error(f"Error getting monitoring run info for {tweet_id}: {str(e)}")
-
-            try:
-                if comments_needs_update:
-                    
-                    comments = await self._fetch_tweet_comments(tweet_id, screen_name, since_timestamp)
-                    if comments:
-                        monitoring_run.api_calls['comment_api_calls'] += len(comments) + 1
-                        try:
-                            
-                            tweet_history = await self.tweet_analysis.get_raw_tweet_history(tweet_id)
-                            existing_comments = {
-                                comment['data']['id_str'] 
-                                for comment in tweet_history.get('comments', [])
-                            }
-                            
-                            new_comments = [
-                                comment for comment in comments 
-                                if comment['id_str'] not in existing_comments
-                            ]
-                            
-                            if new_comments:
-                                self.logger.info(f"Saving {len(new_comments)} new comments for tweet {tweet_id}")
-                                await self.tweet_data.save_tweet_comments(
-                                    tweet_id=tweet_id,
-                                    comments=new_comments,
-                                    timestamp=run_timestamp
-                                )
-                                monitoring_run.comments_saved = True
-                                self.logger.info(f"Successfully saved {len(new_comments)} new comments for tweet {tweet_id}")
-                                
-                            else:
-                                monitoring_run.comments_saved = True
-                                self.logger.info(f"No new comments found for tweet {tweet_id}")
-                                
-                        except Exception as e:
-                            monitoring_run.add_error("comments", str(e), critical=False)
-                            self.logger.error(f"Error saving comments for {tweet_id}: {str(e)}")
-            except Exception as e:
-                self.logger.error(f"Error processing comments for {tweet_id}: {str(e)}")
-
-            try:
-                if retweets_needs_update:
-                    self.logger.info(f"Fetching retweeters for tweet {tweet_id}")
-                    retweeters = await self._fetch_tweet_retweeters(tweet_id)
-                    
-                    if retweeters:
-                        monitoring_run.api_calls['retweet_api_calls'] += len(retweeters) + 1
-                        try:
-                            self.logger.info(f"Getting tweet history for retweeters comparison for {tweet_id}")
-                            tweet_history = await self.tweet_analysis.get_raw_tweet_history(tweet_id)
-                            existing_retweeters = {
-                                retweeter['data']['id_str']
-                                for retweeter in tweet_history.get('retweeters', [])
-                            }
-                            
-                            new_retweeters = [
-                                retweeter for retweeter in retweeters 
-                                if retweeter['id_str'] not in existing_retweeters
-                            ]
-                            
-                            if new_retweeters:
-                                self.logger.info(f"Saving {len(new_retweeters)} new retweeters for tweet {tweet_id}")
-                                await self.tweet_data.save_tweet_retweeters(
-                                    tweet_id=tweet_id,
-                                    retweeters=new_retweeters,
-                                    timestamp=run_timestamp
-                                )
-                                monitoring_run.retweeters_saved = True
-                                self.logger.info(f"Successfully saved {len(new_retweeters)} new retweeters for tweet {tweet_id}")
-                            else:
-                                monitoring_run.retweeters_saved = True
-                                self.logger.info(f"No new retweeters found for tweet {tweet_id}")
-                                
-                        except Exception as e:
-                            monitoring_run.add_error("retweeters", str(e), critical=False)
-                            self.logger.error(f"Error saving retweeters for {tweet_id}: {str(e)}")
-            except Exception as e:
-                self.logger.error(f"Error processing retweeters for {tweet_id}: {str(e)}")
-
-            try:
-                if quotes_needs_update:
-                    self.logger.info(f"Fetching quotes for tweet {tweet_id}")
-                    quotes = await self._fetch_tweet_quotes(tweet_id)
-                    if quotes:
-                        monitoring_run.api_calls['quote_api_calls'] += len(quotes) + 1
-                        try:
-                            self.logger.info(f"Getting tweet history for quotes comparison for {tweet_id}")
-                            tweet_history = await self.tweet_analysis.get_raw_tweet_history(tweet_id)
-                            
-                            existing_quotes = set()
-                            if tweet_history and 'quotes' in tweet_history:
-                                for quote in tweet_history['quotes']:
-                                    try:
-                                        quote_data = quote['data']  # Access data directly from dict
-                                        existing_quotes.add(quote_data['id_str'])
-                                    except (KeyError, TypeError) as e:
-                                        self.logger.warning(f"Error parsing quote data: {str(e)}")
-                            
-                            new_quotes = [
-                                quote for quote in quotes
-                                if quote['id_str'] not in existing_quotes
-                            ]
-                            
-                            if new_quotes:
-                                self.logger.info(f"Saving {len(new_quotes)} new quotes for tweet {tweet_id}")
-                                await self.tweet_data.save_tweet_quotes(
-                                    tweet_id=tweet_id,
-                                    quotes=new_quotes,
-                                    timestamp=run_timestamp
-                                )
-                                monitoring_run.quotes_saved = True
-                                self.logger.info(f"Successfully saved {len(new_quotes)} new quotes for tweet {tweet_id}")
-                            else:
-                                monitoring_run.quotes_saved = True
-                                self.logger.info(f"No new quotes found for tweet {tweet_id}")
-                                
-                        except Exception as e:
-                            monitoring_run.add_error("quotes", str(e), critical=False)
-                            self.logger.error(f"Error saving quotes for {tweet_id}: {str(e)}")
+                previous = latest_metrics or {}
+                changes = {
+                    stream: (details.get(key) or 0) - (previous.get(key) or 0)
+                    for stream, key in (('comments', 'reply_count'), ('retweeters', 'retweet_count'), ('quotes', 'quote_count'))
+                }
+                if latest_metrics:
+                    quotes_needs_update = latest_metrics.get('quote_count') != details.get('quote_count')
+                    comments_needs_update = latest_metrics.get('reply_count') != details.get('reply_count')
+                    retweets_needs_update = latest_metrics.get('retweet_count') != details.get('retweet_count')
+
+                # Under budget pressure, low-value streams are skipped first
+                comments_needs_update = comments_needs_update and self.planner.allows_stream('comments', changes['comments'])
+                retweets_needs_update = retweets_needs_update and self.planner.allows_stream('retweeters', changes['retweeters'])
+                quotes_needs_update = quotes_needs_update and self.planner.allows_stream('quotes', changes['quotes'])
             except Exception as e:
-                self.logger.error(f"Error processing quotes for {tweet_id}: {str(e)}")
+                self.logger.error(f"Error comparing tweet engagement for {tweet_id}: {str(e)}")
+
+            # The streams are independent, so fetch them side by side; each one
+            # records its own errors and api calls on the run
+            streams = [
+                stream for stream, needs_update in (
+                    ('comments', comments_needs_update),
+                    ('retweeters', retweets_needs_update),
+                    ('quotes', quotes_needs_update),
+                ) if needs_update
+            ]
+            if streams:
+                self.logger.info(f"Fetching {', '.join(streams)} for tweet {tweet_id}")
+                results = await asyncio.gather(*[
+                    self._ingest_stream(monitoring_run, tweet_id, stream, screen_name, since_timestamp, marks.get(stream), run_timestamp)
+                    for stream in streams
+                ], return_exceptions=True)
+                for stream, result in zip(streams, results):
+                    if isinstance(result, Exception):
+                        monitoring_run.add_error(stream, str(result), critical=False)
+                        self.logger.error(f"Error ingesting {stream} for {tweet_id}: {str(result)}")
 
             """ try:
                 await self.ai_analyze.generate_ai_analysis_tweet(tweet_id, with_ai=False)
@@ -392,21 +437,61 @@ class TweetMonitor:
     async def check_and_update_tweets(self):
         "monitors existing tweets and updates if needed"
         try:
-            accounts = await self.accounts.get_monitored_accounts()
-            active_accounts = [account['account_id'] for account in accounts if account['is_active']]
-            tweets = await self.tweet_data.get_monitored_tweets_from_accounts(active_accounts)
-            update_tasks = []
+            if self.api_client.limiter.is_paused():
+                self.logger.warning(f"Skipping tweet updates, SocialData calls paused: {self.api_client.limiter.pause_reason}")
+                return
+
+            if not self.scheduler.seeded:
+                await self.scheduler.seed(self.tweet_data, self.saturation.max_window if self.saturation else None)
+
             run_timestamp = int(datetime.now().timestamp())
-            for tweet in tweets:
-                if tweet['is_active'] and self._needs_update(tweet):
-                    self.logger.info(
-                        f"Tweet {tweet['tweet_id']} needs update "
-                        f"(last check: {tweet['last_check'] or 'never'})"
-                    )
-                    update_tasks.append(self.monitor_tweet(tweet_id=tweet['tweet_id'], run_timestamp=run_timestamp))
-                
-            if update_tasks:
-                results = await asyncio.gather(*update_tasks, return_exceptions=True)
+            due = self.scheduler.pop_due(run_timestamp)
+            if not due:
+                self.logger.info("No tweets need updating at this time")
+                return
+
+            # Only the due tweets are read back, to skip ones stopped since they were scheduled
+            try:
+                tweets = await self.tweet_data.get_refreshable_tweets(tweet_ids=[tweet_id for tweet_id, _, _ in due])
+            except Exception:
+                for tweet_id, _, _ in due:
+                    self.scheduler.retry(tweet_id)
+                raise
+            refreshable = {tweet['tweet_id']: tweet for tweet in tweets}
+            for tweet_id, _, _ in due:
+                if tweet_id not in refreshable:
+                    self.scheduler.drop(tweet_id)
+                    self.planner.forget(tweet_id)
+
+            # Poll what the credit budget allows now, most valuable first, and defer the rest
+            selected, deferred = self.planner.allot([tweet_id for tweet_id, _, _ in due if tweet_id in refreshable])
+            for tweet_id in deferred:
+                self.scheduler.retry(tweet_id, self.planner.defer_seconds)
+            selected = set(selected)
+
+            update_ids = []
+            update_jobs = []
+            for tweet_id, due_at, _ in due:
+                tweet = refreshable.get(tweet_id)
+                if tweet_id not in selected:
+                    continue
+                self.logger.info(
+                    f"Tweet {tweet_id} needs update "
+                    f"(last check: {tweet['last_check'] or 'never'})"
+                )
+                self.scheduler.record_lag(due_at, run_timestamp)
+                update_ids.append(tweet_id)
+                update_jobs.append((
+                    tweet_id,
+                    lambda tweet_id=tweet_id: self.monitor_tweet(tweet_id=tweet_id, run_timestamp=run_timestamp)
+                ))
+
+            if update_jobs:
+                results = await self.pool.run_all(update_jobs)
+                for tweet_id, result in zip(update_ids, results):
+                    # Successful runs reschedule themselves; the rest are tried again shortly
+                    if not (isinstance(result, MonitoringRun) and result.details_saved):
+                        self.scheduler.retry(tweet_id)
                 await self._process_monitoring_results(results)
             else:
                 self.logger.info("No tweets need updating at this time")
@@ -427,6 +512,8 @@ class TweetMonitor:
                     self.logger.info(f"Account {screen_name} has too many followers ({user_details['followers_count']}), not monitoring")
                     return None
                 await self.accounts.upsert_account(account_id, screen_name, user_details,update_existing=True, is_active=True)
+                # Tweets of a re-activated account are not in the schedule yet
+                self.scheduler.invalidate()
                 
                 try:
                     asyncio.create_task(self.account_analyzer.analyze_account(account_id, new_fetch=True, user_id=user_id))
@@ -439,37 +526,143 @@ class TweetMonitor:
         except Exception as e:
             self.logger.error(f"Error monitoring account {screen_name}: {str(e)}")
             return None
-    async def check_and_update_accounts(self):
-            "monitors accounts for new tweets"
-            try:
-                accounts = await self.accounts.get_monitored_accounts()
-                for account in accounts:
-                    if account['is_active']:
-                        since_time = account['last_check']
-                        if not since_time:
-                            since_time = account['created_at']
-                        
-                        new_tweets = await self.get_latest_user_tweets(
-                            account['screen_name'],
-                            since_time=since_time
-                        )
-                        
-                        run_timestamp = int(datetime.now().timestamp())
-                        for tweet in new_tweets:
-                            tweet_id = tweet['id_str']
-                            screen_name = tweet['user']['screen_name']
-                            await self.tweet_data.add_monitored_tweet(tweet_id, screen_name)
-                            await self.monitor_tweet(tweet_id=tweet_id, tweet=tweet, run_timestamp=run_timestamp)
-
-                        if new_tweets:
-                            self.logger.info(
-                                f"Found {len(new_tweets)} new tweets from {account['screen_name']}"
-                            )
-                            
-                        current_timestamp = int(datetime.now().timestamp())
-                        await self.accounts.update_account_last_check(account['account_id'], current_timestamp)
-
-                await asyncio.sleep(180)
+    async def _start_new_tweets(self, account: Dict[str, Any], new_tweets: List[Dict[str, Any]], checked_at: int) -> List[Any]:
+        """Start monitoring an account's new tweets and move its last check forward"""
+        run_timestamp = int(datetime.now().timestamp())
+        for tweet in new_tweets:
+            await self.tweet_data.add_monitored_tweet(tweet['id_str'], tweet['user']['screen_name'])
+        results = await self.pool.run_all([
+            (
+                tweet['id_str'],
+                lambda tweet=tweet: self.monitor_tweet(tweet_id=tweet['id_str'], tweet=tweet, run_timestamp=run_timestamp)
+            )
+            for tweet in new_tweets
+        ])
 
+        if new_tweets:
+            self.logger.info(
+                f"Found {len(new_tweets)} new tweets from {account['screen_name']}"
+            )
+
+        await self.accounts.update_account_last_check(account['account_id'], checked_at)
+        return results
+
+    async def _check_account(self, account: Dict[str, Any], semaphore: asyncio.Semaphore) -> List[Any]:
+        """Look for new tweets from one account with a search and start monitoring them"""
+        async with semaphore:
+            since_time = account['last_check']
+            if not since_time:
+                since_time = account['created_at']
+
+            new_tweets = await self.get_latest_user_tweets(
+                account['screen_name'],
+                since_time=since_time
+            )
+            checked_at = int(datetime.now().timestamp())
+
+        return await self._start_new_tweets(account, new_tweets, checked_at)
+
+    async def _check_discovery_list(self, list_id: str, members: List[Dict[str, Any]],
+                                    semaphore: asyncio.Semaphore) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """Find new tweets for every account in a list from one paginated list timeline.
+
+        Tweets are routed to accounts by author id and retweets are skipped,
+        matching the per-account search. If the timeline could not be read
+        back to the oldest member's last check, the members are returned for
+        a per-account search instead.
+        """
+        since = {
+            account['account_id']: account['last_check'] or account['created_at']
+            for account in members
+        }
+        oldest = min(since.values())
+        reached = {'oldest': False}
+
+        def stop(tweet: Dict[str, Any]) -> bool:
+            if snowflake_timestamp(tweet['id_str']) < oldest:
+                reached['oldest'] = True
+                return True
+            return False
+
+        new_tweets = {account_id: [] for account_id in since}
+        async with semaphore:
+            pages = self.api_client.iter_list_tweets(list_id, max_pages=config.DISCOVERY_LIST_MAX_PAGES, stop=stop)
+            try:
+                async for page in pages:
+                    for tweet in page:
+                        # Timelines include members' retweets, which the from: search never returns
+                        if tweet.get('retweeted_status'):
+                            continue
+                        account_id = tweet.get('user', {}).get('id_str')
+                        if account_id in since and snowflake_timestamp(tweet['id_str']) >= since[account_id]:
+                            new_tweets[account_id].append(tweet)
             except Exception as e:
-                self.logger.error(f"Error checking accounts for new tweets: {str(e)}")
\ No newline at end of file
+                self.logger.error(f"Error reading discovery list {list_id}: {str(e)}")
+                return [], members
+            finally:
+                self.planner.record_discovery(pages.pages)
+            checked_at = int(datetime.now().timestamp())
+
+        if not (reached['oldest'] or (pages.exhausted and pages.items)):
+            self.logger.warning(
+                f"Discovery list {list_id} did not reach back to the last check after {pages.pages} pages, "
+                f"falling back to search for {len(members)} accounts"
+            )
+            return [], members
+
+        self.logger.info(f"Checked {len(members)} accounts through discovery list {list_id} in {pages.pages} pages")
+        results = []
+        for account in members:
+            results.extend(await self._start_new_tweets(account, new_tweets[account['account_id']], checked_at))
+        return results, []
+
+    async def check_and_update_accounts(self):
+        "monitors accounts for new tweets"
+        try:
+            if self.api_client.limiter.is_paused():
+                self.logger.warning(f"Skipping account checks, SocialData calls paused: {self.api_client.limiter.pause_reason}")
+                return
+            if not self.planner.allows_discovery():
+                self.logger.warning(f"Budget level {self.planner.level()[0]}: skipping this account discovery sweep")
+                return
+
+            accounts = await self.accounts.get_monitored_accounts()
+            active_accounts = [account for account in accounts if account['is_active']]
+            semaphore = asyncio.Semaphore(config.ACCOUNT_CHECK_CONCURRENCY)
+
+            lists: Dict[str, List[Dict[str, Any]]] = {}
+            search_accounts = []
+            for account in active_accounts:
+                if account.get('discovery_list_id') in config.DISCOVERY_LIST_IDS:
+                    lists.setdefault(account['discovery_list_id'], []).append(account)
+                else:
+                    search_accounts.append(account)
+
+            monitoring_results = []
+            list_results = await asyncio.gather(
+                *(self._check_discovery_list(list_id, members, semaphore) for list_id, members in lists.items()),
+                return_exceptions=True
+            )
+            for (list_id, members), result in zip(lists.items(), list_results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error checking discovery list {list_id}: {str(result)}")
+                    search_accounts.extend(members)
+                else:
+                    monitoring_results.extend(result[0])
+                    search_accounts.extend(result[1])
+
+            results = await asyncio.gather(
+                *(self._check_account(account, semaphore) for account in search_accounts),
+                return_exceptions=True
+            )
+            for account, result in zip(search_accounts, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error checking account {account['screen_name']} for new tweets: {str(result)}")
+                else:
+                    monitoring_results.extend(result)
+
+            if monitoring_results:
+                await self._process_monitoring_results(monitoring_results)
+
+        except Exception as e:
+            self.logger.error(f"Error checking accounts for new tweets: {str(e)}")
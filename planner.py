@@ -0,0 +1,239 @@
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Tuple
+from config import config
+from rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Value of one new item per stream; the lowest-value streams are dropped first
+STREAM_WEIGHTS = {
+    'comments': 1.0,
+    'quotes': 1.5,
+    'retweeters': 0.5,
+}
+
+# Budget pressure (projected spend / daily budget) at which each level starts,
+# and the value per credit a stream must promise to still be fetched
+LEVELS = [
+    ('normal', 0, 0),
+    ('tight', 0.8, 1),
+    ('critical', 1.0, 5),
+    ('severe', 1.5, 20),
+]
+
+# Under pressure account discovery runs only every Nth sweep
+DISCOVERY_SPACING = {
+    'tight': 2,
+    'critical': 4,
+    'severe': 8,
+}
+
+CALLS_KEYS = {
+    'details': 'tweet_details_calls',
+    'comments': 'comment_api_calls',
+    'retweeters': 'retweet_api_calls',
+    'quotes': 'quote_api_calls',
+}
+
+SPEND_KEYS = list(CALLS_KEYS) + ['discovery']
+
+
+class BudgetPlanner:
+    """Spreads the daily SocialData credit budget over tweet refreshes and account discovery.
+
+    Each cycle, due tweets are ranked by the engagement their past polls
+    found (an EWMA). Once spend is on track to exceed the budget, only as
+    many as the remaining credits paced over the rest of the day cover are
+    polled; the rest are deferred. Within a run, each stream's expected
+    value per credit is its counter's change times the stream weight over
+    its usual page count, and as budget pressure rises streams below the
+    current level's threshold are skipped, so retweeters go first and
+    details are always fetched. Discovery sweeps are spaced further apart
+    as pressure rises. Polling only stops once no credits are left. Without
+    a daily budget the planner only records spend.
+    """
+
+    def __init__(self, limiter: RateLimiter, cycle_seconds: float = 60, defer_seconds: int = 300,
+                 burst: float = 2, smoothing: float = 0.3):
+        self.limiter = limiter
+        self.cycle_seconds = cycle_seconds
+        self.defer_seconds = defer_seconds
+        self.burst = burst
+        self.smoothing = smoothing
+        self._value: Dict[str, float] = {}
+        self._pages: Dict[str, float] = {stream: 1.0 for stream in STREAM_WEIGHTS}
+        self._spend_day = self._today()
+        self.spend: Dict[str, int] = {stream: 0 for stream in SPEND_KEYS}
+        self.skipped_streams: Dict[str, int] = {stream: 0 for stream in STREAM_WEIGHTS}
+        self.deferred_polls = 0
+        self.skipped_discoveries = 0
+        self._sweeps_since_discovery = 0
+        self.last_plan: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_config(cls, limiter: RateLimiter) -> 'BudgetPlanner':
+        return cls(limiter, cycle_seconds=config.TWEET_CHECK_INTERVAL, defer_seconds=config.PLANNER_DEFER_SECONDS)
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    def _roll_day(self):
+        today = self._today()
+        if today != self._spend_day:
+            self._spend_day = today
+            self.spend = {stream: 0 for stream in SPEND_KEYS}
+            self.skipped_streams = {stream: 0 for stream in STREAM_WEIGHTS}
+            self.deferred_polls = 0
+            self.skipped_discoveries = 0
+
+    @staticmethod
+    def _seconds_left_today() -> float:
+        now = datetime.now(timezone.utc)
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return max(86400 - (now - midnight).total_seconds(), 60)
+
+    def pressure(self) -> Optional[float]:
+        """Projected spend for the day over the budget, None without a budget"""
+        budget = self.limiter.daily_credit_budget
+        if not budget:
+            return None
+        seconds_left = self._seconds_left_today()
+        # At least an hour of history so the rate is not noise right after midnight
+        elapsed = max(86400 - seconds_left, 3600)
+        used = self.limiter.credits_used
+        projected = used + used / elapsed * seconds_left
+        return projected / budget
+
+    def level(self) -> Tuple[str, Optional[float]]:
+        """Current budget level and the value per credit a stream needs to be fetched"""
+        pressure = self.pressure()
+        remaining = self.limiter.budget_remaining()
+        if pressure is None:
+            return 'unlimited', 0
+        # Only running out of credits stops polling; high pressure just thins it out
+        if remaining is not None and remaining <= 0:
+            return 'exhausted', None
+        name, threshold = LEVELS[0][0], LEVELS[0][2]
+        for level_name, start, level_threshold in LEVELS:
+            if pressure >= start:
+                name, threshold = level_name, level_threshold
+        return name, threshold
+
+    def expected_cost(self) -> float:
+        """Credits a typical refresh spends: the details call plus usual stream pages"""
+        return 1 + sum(self._pages.values())
+
+    def allot(self, tweet_ids: List[str]) -> Tuple[List[str], List[str]]:
+        """Split due tweets into ones to poll now and ones to defer"""
+        level, _ = self.level()
+        remaining = self.limiter.budget_remaining()
+        if remaining is None or level == 'normal':
+            self.last_plan = {'at': int(time.time()), 'level': level, 'due': len(tweet_ids), 'polled': len(tweet_ids), 'deferred': 0}
+            return tweet_ids, []
+
+        # Under pressure, pace the remaining budget over the rest of the day, allowing short bursts
+        allowance = remaining * min(1, self.cycle_seconds * self.burst / self._seconds_left_today())
+        if level == 'exhausted':
+            allowance = 0
+        cost = self.expected_cost()
+        ranked = sorted(tweet_ids, key=lambda tweet_id: self._value.get(tweet_id, float('inf')), reverse=True)
+        polls = max(int(allowance // cost), 0)
+        # Never starve monitoring entirely while credits remain
+        if polls == 0 and remaining >= cost and level != 'exhausted':
+            polls = 1
+        selected, deferred = ranked[:polls], ranked[polls:]
+        self.deferred_polls += len(deferred)
+        self.last_plan = {
+            'at': int(time.time()),
+            'level': level,
+            'due': len(tweet_ids),
+            'allowance_credits': round(allowance, 1),
+            'expected_cost_per_poll': round(cost, 2),
+            'polled': len(selected),
+            'deferred': len(deferred)
+        }
+        if deferred:
+            logger.warning(f"Budget level {level}: deferring {len(deferred)} of {len(tweet_ids)} due tweets")
+        return selected, deferred
+
+    def allows_stream(self, stream: str, change: Optional[float]) -> bool:
+        """Whether a stream whose counter moved by `change` is worth its credits right now"""
+        _, threshold = self.level()
+        if threshold == 0:
+            return True
+        if threshold is not None and change is not None:
+            value_per_credit = STREAM_WEIGHTS[stream] * abs(change) / max(self._pages[stream], 1)
+            if value_per_credit >= threshold:
+                return True
+        self._roll_day()
+        self.skipped_streams[stream] += 1
+        return False
+
+    def allows_discovery(self) -> bool:
+        """Whether this account discovery sweep should run, skipping more of them as pressure rises"""
+        level, _ = self.level()
+        self._roll_day()
+        if level == 'exhausted':
+            self.skipped_discoveries += 1
+            return False
+        self._sweeps_since_discovery += 1
+        if self._sweeps_since_discovery < DISCOVERY_SPACING.get(level, 1):
+            self.skipped_discoveries += 1
+            return False
+        self._sweeps_since_discovery = 0
+        return True
+
+    def record_discovery(self, calls: int):
+        """Record the credits an account or list discovery check spent"""
+        self._roll_day()
+        self.spend['discovery'] += calls
+
+    def record_value(self, tweet_id: str, gained: float):
+        """Learn how much engagement a poll of this tweet tends to find"""
+        previous = self._value.get(tweet_id)
+        self._value[tweet_id] = gained if previous is None else previous + self.smoothing * (gained - previous)
+
+    def record_run(self, api_calls: Dict[str, int]):
+        """Record the credits a monitoring run spent per stream"""
+        self._roll_day()
+        for stream, key in CALLS_KEYS.items():
+            calls = api_calls.get(key, 0)
+            self.spend[stream] += calls
+            if stream in self._pages and calls:
+                self._pages[stream] += self.smoothing * (calls - self._pages[stream])
+
+    def forget(self, tweet_id: str):
+        self._value.pop(tweet_id, None)
+
+    def state(self) -> Dict[str, Any]:
+        self._roll_day()
+        level, threshold = self.level()
+        pressure = self.pressure()
+        return {
+            'level': level,
+            'stream_value_threshold': threshold,
+            'pressure': round(pressure, 3) if pressure is not None else None,
+            'daily_credit_budget': self.limiter.daily_credit_budget or None,
+            'credits_used': self.limiter.credits_used,
+            'credits_remaining': self.limiter.budget_remaining(),
+            'spend_by_stream': dict(self.spend),
+            'spend_by_endpoint': dict(self.limiter.requests_by_endpoint),
+            'expected_pages_per_stream': {stream: round(pages, 2) for stream, pages in self._pages.items()},
+            'skipped_streams': dict(self.skipped_streams),
+            'deferred_polls': self.deferred_polls,
+            'skipped_discoveries': self.skipped_discoveries,
+            'tracked_tweets': len(self._value),
+            'last_plan': self.last_plan
+        }
+
+
+def _shared_planner() -> BudgetPlanner:
+    from api_client import TwitterAPIClient
+    return BudgetPlanner.from_config(TwitterAPIClient.limiter)
+
+
+# Shared by every TweetMonitor in the process, planning against the shared limiter
+budget_planner = _shared_planner()
@@ -0,0 +1,152 @@
+import abc
+import logging
+from typing import Dict, Any, Optional, List, Tuple
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Weight of each counter in the engagement score used to measure velocity
+ENGAGEMENT_WEIGHTS = {
+    'favorite_count': 1,
+    'retweet_count': 2,
+    'reply_count': 2,
+    'quote_count': 3,
+    'bookmark_count': 1,
+    'views_count': 0.01,
+}
+
+
+def engagement_score(metrics: Dict[str, Any]) -> float:
+    return sum((metrics.get(key) or 0) * weight for key, weight in ENGAGEMENT_WEIGHTS.items())
+
+
+class PollingPolicy(abc.ABC):
+    """Decides when a monitored tweet is refreshed next.
+
+    `snapshots` are the tweet's metrics from this run and the previous one,
+    newest first, each with its `captured_at` time.
+    """
+
+    name = 'base'
+    window = 24 * 3600
+
+    @abc.abstractmethod
+    def next_interval(self, age: float, snapshots: List[Dict[str, Any]],
+                      previous_interval: Optional[int]) -> Optional[int]:
+        """Seconds until the next refresh of a tweet this old, or None to stop monitoring it"""
+
+    def next_due(self, created_at: int, last_check: Optional[int],
+                 snapshots: Optional[List[Dict[str, Any]]] = None,
+                 previous_interval: Optional[int] = None,
+                 until: Optional[int] = None) -> Optional[Tuple[int, Optional[int]]]:
+        """(due time, interval used) for the next refresh, or None once the tweet is finished.
+
+        `until` overrides the end of the monitoring window for this tweet.
+        """
+        if not last_check:
+            return created_at, None
+        interval = self.next_interval(last_check - created_at, snapshots or [], previous_interval)
+        if interval is None:
+            return None
+        due_at = int(last_check + interval)
+        if due_at > (until or created_at + self.window):
+            return None
+        return due_at, int(interval)
+
+    def describe(self) -> Dict[str, Any]:
+        return {'name': self.name, 'window': self.window}
+
+
+class AgeTierPolicy(PollingPolicy):
+    """Fixed intervals by tweet age: every 5 minutes in the first hour, 15 up to 3h, then hourly to 24h"""
+
+    name = 'age'
+
+    # (max tweet age in hours, seconds between checks)
+    TIERS = [
+        (1, 300),
+        (3, 900),
+        (24, 3600),
+    ]
+
+    def __init__(self):
+        self.window = self.TIERS[-1][0] * 3600
+
+    def tier(self, age: float) -> int:
+        """Index of the tier for this age; tweets whose window was extended stay in the last one"""
+        hours_old = age / 3600
+        for index, (max_hours, _) in enumerate(self.TIERS):
+            if hours_old <= max_hours:
+                return index
+        return len(self.TIERS) - 1
+
+    def next_interval(self, age: float, snapshots: List[Dict[str, Any]],
+                      previous_interval: Optional[int]) -> Optional[int]:
+        return self.TIERS[self.tier(age)][1]
+
+    def describe(self) -> Dict[str, Any]:
+        return {**super().describe(), 'tiers': self.TIERS}
+
+
+class VelocityPolicy(AgeTierPolicy):
+    """Age tiers whose interval adapts to measured engagement velocity.
+
+    The interval is the time the tweet needs, at its current rate, to gain
+    `target_delta` engagement points, clamped to the tier's bounds. Tweets
+    that did not move between the last two snapshots back off exponentially
+    up to the tier maximum. Without two snapshots the tier's base interval
+    is used.
+    """
+
+    name = 'velocity'
+
+    # (max tweet age in hours, base, minimum and maximum seconds between checks)
+    VELOCITY_TIERS = [
+        (1, 300, 120, 900),
+        (3, 900, 300, 1800),
+        (24, 3600, 900, 7200),
+    ]
+    TIERS = [(max_hours, base) for max_hours, base, _, _ in VELOCITY_TIERS]
+
+    def __init__(self, target_delta: float = 20):
+        super().__init__()
+        self.target_delta = target_delta
+
+    def next_interval(self, age: float, snapshots: List[Dict[str, Any]],
+                      previous_interval: Optional[int]) -> Optional[int]:
+        _, base, minimum, maximum = self.VELOCITY_TIERS[self.tier(age)]
+        if len(snapshots) < 2:
+            return base
+
+        newest, previous = snapshots[0], snapshots[1]
+        elapsed = newest['captured_at'] - previous['captured_at']
+        if elapsed <= 0:
+            return base
+        gained = engagement_score(newest) - engagement_score(previous)
+        if gained <= 0:
+            return min(max((previous_interval or base) * 2, minimum), maximum)
+
+        rate = gained / elapsed
+        return int(min(max(self.target_delta / rate, minimum), maximum))
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'window': self.window,
+            'tiers': self.VELOCITY_TIERS,
+            'target_delta': self.target_delta
+        }
+
+
+POLICIES = {
+    AgeTierPolicy.name: AgeTierPolicy,
+    VelocityPolicy.name: VelocityPolicy,
+}
+
+
+def policy_from_config() -> PollingPolicy:
+    if config.POLLING_POLICY == VelocityPolicy.name:
+        return VelocityPolicy(config.POLLING_TARGET_DELTA)
+    if config.POLLING_POLICY not in POLICIES:
+        logger.error(f"Unknown polling policy {config.POLLING_POLICY}, using age tiers")
+    return AgeTierPolicy()
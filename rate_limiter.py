@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, AsyncIterator, Callable
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class APIBudgetExceeded(Exception):
+    """Raised when the daily SocialData credit budget has been spent"""
+    pass
+
+
+class APIPaused(Exception):
+    """Raised while SocialData calls are paused after an insufficient balance error"""
+    pass
+
+
+class RateLimiter:
+    """Process-wide request governor for the SocialData API.
+
+    Combines a token bucket (requests per second with a burst allowance),
+    per-endpoint concurrency caps and a daily credit budget. An
+    "Insufficient balance" answer trips a breaker that pauses every call
+    until the pause expires or an admin resumes it.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int, default_concurrency: int,
+                 endpoint_concurrency: Optional[Dict[str, int]] = None,
+                 daily_credit_budget: int = 0, balance_pause_seconds: int = 900):
+        self.requests_per_second = requests_per_second
+        self.burst = max(burst, 1)
+        self.default_concurrency = default_concurrency
+        self.endpoint_concurrency = endpoint_concurrency or {}
+        self.daily_credit_budget = daily_credit_budget
+        self.balance_pause_seconds = balance_pause_seconds
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._bucket_lock = asyncio.Lock()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+
+        self._budget_day = self._today()
+        self.credits_used = 0
+        self.requests_by_endpoint: Dict[str, int] = {}
+        self.paused_until: Optional[float] = None
+        self.pause_reason: Optional[str] = None
+
+    @classmethod
+    def from_config(cls) -> 'RateLimiter':
+        return cls(
+            requests_per_second=config.SOCIALDATA_REQUESTS_PER_SECOND,
+            burst=config.SOCIALDATA_BURST,
+            default_concurrency=config.SOCIALDATA_MAX_CONCURRENCY,
+            endpoint_concurrency=config.SOCIALDATA_ENDPOINT_CONCURRENCY,
+            daily_credit_budget=config.SOCIALDATA_DAILY_CREDIT_BUDGET,
+            balance_pause_seconds=config.SOCIALDATA_BALANCE_PAUSE_SECONDS
+        )
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    def _roll_budget_day(self):
+        today = self._today()
+        if today != self._budget_day:
+            self._budget_day = today
+            self.credits_used = 0
+            self.requests_by_endpoint = {}
+
+    def is_paused(self) -> bool:
+        if self.paused_until is None:
+            return False
+        if time.time() >= self.paused_until:
+            logger.info("SocialData pause expired, resuming API calls")
+            self.resume()
+            return False
+        return True
+
+    def pause(self, reason: str, seconds: Optional[int] = None):
+        seconds = self.balance_pause_seconds if seconds is None else seconds
+        self.paused_until = time.time() + seconds
+        self.pause_reason = reason
+        logger.error(f"Pausing SocialData calls for {seconds}s: {reason}")
+
+    def resume(self):
+        self.paused_until = None
+        self.pause_reason = None
+
+    def record_insufficient_balance(self):
+        self.pause("Insufficient balance")
+
+    def budget_remaining(self) -> Optional[int]:
+        self._roll_budget_day()
+        if not self.daily_credit_budget:
+            return None
+        return max(self.daily_credit_budget - self.credits_used, 0)
+
+    def _semaphore(self, endpoint: str) -> asyncio.Semaphore:
+        if endpoint not in self._semaphores:
+            limit = self.endpoint_concurrency.get(endpoint, self.default_concurrency)
+            self._semaphores[endpoint] = asyncio.Semaphore(limit)
+        return self._semaphores[endpoint]
+
+    async def _take_token(self):
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.requests_per_second)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.requests_per_second)
+
+    def _check_allowed(self):
+        if self.is_paused():
+            raise APIPaused(f"SocialData calls paused: {self.pause_reason}")
+        remaining = self.budget_remaining()
+        if remaining is not None and remaining <= 0:
+            raise APIBudgetExceeded("Daily SocialData credit budget exhausted")
+
+    @asynccontextmanager
+    async def acquire(self, endpoint: str, credits: int = 1,
+                      admit: Optional[Callable[[], Any]] = None) -> AsyncIterator[Any]:
+        """Wait for a concurrency slot and a token, then charge the budget.
+
+        `admit` runs once the call is allowed but before it is charged, so a
+        rejection there costs no credit; its result is what the context yields.
+        """
+        self._check_allowed()
+        async with self._semaphore(endpoint):
+            if self.requests_per_second > 0:
+                await self._take_token()
+            # Re-check: the breaker may have tripped while we were queued
+            self._check_allowed()
+            admitted = admit() if admit else None
+            self.credits_used += credits
+            self.requests_by_endpoint[endpoint] = self.requests_by_endpoint.get(endpoint, 0) + 1
+            self._in_flight[endpoint] = self._in_flight.get(endpoint, 0) + 1
+            try:
+                yield admitted
+            finally:
+                self._in_flight[endpoint] -= 1
+
+    def state(self) -> Dict[str, Any]:
+        paused = self.is_paused()
+        return {
+            'paused': paused,
+            'pause_reason': self.pause_reason,
+            'paused_until': int(self.paused_until) if self.paused_until else None,
+            'requests_per_second': self.requests_per_second,
+            'burst': self.burst,
+            'available_tokens': round(self._tokens, 2),
+            'concurrency_limits': {
+                'default': self.default_concurrency,
+                **self.endpoint_concurrency
+            },
+            'in_flight': dict(self._in_flight),
+            'budget_day': self._budget_day,
+            'daily_credit_budget': self.daily_credit_budget or None,
+            'credits_used': self.credits_used,
+            'credits_remaining': self.budget_remaining(),
+            'requests_by_endpoint': dict(self.requests_by_endpoint)
+        }
@@ -0,0 +1,111 @@
+import copy
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Bounded LRU cache with per-endpoint TTLs for SocialData lookups.
+
+    Entries live in memory and, when `persist` is on, in the
+    api_response_cache table so they survive restarts and are shared across
+    workers. Memory is always checked first; a persistent hit is copied back
+    into memory with its remaining TTL.
+    """
+
+    def __init__(self, ttls: Dict[str, int], max_entries: int = 2048, persist: bool = False):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.persist = persist
+        self._entries: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._repository = None
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_config(cls) -> 'ResponseCache':
+        return cls(
+            ttls=config.RESPONSE_CACHE_TTLS,
+            max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+            persist=config.RESPONSE_CACHE_PERSIST
+        )
+
+    def _count(self, endpoint: str, outcome: str):
+        counters = self.stats.setdefault(endpoint, {'hits': 0, 'persistent_hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+    def _repo(self):
+        if self._repository is None:
+            # Imported lazily so the API client does not need a database unless persistence is on
+            from db.api.cache_db import APICacheRepository
+            self._repository = APICacheRepository()
+        return self._repository
+
+    def caches(self, endpoint: str) -> bool:
+        return self.ttls.get(endpoint, 0) > 0
+
+    def _put_memory(self, key: str, expires_at: float, data: Dict[str, Any]):
+        self._entries[key] = (expires_at, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, endpoint: str, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, data = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self._count(endpoint, 'hits')
+                return copy.deepcopy(data)
+            del self._entries[key]
+
+        if self.persist:
+            try:
+                stored = await self._repo().get_cached_response(key)
+                if stored:
+                    data, expires_at = stored
+                    self._put_memory(key, expires_at, data)
+                    self._count(endpoint, 'persistent_hits')
+                    return copy.deepcopy(data)
+            except Exception as e:
+                logger.error(f"Error reading cached response for {key}: {str(e)}")
+
+        self._count(endpoint, 'misses')
+        return None
+
+    async def set(self, endpoint: str, key: str, data: Dict[str, Any]):
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        self._put_memory(key, expires_at, copy.deepcopy(data))
+        if self.persist:
+            try:
+                await self._repo().save_cached_response(key, endpoint, json.dumps(data), int(expires_at))
+            except Exception as e:
+                logger.error(f"Error saving cached response for {key}: {str(e)}")
+
+    async def purge_expired(self) -> int:
+        """Drop expired entries from memory and, when persisting, from the table"""
+        now = time.time()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        purged = len(expired)
+        if self.persist:
+            purged += await self._repo().purge_expired()
+        return purged
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'persist': self.persist,
+            'ttls': dict(self.ttls),
+            'stats': {endpoint: dict(counters) for endpoint, counters in self.stats.items()}
+        }
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, HTTPException, Header, Query
+from typing import Optional
+import logging
+import time
+from db.service import Service
+from config import config
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin", tags=["Admin"])
+service = Service()
+ADMIN_SECRET = config.ADMIN_SECRET
+
+@router.get("/api-client")
+async def get_api_client_state(admin_secret: str = Header(None)):
+    """Get SocialData rate limiter, credit budget and pause state"""
+    if admin_secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    try:
+        return service.get_api_client_state()
+    except Exception as e:
+        logger.error(f"Error getting API client state at {int(time.time())}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api-client/resume")
+async def resume_api_client(admin_secret: str = Header(None)):
+    """Resume SocialData calls after an insufficient balance pause"""
+    if admin_secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    try:
+        state = service.resume_api_client()
+        return {"status": "success", "state": state}
+    except Exception as e:
+        logger.error(f"Error resuming API client at {int(time.time())}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/scheduler")
+async def get_scheduler_state(admin_secret: str = Header(None)):
+    """Get tweet refresh schedule size and lag"""
+    if admin_secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    try:
+        return service.get_scheduler_state()
+    except Exception as e:
+        logger.error(f"Error getting scheduler state at {int(time.time())}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/budget-plan")
+async def get_budget_plan(admin_secret: str = Header(None)):
+    """Get the credit budget level, latest poll plan and spend by stream"""
+    if admin_secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    try:
+        return service.get_budget_plan()
+    except Exception as e:
+        logger.error(f"Error getting budget plan at {int(time.time())}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/worker-pool")
+async def get_worker_pool_state(admin_secret: str = Header(None)):
+    """Get monitoring worker pool queue depth, throughput and run durations"""
+    if admin_secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    try:
+        return service.get_worker_pool_state()
+    except Exception as e:
+        logger.error(f"Error getting worker pool state at {int(time.time())}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/accounts/{account_id}/discovery-list")
+async def set_account_discovery_list(
+    account_id: str,
+    list_id: Optional[str] = Query(None),
+    admin_secret: str = Header(None)
+):
+    """Set the list timeline used to discover an account's new tweets; omit list_id to use search"""
+    if admin_secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    try:
+        success = await service.set_account_discovery_list(account_id, list_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Account not found")
+        return {"status": "success", "account_id": account_id, "discovery_list_id": list_id}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error setting discovery list at {int(time.time())}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -4,6 +4,7 @@ import time
 from db.service import Service
 from auth.dependencies import auth_middleware
 from pydantic import BaseModel
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tweet", tags=["Tweet"])
@@ -15,6 +16,7 @@ async def get_tweet_feed(
     page_size: int = Query(default=20, ge=1, le=100),
     type: str = Query(default="time", regex="^(time|views)$"),
     sort: str = Query(default="desc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page; takes precedence over page"),
     auth_user: str = Depends(auth_middleware)
 ):
     """Get a paginated feed of all monitored tweets with their latest data"""
@@ -24,7 +26,8 @@ async def get_tweet_feed(
             skip=(page - 1) * page_size,
             limit=page_size,
             type=type,
-            sort=sort
+            sort=sort,
+            cursor=cursor
         )
         
         return {
@@ -32,10 +35,13 @@ async def get_tweet_feed(
             "page": page,
             "page_size": page_size,
             "total_count": feed["total_count"],
-            "has_next": page * page_size < feed["total_count"],
-            "has_previous": page > 1,
+            "has_next": feed["next_cursor"] is not None,
+            "next_cursor": feed["next_cursor"],
+            "has_previous": page > 1 or cursor is not None,
             "feed": feed
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting tweet feed at {int(time.time())}: {str(e)}")
         raise HTTPException(status_code=500, detail="Error retrieving tweet feed")
@@ -97,6 +103,7 @@ async def get_tweet_feed(
     page_size: int = Query(default=20, ge=1, le=100),
     type: str = Query(default="time", regex="^(time|views)$"),
     sort: str = Query(default="desc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page; takes precedence over page"),
 ):
     """Get a paginated feed of all monitored tweets with their latest data"""
     try:
@@ -105,7 +112,8 @@ async def get_tweet_feed(
             skip=(page - 1) * page_size,
             limit=page_size,
             type=type,
-            sort=sort
+            sort=sort,
+            cursor=cursor
         )
         
         return {
@@ -113,10 +121,13 @@ async def get_tweet_feed(
             "page": page,
             "page_size": page_size,
             "total_count": feed["total_count"],
-            "has_next": page * page_size < feed["total_count"],
-            "has_previous": page > 1,
+            "has_next": feed["next_cursor"] is not None,
+            "next_cursor": feed["next_cursor"],
+            "has_previous": page > 1 or cursor is not None,
             "feed": feed
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting tweet feed at {int(time.time())}: {str(e)}")
         raise HTTPException(status_code=500, detail="Error retrieving tweet feed")
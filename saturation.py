@@ -0,0 +1,107 @@
+import logging
+from typing import Dict, Any, Optional, List, Tuple
+from config import config
+from polling import engagement_score
+
+logger = logging.getLogger(__name__)
+
+
+class SaturationDetector:
+    """Decides from stored snapshots whether a tweet's engagement has run its course.
+
+    Engagement is modelled as a saturating curve `E(t) = E_max * (1 - exp(-t / tau))`,
+    whose growth rate falls linearly with the level reached:
+    `dE/dt = E_max / tau - E / tau`. A least-squares line through the
+    measured (level, rate) pairs gives `E_max`, and with it the growth still
+    to come. Tweets projected to gain little more are stopped; tweets still
+    growing near the end of their window get it extended. Only the most
+    recent `max_snapshots` snapshots are fitted, so the cost of a decision
+    does not grow with the tweet's history.
+    """
+
+    def __init__(self, min_age: float = 2 * 3600, min_snapshots: int = 4, stop_ratio: float = 0.02,
+                 extend_ratio: float = 0.1, extend_by: float = 24 * 3600, max_window: float = 72 * 3600,
+                 max_snapshots: int = 24):
+        self.min_age = min_age
+        self.min_snapshots = min_snapshots
+        self.stop_ratio = stop_ratio
+        self.extend_ratio = extend_ratio
+        self.extend_by = extend_by
+        self.max_window = max_window
+        self.max_snapshots = max(max_snapshots, min_snapshots)
+
+    @classmethod
+    def from_config(cls) -> 'SaturationDetector':
+        return cls(
+            min_age=config.SATURATION_MIN_AGE_HOURS * 3600,
+            stop_ratio=config.SATURATION_STOP_RATIO,
+            extend_ratio=config.SATURATION_EXTEND_RATIO,
+            extend_by=config.SATURATION_EXTEND_HOURS * 3600,
+            max_window=config.SATURATION_MAX_HOURS * 3600,
+            max_snapshots=config.SATURATION_MAX_SNAPSHOTS
+        )
+
+    @staticmethod
+    def fit(points: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+        """Fit (E_max, tau) to (time, engagement) points, None if growth is not slowing down"""
+        pairs = []
+        for (t0, y0), (t1, y1) in zip(points, points[1:]):
+            if t1 > t0:
+                pairs.append(((y0 + y1) / 2, (y1 - y0) / (t1 - t0)))
+        if len(pairs) < 2:
+            return None
+
+        n = len(pairs)
+        mean_level = sum(level for level, _ in pairs) / n
+        mean_rate = sum(rate for _, rate in pairs) / n
+        spread = sum((level - mean_level) ** 2 for level, _ in pairs)
+        if spread == 0:
+            return None
+        slope = sum((level - mean_level) * (rate - mean_rate) for level, rate in pairs) / spread
+        if slope >= 0:
+            return None
+        intercept = mean_rate - slope * mean_level
+        return -intercept / slope, -1 / slope
+
+    def evaluate(self, created_at: float, snapshots: List[Dict[str, Any]], now: float,
+                 window_end: float) -> Optional[Dict[str, Any]]:
+        """Return a stop or extend decision with its reason, or None to keep the current window.
+
+        `snapshots` are the tweet's metrics oldest first, each with `captured_at`.
+        Only the last `max_snapshots` of them are used.
+        """
+        age = now - created_at
+        if age < self.min_age or len(snapshots) < self.min_snapshots:
+            return None
+
+        points = [(snapshot['captured_at'], engagement_score(snapshot)) for snapshot in snapshots[-self.max_snapshots:]]
+        current = points[-1][1]
+        fitted = self.fit(points)
+        near_end = window_end - now <= 3600
+        can_extend = window_end < created_at + self.max_window
+
+        if fitted is None:
+            recent_gain = current - points[-2][1]
+            if recent_gain > 0 and near_end and can_extend:
+                return self._extend(created_at, window_end, "engagement still growing without slowing down")
+            return None
+
+        projected, tau = fitted
+        remaining = max(projected - current, 0)
+        ratio = remaining / max(current, 1)
+        if ratio < self.stop_ratio:
+            return {
+                'action': 'stop',
+                'reason': (
+                    f"saturated: projected {ratio:.1%} more engagement "
+                    f"({current:.0f} of {max(projected, current):.0f} points)"
+                ),
+                'projected_remaining': round(remaining, 1)
+            }
+        if ratio > self.extend_ratio and near_end and can_extend:
+            return self._extend(created_at, window_end, f"projected {ratio:.0%} more engagement")
+        return None
+
+    def _extend(self, created_at: float, window_end: float, reason: str) -> Dict[str, Any]:
+        until = int(min(window_end + self.extend_by, created_at + self.max_window))
+        return {'action': 'extend', 'reason': f"extended: {reason}", 'until': until}
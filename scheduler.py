@@ -0,0 +1,161 @@
+import heapq
+import logging
+import time
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
+from polling import PollingPolicy, policy_from_config
+
+logger = logging.getLogger(__name__)
+
+class RefreshScheduler:
+    """Min-heap of monitored tweets keyed by their next refresh time.
+
+    Seeded from the database once, then kept current as monitoring runs
+    finish, so each cycle only touches tweets that are due. Tweets past the
+    monitoring window drop out for good. When a tweet is due next is up to
+    the polling policy. Rescheduling pushes a new heap entry and leaves the
+    old one behind; stale entries are skipped when popped.
+    """
+
+    def __init__(self, policy: PollingPolicy, lag_window: int = 1000):
+        self.policy = policy
+        self._heap: List[Tuple[int, str]] = []
+        self._due: Dict[str, int] = {}
+        self._created: Dict[str, int] = {}
+        self._interval: Dict[str, int] = {}
+        self._until: Dict[str, int] = {}
+        self.seeded = False
+        self.seeded_at: Optional[int] = None
+        self.finished = 0
+        self.polls = 0
+        self._lags: deque = deque(maxlen=lag_window)
+        self.max_lag = 0
+
+    async def seed(self, tweet_data, max_window: Optional[int] = None):
+        """Load every active tweet still inside its monitoring window"""
+        now = int(time.time())
+        tweets = await tweet_data.get_refreshable_tweets(created_after=now - max(self.policy.window, max_window or 0))
+        self._heap = []
+        self._due = {}
+        self._created = {}
+        self._interval = {}
+        self._until = {}
+        for tweet in tweets:
+            if tweet.get('monitor_until'):
+                self._until[tweet['tweet_id']] = tweet['monitor_until']
+            self.schedule(tweet['tweet_id'], tweet['created_at'], tweet['last_check'])
+        self.seeded = True
+        self.seeded_at = now
+        logger.info(f"Refresh scheduler seeded with {len(self._due)} tweets")
+
+    def invalidate(self):
+        """Reseed on the next cycle, e.g. after accounts were re-activated"""
+        self.seeded = False
+
+    def schedule(self, tweet_id: str, created_at: int, last_check: Optional[int],
+                 snapshots: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Queue a tweet's next refresh; False if its window is over and it was dropped instead"""
+        next_run = self.policy.next_due(
+            created_at, last_check, snapshots, self._interval.get(tweet_id), self._until.get(tweet_id)
+        )
+        if next_run is None:
+            self.drop(tweet_id)
+            self.finished += 1
+            return False
+        due_at, interval = next_run
+        self._created[tweet_id] = created_at
+        self._due[tweet_id] = due_at
+        if interval:
+            self._interval[tweet_id] = interval
+        heapq.heappush(self._heap, (due_at, tweet_id))
+        return True
+
+    def record_check(self, tweet_id: str, checked_at: int, created_at: Optional[int] = None,
+                     snapshots: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Reschedule a tweet after a monitoring run; False if it finished its window.
+
+        Tweets the scheduler has not seen yet were just added, so the check
+        time stands in for their creation time as it does in the database.
+        `snapshots` are the tweet's latest metrics, newest first, for
+        policies that look at engagement.
+        """
+        created_at = created_at or self._created.get(tweet_id, checked_at)
+        return self.schedule(tweet_id, created_at, checked_at, snapshots)
+
+    def created_at(self, tweet_id: str) -> Optional[int]:
+        return self._created.get(tweet_id)
+
+    def window_end(self, tweet_id: str) -> Optional[int]:
+        """When monitoring of a tweet ends unless extended"""
+        if tweet_id not in self._created:
+            return None
+        return self._until.get(tweet_id) or self._created[tweet_id] + self.policy.window
+
+    def extend(self, tweet_id: str, until: int):
+        """Move the end of a tweet's monitoring window; applies from its next reschedule"""
+        self._until[tweet_id] = until
+
+    def retry(self, tweet_id: str, delay: int = 60):
+        """Try a failed run again later without treating it as a check"""
+        if tweet_id not in self._created:
+            return
+        due_at = int(time.time()) + delay
+        self._due[tweet_id] = due_at
+        heapq.heappush(self._heap, (due_at, tweet_id))
+
+    def drop(self, tweet_id: str):
+        self._due.pop(tweet_id, None)
+        self._created.pop(tweet_id, None)
+        self._interval.pop(tweet_id, None)
+        self._until.pop(tweet_id, None)
+
+    def pop_due(self, now: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """Remove and return (tweet_id, due_at, created_at) for every tweet due by now"""
+        now = now or int(time.time())
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, tweet_id = heapq.heappop(self._heap)
+            if self._due.get(tweet_id) != due_at:
+                continue
+            del self._due[tweet_id]
+            due.append((tweet_id, due_at, self._created[tweet_id]))
+        self._compact()
+        return due
+
+    def _compact(self):
+        if len(self._heap) > 4 * len(self._due) + 1024:
+            self._heap = [(due_at, tweet_id) for tweet_id, due_at in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def record_lag(self, due_at: int, started_at: int):
+        lag = max(started_at - due_at, 0)
+        self.polls += 1
+        self._lags.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+
+    def state(self) -> Dict[str, Any]:
+        lags = sorted(self._lags)
+        next_due_at = min(self._due.values()) if self._due else None
+        intervals = list(self._interval.values())
+        return {
+            'policy': self.policy.describe(),
+            'seeded': self.seeded,
+            'seeded_at': self.seeded_at,
+            'scheduled': len(self._due),
+            'extended': len(self._until),
+            'heap_size': len(self._heap),
+            'next_due_at': next_due_at,
+            'finished': self.finished,
+            'polls': self.polls,
+            'avg_interval_seconds': round(sum(intervals) / len(intervals)) if intervals else None,
+            'lag_seconds': {
+                'avg': round(sum(lags) / len(lags), 1) if lags else None,
+                'p50': lags[len(lags) // 2] if lags else None,
+                'p95': lags[int(len(lags) * 0.95)] if lags else None,
+                'max': self.max_lag
+            }
+        }
+
+
+# Shared by every TweetMonitor in the process
+refresh_scheduler = RefreshScheduler(policy_from_config())
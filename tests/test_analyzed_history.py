@@ -0,0 +1,97 @@
+import copy
+
+import pytest
+
+from db.tw import structured
+from db.tw.structured import TweetStructuredRepository
+
+
+def tweet_details(favorite_count, reply_count, followers):
+    return {
+        'id_str': '1',
+        'full_text': 'a post',
+        'favorite_count': favorite_count,
+        'reply_count': reply_count,
+        'user': {'id': 42, 'screen_name': 'someone', 'followers_count': followers},
+    }
+
+
+def reply(item_id, screen_name, verified=False):
+    return {
+        'id': item_id,
+        'favorite_count': item_id,
+        'user': {'screen_name': screen_name, 'followers_count': 10, 'verified': verified,
+                 'profile_image_url_https': f'https://example.com/{screen_name}_normal.jpg'},
+    }
+
+
+def retweeter(screen_name, verified=False):
+    return {'id': hash(screen_name) % 1000, 'screen_name': screen_name, 'followers_count': 5, 'verified': verified}
+
+
+@pytest.fixture
+def repository(database, run):
+    structured._analyzed_histories.clear()
+    repository = TweetStructuredRepository()
+    run(repository.tweet_data.add_monitored_tweet('1', 'someone'))
+    yield repository
+    structured._analyzed_histories.clear()
+
+
+async def add_first_rows(tweets):
+    await tweets.save_tweet_details('1', tweet_details(1, 1, 100), timestamp=100)
+    await tweets.save_tweet_comments('1', [reply(10, 'a', verified=True)], timestamp=100)
+    await tweets.save_tweet_retweeters('1', [retweeter('b')], timestamp=100)
+    await tweets.save_tweet_details('1', tweet_details(5, 2, 110), timestamp=200)
+    await tweets.save_tweet_quotes('1', [reply(20, 'c')], timestamp=200)
+
+
+async def add_later_rows(tweets):
+    # Rows captured in the same second as the newest ones already folded in
+    await tweets.save_tweet_comments('1', [reply(11, 'd')], timestamp=200)
+    await tweets.save_tweet_details('1', tweet_details(9, 3, 130), timestamp=300)
+    await tweets.save_tweet_comments('1', [reply(12, 'e', verified=True)], timestamp=300)
+    await tweets.save_tweet_retweeters('1', [retweeter('f', verified=True), retweeter('b')], timestamp=300)
+    await tweets.save_tweet_quotes('1', [reply(21, 'g')], timestamp=300)
+
+
+def test_folding_in_new_rows_matches_a_full_rebuild(repository, run):
+    async def main():
+        await add_first_rows(repository.tweet_data)
+        first = await repository.get_analyzed_tweet_history('1')
+        await add_later_rows(repository.tweet_data)
+        incremental = await repository.get_analyzed_tweet_history('1')
+        structured._analyzed_histories.clear()
+        return first, incremental, await repository.get_analyzed_tweet_history('1')
+
+    first, incremental, rebuilt = run(main())
+    assert first['timestamps'] == [100, 200]
+    assert incremental == rebuilt
+    assert rebuilt['timestamps'] == [100, 200, 300]
+    assert rebuilt['engagement_changes'][300] == {**{key: 0 for key in rebuilt['engagement_changes'][300]},
+                                                  'favorite_count': 4, 'reply_count': 1}
+    assert rebuilt['engagement_metrics'][300]['verified_replies'] == 1
+    assert rebuilt['engagement_metrics'][300]['verified_retweets'] == 1
+    assert [item['id'] for item in rebuilt['comments_tracking'][200]] == [11]
+    assert [item['screen_name'] for item in rebuilt['retweeters_tracking'][300]] == ['f']
+    assert rebuilt['user_followers'] == {100: 100, 200: 110, 300: 130}
+
+
+def test_callers_cannot_change_the_cached_history(repository, run):
+    async def main():
+        await add_first_rows(repository.tweet_data)
+        history = await repository.get_analyzed_tweet_history('1')
+        expected = copy.deepcopy(history)
+
+        history['comments_tracking'][100].append({'id': 'injected'})
+        history['comments_tracking'][100][0]['favorite_count'] = -1
+        history['quotes_tracking'][200].clear()
+        history['retweeters_tracking'].clear()
+        history['engagement_metrics'][200]['favorite_count'] = -1
+        history['engagement_changes'][200]['favorite_count'] = -1
+        history['user_followers'][100] = -1
+        history['timestamps'].append(999)
+        return expected, await repository.get_analyzed_tweet_history('1')
+
+    expected, again = run(main())
+    assert again == expected
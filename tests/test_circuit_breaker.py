@@ -0,0 +1,134 @@
+import time
+
+import aiohttp
+import pytest
+
+from api_client import BASE_URL, SocialDataError
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from rate_limiter import APIPaused
+
+TWEET_URL = f'{BASE_URL}/tweets/1700000000000000000'
+
+
+def open_breaker(breaker: CircuitBreaker):
+    """Force the breaker open with its cooldown already elapsed"""
+    breaker.state = breaker.OPEN
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout
+
+
+def test_opens_after_threshold_then_half_opens_and_closes(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker('tweets', failure_threshold=2, reset_timeout=60)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == breaker.CLOSED
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    now[0] += 60
+    breaker.check()
+    assert breaker.before_call() is True
+    assert breaker.state == breaker.HALF_OPEN
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_failed_probe_reopens_with_fresh_cooldown(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker('tweets', failure_threshold=5, reset_timeout=60)
+    breaker.state, breaker.opened_at = breaker.OPEN, now[0] - 60
+
+    assert breaker.before_call() is True
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert breaker.opened_at == now[0]
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_released_probe_lets_the_next_call_probe():
+    breaker = CircuitBreaker('tweets', failure_threshold=2, reset_timeout=60)
+    open_breaker(breaker)
+    assert breaker.before_call() is True
+
+    breaker.release_probe()
+    assert breaker.state == breaker.OPEN
+    assert breaker.before_call() is True
+
+
+def test_requests_open_and_recover_the_circuit(stub, client, run):
+    breaker = client.breakers.get('tweets')
+    stub.error_rate = 1
+
+    for _ in range(2):
+        with pytest.raises(SocialDataError):
+            run(client._request_json(TWEET_URL))
+    assert breaker.state == breaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        run(client._request_json(TWEET_URL))
+
+    # Failed probe after the cooldown reopens the circuit
+    time.sleep(breaker.reset_timeout)
+    with pytest.raises(SocialDataError):
+        run(client._request_json(TWEET_URL))
+    assert breaker.state == breaker.OPEN
+
+    # Successful probe closes it
+    stub.error_rate = 0
+    time.sleep(breaker.reset_timeout)
+    data = run(client._request_json(TWEET_URL))
+    assert data['id_str'] == '1700000000000000000'
+    assert breaker.state == breaker.CLOSED
+
+
+def test_paused_limiter_never_takes_the_probe(stub, client, run):
+    breaker = client.breakers.get('tweets')
+    open_breaker(breaker)
+    client.limiter.pause('test', 60)
+
+    with pytest.raises(APIPaused):
+        run(client._request_json(TWEET_URL))
+    assert breaker.state == breaker.OPEN
+
+    client.limiter.resume()
+    run(client._request_json(TWEET_URL))
+    assert breaker.state == breaker.CLOSED
+
+
+def test_probe_ending_without_a_verdict_releases_the_slot(stub, client, run, monkeypatch):
+    breaker = client.breakers.get('tweets')
+    open_breaker(breaker)
+
+    decode = aiohttp.ClientResponse.json
+
+    async def undecodable(*args, **kwargs):
+        raise ValueError("Expecting value")
+    monkeypatch.setattr(aiohttp.ClientResponse, 'json', undecodable)
+    with pytest.raises(ValueError):
+        run(client._request_json(TWEET_URL))
+    assert breaker.state == breaker.OPEN
+
+    monkeypatch.setattr(aiohttp.ClientResponse, 'json', decode)
+    run(client._request_json(TWEET_URL))
+    assert breaker.state == breaker.CLOSED
+
+
+def test_rejected_calls_are_not_charged(stub, client, run):
+    breaker = client.breakers.get('tweets')
+    breaker.state, breaker.opened_at = breaker.OPEN, time.monotonic()
+
+    with pytest.raises(CircuitOpenError):
+        run(client._request_json(TWEET_URL))
+    assert client.limiter.credits_used == 0
+    assert breaker.total_rejections == 1
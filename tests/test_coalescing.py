@@ -0,0 +1,89 @@
+import asyncio
+import copy
+
+import pytest
+
+import api_client
+from api_client import BASE_URL
+
+TWEET_URL = f'{BASE_URL}/tweets/1700000000000000000'
+
+
+@pytest.fixture
+def deep_copies(monkeypatch):
+    """Count deep copies made by the API client"""
+    calls = []
+    original = copy.deepcopy
+
+    def counting(value, *args, **kwargs):
+        calls.append(value)
+        return original(value, *args, **kwargs)
+
+    monkeypatch.setattr(api_client.copy, 'deepcopy', counting)
+    return calls
+
+
+def test_identical_concurrent_requests_share_one_call(stub, client, run):
+    stub.latency_ms = 50
+
+    async def main():
+        return await asyncio.gather(*(client._get_json(TWEET_URL) for _ in range(3)))
+
+    results = run(main())
+    assert client.coalesce_stats == {'sent': 1, 'joined': 2, 'reused': 0}
+    assert client.limiter.credits_used == 1
+    assert all(result == results[0] for result in results)
+    # Every caller owns its result, including the sender
+    assert len({id(result) for result in results}) == 3
+    results[0]['full_text'] = 'changed'
+    assert results[1]['full_text'] != 'changed'
+
+
+def test_unshared_result_is_not_copied(stub, client, run, deep_copies):
+    run(client._get_json(TWEET_URL))
+    pages = client.iter_tweet_quotes('1700000000000000000')
+    run(pages.collect())
+
+    assert client.coalesce_stats['sent'] == 1 + pages.pages
+    assert deep_copies == []
+
+
+def test_reused_result_is_isolated_from_the_sender(stub, client, run):
+    first = run(client._get_json(TWEET_URL, reuse_seconds=60))
+    first['full_text'] = 'changed by the sender'
+
+    second = run(client._get_json(TWEET_URL, reuse_seconds=60))
+    third = run(client._get_json(TWEET_URL, reuse_seconds=60))
+    second['full_text'] = 'changed by a reuser'
+
+    assert client.coalesce_stats == {'sent': 1, 'joined': 0, 'reused': 2}
+    assert third['full_text'] not in ('changed by the sender', 'changed by a reuser')
+
+
+def test_cancelled_sender_does_not_cancel_joiners(stub, client, run):
+    stub.latency_ms = 50
+
+    async def main():
+        sender = asyncio.ensure_future(client._get_json(TWEET_URL))
+        await asyncio.sleep(0.01)
+        joiner = asyncio.ensure_future(client._get_json(TWEET_URL))
+        await asyncio.sleep(0.01)
+        sender.cancel()
+        result = await joiner
+        assert sender.cancelled()
+        return result
+
+    result = run(main())
+    assert result['id_str'] == '1700000000000000000'
+    assert client.coalesce_stats == {'sent': 1, 'joined': 1, 'reused': 0}
+    assert client._in_flight == {}
+
+
+def test_failed_request_is_not_reused(stub, client, run):
+    stub.error_rate = 1
+    with pytest.raises(api_client.SocialDataError):
+        run(client._get_json(TWEET_URL, reuse_seconds=60))
+
+    stub.error_rate = 0
+    assert run(client._get_json(TWEET_URL, reuse_seconds=60))['id_str'] == '1700000000000000000'
+    assert client.coalesce_stats['sent'] == 2
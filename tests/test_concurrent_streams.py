@@ -0,0 +1,62 @@
+import asyncio
+
+from conftest import PAGE_SIZE
+from polling import AgeTierPolicy
+from scheduler import RefreshScheduler
+
+
+def track_streams(monitor, fail=()):
+    """Wrap stream ingestion to record how many streams run at once, failing the given ones"""
+    ingest = monitor._ingest_stream
+    state = {'running': 0, 'peak': 0, 'streams': []}
+
+    async def tracked(monitoring_run, tweet_id, stream, *args):
+        state['running'] += 1
+        state['peak'] = max(state['peak'], state['running'])
+        state['streams'].append(stream)
+        try:
+            await asyncio.sleep(0.05)
+            if stream in fail:
+                raise RuntimeError(f'{stream} failed')
+            return await ingest(monitoring_run, tweet_id, stream, *args)
+        finally:
+            state['running'] -= 1
+
+    monitor._ingest_stream = tracked
+    return state
+
+
+def test_streams_of_a_tweet_are_fetched_side_by_side(stub, database, monitor, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+    monitor.scheduler = RefreshScheduler(AgeTierPolicy())
+    monitor.saturation = None
+    state = track_streams(monitor)
+
+    async def main():
+        await monitor.tweet_data.add_monitored_tweet(tweet_id, 'someone')
+        result = await monitor.monitor_tweet(tweet_id)
+        return result, await monitor.tweet_data.get_tweet_quotes(tweet_id)
+
+    result, quotes = run(main())
+    assert sorted(state['streams']) == ['comments', 'quotes', 'retweeters']
+    assert state['peak'] == 3
+    assert result.is_successful() and not result.errors
+    assert result.comments_saved and result.retweeters_saved and result.quotes_saved
+    assert result.api_calls['quote_api_calls'] == -(-len(ids) // PAGE_SIZE)
+    assert len(quotes) == len(ids)
+
+
+def test_failed_stream_does_not_stop_the_others(stub, database, monitor, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+    monitor.scheduler = RefreshScheduler(AgeTierPolicy())
+    monitor.saturation = None
+    track_streams(monitor, fail=('retweeters',))
+
+    async def main():
+        await monitor.tweet_data.add_monitored_tweet(tweet_id, 'someone')
+        return await monitor.monitor_tweet(tweet_id)
+
+    result = run(main())
+    assert result.errors == [{'key': 'retweeters', 'message': 'retweeters failed', 'critical': False}]
+    assert result.is_successful()
+    assert result.comments_saved and result.quotes_saved and not result.retweeters_saved
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+from api_client import CursorPaginator
+from config import config
+from rate_limiter import RateLimiter
+from tools.socialdata_stub import snowflake
+
+
+class FakeListClient:
+    """Serves a fixed list timeline, two tweets per page, through the real paginator"""
+
+    def __init__(self, tweets):
+        self.tweets = tweets
+        self.limiter = RateLimiter(0, 1, 10)
+
+    def iter_list_tweets(self, list_id, **kwargs):
+        return CursorPaginator(self, f'list/{list_id}/tweets', **kwargs)
+
+    async def _get_json(self, url, params=None):
+        offset = int((params or {}).get('cursor') or 0)
+        next_offset = offset + 2
+        return {
+            'tweets': self.tweets[offset:next_offset],
+            'next_cursor': str(next_offset) if next_offset < len(self.tweets) else None
+        }
+
+
+def tweet(posted, account_id, retweet=False):
+    return {
+        'id_str': str(snowflake(posted)),
+        'user': {'id_str': account_id, 'screen_name': f'user_{account_id}'},
+        'retweeted_status': {'id_str': '1'} if retweet else None
+    }
+
+
+def member(account_id, last_check, list_id='list-1'):
+    return {
+        'account_id': account_id,
+        'screen_name': f'user_{account_id}',
+        'last_check': last_check,
+        'created_at': last_check,
+        'discovery_list_id': list_id,
+        'is_active': True
+    }
+
+
+def record_started(monitor):
+    started = {}
+
+    async def start(account, new_tweets, checked_at):
+        started[account['account_id']] = [item['id_str'] for item in new_tweets]
+        return []
+
+    monitor._start_new_tweets = start
+    return started
+
+
+def test_list_timeline_skips_retweets_and_routes_by_author(monitor, run):
+    now = int(time.time())
+    own = tweet(now - 100, 'a')
+    retweet = tweet(now - 200, 'b', retweet=True)
+    earlier = tweet(now - 300, 'b')
+    before_last_check = tweet(now - 2000, 'a')
+    timeline = [own, retweet, earlier, tweet(now - 400, 'stranger'), before_last_check, tweet(now - 9000, 'b')]
+    monitor.api_client = FakeListClient(timeline)
+    started = record_started(monitor)
+    members = [member('a', now - 1000), member('b', now - 5000)]
+
+    results, fallback = run(monitor._check_discovery_list('list-1', members, asyncio.Semaphore(1)))
+
+    assert (results, fallback) == ([], [])
+    assert started == {'a': [own['id_str']], 'b': [earlier['id_str']]}
+    # Paging stopped at the first tweet older than every member's last check
+    assert monitor.planner.spend['discovery'] == 3
+
+
+def test_list_that_does_not_reach_the_last_check_falls_back_to_search(monitor, run, monkeypatch):
+    now = int(time.time())
+    monkeypatch.setattr(config, 'DISCOVERY_LIST_MAX_PAGES', 1)
+    monitor.api_client = FakeListClient([tweet(now - 100 * i, 'a') for i in range(1, 6)])
+    started = record_started(monitor)
+    members = [member('a', now - 3600), member('b', now - 3600)]
+
+    results, fallback = run(monitor._check_discovery_list('list-1', members, asyncio.Semaphore(1)))
+
+    assert results == [] and fallback == members
+    assert started == {}
+    assert monitor.planner.spend['discovery'] == 1
+
+
+def test_failed_list_read_falls_back_to_search(stub, monitor, run):
+    stub.mode = 'replay'
+    members = [member('a', int(time.time()) - 3600)]
+
+    results, fallback = run(monitor._check_discovery_list('1234', members, asyncio.Semaphore(1)))
+
+    assert results == [] and fallback == members
+    assert monitor.planner.spend['discovery'] == 1
+
+
+def test_fallback_members_are_searched_one_by_one(monitor, run, monkeypatch):
+    now = int(time.time())
+    monkeypatch.setattr(config, 'DISCOVERY_LIST_IDS', ['list-1'])
+    monkeypatch.setattr(config, 'DISCOVERY_LIST_MAX_PAGES', 1)
+    monitor.api_client = FakeListClient([tweet(now - 100 * i, 'a') for i in range(1, 6)])
+    accounts = [member('a', now - 3600), member('b', now - 3600), member('c', now - 3600, list_id=None)]
+
+    class FakeAccounts:
+        async def get_monitored_accounts(self):
+            return accounts
+
+    searched = []
+
+    async def search(account, semaphore):
+        searched.append(account['account_id'])
+        return []
+
+    monitor.accounts = FakeAccounts()
+    monitor._check_account = search
+    run(monitor.check_and_update_accounts())
+
+    assert sorted(searched) == ['a', 'b', 'c']
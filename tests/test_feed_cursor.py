@@ -0,0 +1,122 @@
+import re
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import db.tw.tweet_db as tweet_db
+from db.tw.tweet_db import TweetDataRepository, decode_feed_cursor, encode_feed_cursor
+from db.users.user_db import UserDataRepository
+
+
+@pytest.mark.parametrize('position', [
+    [0, -42, '1700000000000000000', 7],
+    [1, -1730000000, '1800000000000000001', 12],
+    [1, 0, '1', 1],
+])
+def test_feed_cursor_round_trips(position):
+    cursor = encode_feed_cursor(position)
+    assert decode_feed_cursor(cursor) == position
+
+
+@pytest.mark.parametrize('cursor', [
+    'not a cursor',
+    encode_feed_cursor([1, 2, 3]),
+    encode_feed_cursor({'feed_group': 1}),
+    'bnVsbA==',
+    encode_feed_cursor(['1', -42, '1700000000000000000', 7]),
+    encode_feed_cursor([0, '-42', '1700000000000000000', 7]),
+    encode_feed_cursor([0, -42, 1700000000000000000, 7]),
+    encode_feed_cursor([0, -42, '1700000000000000000', None]),
+    encode_feed_cursor([True, -42, '1700000000000000000', 7]),
+    encode_feed_cursor([0, -42, '1700000000000000000', 7.5]),
+])
+def test_malformed_feed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_feed_cursor(cursor)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+def feed_row(feed_group, sort_key, tweet_id, item_id):
+    return {'feed_group': feed_group, 'sort_key': sort_key, 'tweet_id': tweet_id, 'item_id': item_id}
+
+
+@pytest.fixture
+def feed_session(monkeypatch):
+    """Serve canned feed rows and capture the query get_feed_page sends"""
+    state = {'rows': [], 'queries': []}
+
+    class FakeSession:
+        async def execute(self, query):
+            state['queries'].append(query)
+            return FakeResult(state['rows'])
+
+    @asynccontextmanager
+    async def fake_session():
+        yield FakeSession()
+
+    monkeypatch.setattr(tweet_db, 'get_async_session', fake_session)
+    return state
+
+
+def test_feed_page_returns_cursor_of_its_last_row(feed_session, run):
+    feed_session['rows'] = [feed_row(0, -9, '10', 9), feed_row(1, -500, '20', 3), feed_row(1, -400, '30', 3)]
+
+    rows, next_cursor = run(TweetDataRepository().get_feed_page('user', limit=2))
+
+    assert [row['tweet_id'] for row in rows] == ['10', '20']
+    assert decode_feed_cursor(next_cursor) == [1, -500, '20', 3]
+
+
+def test_last_feed_page_has_no_cursor(feed_session, run):
+    feed_session['rows'] = [feed_row(1, -500, '20', 3)]
+
+    rows, next_cursor = run(TweetDataRepository().get_feed_page('user', limit=2))
+
+    assert len(rows) == 1
+    assert next_cursor is None
+
+
+def test_feed_page_resumes_after_the_cursor_row(feed_session, run):
+    cursor = encode_feed_cursor([1, -500, '20', 3])
+
+    run(TweetDataRepository().get_feed_page('user', limit=2, cursor=cursor, skip=40))
+
+    compiled = feed_session['queries'][0].compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    # Keyset comparison on the full sort order instead of an offset
+    assert 'OFFSET' not in sql
+    keyset = re.search(r'\(anon_1\.feed_group, anon_1\.sort_key, anon_1\.tweet_id, anon_1\.item_id\) > \((.*?)\) ORDER BY', sql)
+    assert keyset
+    assert [compiled.params[name] for name in re.findall(r'%\((\w+)\)s', keyset.group(1))] == [1, -500, '20', 3]
+    # One extra row tells whether a next page exists
+    assert compiled.params[re.search(r'LIMIT %\((\w+)\)s', sql).group(1)] == 3
+
+
+def test_feed_count_matches_the_pageable_rows(database, run):
+    repository = TweetDataRepository()
+    users = UserDataRepository()
+
+    async def main():
+        await users.create_user('user', 'user@example.com')
+        for tweet_id in ('1', '2'):
+            await repository.add_monitored_tweet(tweet_id, 'someone')
+            await users.add_tracked_item('user', 'tweet', tweet_id)
+        # Tweet 2 has no snapshot yet, so it is not in the feed
+        await repository.save_tweet_details('1', {'favorite_count': 1, 'user': {}}, timestamp=100)
+        return await repository.count_feed_tweets('user'), await repository.get_feed_page('user', limit=10)
+
+    count, (rows, next_cursor) = run(main())
+    assert count == 1
+    assert [row['tweet_id'] for row in rows] == ['1']
+    assert next_cursor is None
@@ -0,0 +1,69 @@
+import json
+
+from sqlalchemy import text
+
+from conftest import TEST_DATABASE_URL
+from db.migrations import connect_and_migrate, engine
+
+SNAPSHOT_COLUMNS = [
+    'latest_captured_at', 'views_count', 'favorite_count', 'retweet_count', 'quote_count', 'reply_count',
+    'bookmark_count', 'author_id', 'author_followers', 'author_profile_image_url', 'text', 'tweet_created_at',
+]
+
+
+def details(text_value, favorite_count, created='2024-05-01T12:00:00.000000Z'):
+    return json.dumps({
+        'full_text': text_value,
+        'tweet_created_at': created,
+        'favorite_count': favorite_count,
+        'user': {'id_str': '42', 'profile_image_url_https': 'https://example.com/42.jpg', 'followers_count': 100},
+    })
+
+
+def test_latest_snapshot_columns_are_backfilled(database, run):
+    async def main():
+        async with engine.begin() as conn:
+            # Back to the shape monitored_tweets had before the snapshot columns
+            await conn.execute(text(
+                "ALTER TABLE monitored_tweets " + ', '.join(f"DROP COLUMN {column} CASCADE" for column in SNAPSHOT_COLUMNS)
+            ))
+            await conn.execute(text(
+                "INSERT INTO monitored_tweets (tweet_id, created_at) VALUES ('1', 10), ('2', 10), ('3', 10)"
+            ))
+            for tweet_id, data, captured_at in [
+                ('1', details('first version', 5), 100),
+                ('1', details('edited version', 7), 200),
+                ('2', details('classic time', 1, created='Wed May 01 12:00:00 +0000 2024'), 100),
+            ]:
+                await conn.execute(
+                    text("INSERT INTO tweet_details (tweet_id, data_json, captured_at) VALUES (:tweet_id, :data, :captured_at)"),
+                    {'tweet_id': tweet_id, 'data': data, 'captured_at': captured_at}
+                )
+            # Counters changed after the last stored details
+            await conn.execute(text(
+                "INSERT INTO tweet_metrics (tweet_id, captured_at, favorite_count, views_count, author_followers) "
+                "VALUES ('1', 200, 7, 50, 100), ('1', 300, 9, 80, 110)"
+            ))
+        await engine.dispose()
+
+        await connect_and_migrate(TEST_DATABASE_URL)
+
+        async with engine.connect() as conn:
+            result = await conn.execute(text(
+                f"SELECT tweet_id, {', '.join(SNAPSHOT_COLUMNS)} FROM monitored_tweets ORDER BY tweet_id"
+            ))
+            return {row['tweet_id']: row for row in result.mappings().all()}
+
+    rows = run(main())
+    first = rows['1']
+    assert first['latest_captured_at'] == 300
+    assert (first['favorite_count'], first['views_count'], first['author_followers']) == (9, 80, 110)
+    assert first['text'] == 'edited version'
+    assert first['author_id'] == '42'
+    assert first['author_profile_image_url'] == 'https://example.com/42.jpg'
+    assert first['tweet_created_at'] == 1714564800
+    # Only ISO timestamps are parsed in SQL; the classic format is filled on the next save
+    assert rows['2']['text'] == 'classic time'
+    assert rows['2']['tweet_created_at'] is None
+    assert rows['2']['latest_captured_at'] == 100
+    assert all(rows['3'][column] is None for column in SNAPSHOT_COLUMNS)
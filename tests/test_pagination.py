@@ -0,0 +1,46 @@
+from conftest import PAGE_SIZE
+
+
+def test_paginator_stops_at_last_id(stub, client, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+    last_id = ids[25]
+    pages = client.iter_tweet_quotes(tweet_id, stop=lambda item: int(item['id_str']) <= int(last_id))
+
+    seen = [item['id_str'] for item in run(pages.collect())]
+    assert seen == ids[:25]
+    assert pages.pages == 3
+    assert not pages.exhausted
+
+
+def test_paginator_reads_to_the_end_without_a_mark(stub, client, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+    pages = client.iter_tweet_quotes(tweet_id)
+
+    assert [item['id_str'] for item in run(pages.collect())] == ids
+    assert pages.exhausted
+    assert pages.cursor is None
+
+
+def test_paginator_streams_one_page_at_a_time(stub, client, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+    pages = client.iter_tweet_quotes(tweet_id, max_pages=2)
+    cursors = []
+
+    async def read():
+        async for page in pages:
+            cursors.append(pages.page_cursor)
+            assert len(page) == PAGE_SIZE
+
+    run(read())
+    assert cursors == [None, str(PAGE_SIZE)]
+    # Resuming from the saved cursor continues where paging stopped
+    rest = client.iter_tweet_quotes(tweet_id, cursor=pages.cursor)
+    assert [item['id_str'] for item in run(rest.collect())] == ids[2 * PAGE_SIZE:]
+
+
+def test_max_items_truncates_the_last_page(stub, client, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+    pages = client.iter_tweet_quotes(tweet_id, max_items=15)
+
+    assert [item['id_str'] for item in run(pages.collect())] == ids[:15]
+    assert pages.pages == 2
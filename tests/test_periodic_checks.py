@@ -0,0 +1,52 @@
+import asyncio
+
+from config import config
+from db.service import Service
+
+
+class FakeMonitor:
+    """Counts sweeps; the account sweep is slow and fails every time"""
+
+    def __init__(self):
+        self.tweet_checks = 0
+        self.account_checks = 0
+
+    async def check_and_update_tweets(self):
+        self.tweet_checks += 1
+
+    async def check_and_update_accounts(self):
+        self.account_checks += 1
+        await asyncio.sleep(0.2)
+        raise RuntimeError('account sweep failed')
+
+
+class FakeResponseCache:
+    def __init__(self):
+        self.purges = 0
+
+    async def purge_expired(self):
+        self.purges += 1
+        raise RuntimeError('database unavailable')
+
+
+def test_loops_run_independently_of_each_other(run, monkeypatch):
+    monkeypatch.setattr(config, 'TWEET_CHECK_INTERVAL', 0.01)
+    monkeypatch.setattr(config, 'TWEET_CHECK_JITTER', 0)
+    monkeypatch.setattr(config, 'ACCOUNT_CHECK_INTERVAL', 0.01)
+    monkeypatch.setattr(config, 'ACCOUNT_CHECK_JITTER', 0)
+    monkeypatch.setattr(config, 'RESPONSE_CACHE_PURGE_INTERVAL', 0.01)
+    service = Service()
+    service.monitor = FakeMonitor()
+    service.api_client.response_cache = FakeResponseCache()
+
+    async def main():
+        loops = asyncio.ensure_future(service.handle_periodic_checks())
+        await asyncio.sleep(0.3)
+        loops.cancel()
+        await asyncio.gather(loops, return_exceptions=True)
+
+    run(main())
+    # A slow, failing account sweep neither delays nor stops the tweet loop
+    assert service.monitor.account_checks == 2
+    assert service.monitor.tweet_checks >= 10
+    assert service.api_client.response_cache.purges >= 10
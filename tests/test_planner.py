@@ -0,0 +1,129 @@
+import time
+
+import pytest
+
+from planner import BudgetPlanner
+from polling import AgeTierPolicy
+from rate_limiter import RateLimiter
+from scheduler import RefreshScheduler
+from tools.socialdata_stub import snowflake
+
+HOUR = 3600
+
+
+def planner_at(credits_used, budget=1000, **kwargs):
+    """A planner halfway through the day, so projected spend is twice the credits used"""
+    limiter = RateLimiter(0, 1, 10, daily_credit_budget=budget)
+    limiter.credits_used = credits_used
+    planner = BudgetPlanner(limiter, **kwargs)
+    planner._seconds_left_today = lambda: 12 * HOUR
+    return planner
+
+
+@pytest.mark.parametrize('credits_used, level', [
+    (300, 'normal'),
+    (450, 'tight'),
+    (550, 'critical'),
+    (800, 'severe'),
+    (1000, 'exhausted'),
+])
+def test_level_follows_projected_spend(credits_used, level):
+    assert planner_at(credits_used).level()[0] == level
+
+
+def test_without_a_budget_everything_is_polled():
+    planner = BudgetPlanner(RateLimiter(0, 1, 10))
+
+    assert planner.level() == ('unlimited', 0)
+    assert planner.allot(['a', 'b']) == (['a', 'b'], [])
+    assert planner.allows_stream('retweeters', 0)
+    assert all(planner.allows_discovery() for _ in range(5))
+
+
+def test_allot_polls_the_most_valuable_tweets_the_budget_covers():
+    # 450 credits left, paced at 2% per cycle: 9 credits cover two polls of 4 credits
+    planner = planner_at(550, cycle_seconds=864, burst=1)
+    planner.record_value('low', 1)
+    planner.record_value('high', 50)
+
+    selected, deferred = planner.allot(['low', 'high', 'new'])
+
+    # Tweets never polled rank first, so they get a value
+    assert selected == ['new', 'high']
+    assert deferred == ['low']
+    assert planner.deferred_polls == 1
+    assert planner.last_plan['polled'] == 2
+
+
+def test_allot_keeps_polling_while_credits_remain():
+    planner = planner_at(550, cycle_seconds=1, burst=1)
+    assert planner.allot(['a', 'b']) == (['a'], ['b'])
+
+    exhausted = planner_at(1000)
+    assert exhausted.allot(['a', 'b']) == ([], ['a', 'b'])
+
+
+def test_allot_polls_everything_at_normal_level():
+    planner = planner_at(100, cycle_seconds=1, burst=1)
+    assert planner.allot(['a', 'b', 'c']) == (['a', 'b', 'c'], [])
+
+
+def test_allows_stream_by_value_per_credit():
+    tight = planner_at(450)
+    # Value per credit is the change times the stream weight over its usual pages
+    assert tight.allows_stream('comments', 1)
+    assert tight.allows_stream('retweeters', 2)
+    assert not tight.allows_stream('retweeters', 1)
+    assert not tight.allows_stream('quotes', None)
+    assert tight.skipped_streams == {'comments': 0, 'quotes': 1, 'retweeters': 1}
+
+    critical = planner_at(550)
+    critical.record_run({'comment_api_calls': 11})
+    # Four pages per poll now: 10 new comments are worth 2.5 per credit
+    assert not critical.allows_stream('comments', 10)
+    assert critical.allows_stream('quotes', 20)
+
+    assert not planner_at(1000).allows_stream('quotes', 10_000)
+
+
+@pytest.mark.parametrize('credits_used, pattern', [
+    (300, [True, True, True, True, True, True, True, True]),
+    (450, [False, True, False, True, False, True, False, True]),
+    (550, [False, False, False, True, False, False, False, True]),
+    (800, [False, False, False, False, False, False, False, True]),
+    (1000, [False, False, False, False, False, False, False, False]),
+])
+def test_discovery_sweeps_are_spaced_by_level(credits_used, pattern):
+    planner = planner_at(credits_used)
+
+    assert [planner.allows_discovery() for _ in pattern] == pattern
+    assert planner.skipped_discoveries == pattern.count(False)
+
+
+def test_spend_is_recorded_by_stream():
+    planner = planner_at(0)
+    planner.record_run({'tweet_details_calls': 1, 'quote_api_calls': 3})
+    planner.record_discovery(2)
+
+    assert planner.spend == {'details': 1, 'comments': 0, 'retweeters': 0, 'quotes': 3, 'discovery': 2}
+
+
+def test_tweet_finishing_its_window_is_forgotten(stub, database, monitor, run):
+    now = int(time.time())
+    created = now - 23 * HOUR - 30 * 60
+    tweet_id = str(snowflake(created))
+    monitor.saturation = None
+    monitor.scheduler = RefreshScheduler(AgeTierPolicy())
+    monitor.scheduler.schedule(tweet_id, created, None)
+    monitor.planner.record_value(tweet_id, 10)
+
+    async def main():
+        await monitor.tweet_data.add_monitored_tweet(tweet_id, 'someone')
+        await monitor.tweet_data.save_tweet_details(tweet_id, {'favorite_count': 0, 'user': {}}, timestamp=now - HOUR)
+        return await monitor.monitor_tweet(tweet_id, run_timestamp=now)
+
+    result = run(main())
+    assert result.details_saved
+    # The next refresh would fall after the window, so the tweet is done
+    assert monitor.scheduler.finished == 1
+    assert tweet_id not in monitor.planner._value
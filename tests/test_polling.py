@@ -0,0 +1,87 @@
+import pytest
+
+from config import config
+from polling import AgeTierPolicy, PollingPolicy, VelocityPolicy, engagement_score, policy_from_config
+
+HOUR = 3600
+
+
+def snapshot(captured_at, **counts):
+    return {'captured_at': captured_at, **counts}
+
+
+def test_policy_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        PollingPolicy()
+
+
+@pytest.mark.parametrize('age, interval', [
+    (0, 300),
+    (HOUR, 300),
+    (HOUR + 1, 900),
+    (3 * HOUR, 900),
+    (10 * HOUR, 3600),
+    # An extended window stays in the last tier
+    (40 * HOUR, 3600),
+])
+def test_age_tiers(age, interval):
+    assert AgeTierPolicy().next_interval(age, [], None) == interval
+
+
+def test_next_due_ends_at_the_window():
+    policy = AgeTierPolicy()
+    created = 1_000_000
+    assert policy.next_due(created, None) == (created, None)
+    assert policy.next_due(created, created + 600) == (created + 900, 300)
+    assert policy.next_due(created, created + 23 * HOUR + 1800) is None
+    assert policy.next_due(created, created + 23 * HOUR + 1800, until=created + 30 * HOUR) == (created + 24 * HOUR + 1800, 3600)
+
+
+def test_engagement_score_weights_counters():
+    assert engagement_score({'favorite_count': 10, 'retweet_count': 2, 'quote_count': 1, 'views_count': 1000}) == 27
+    assert engagement_score({'favorite_count': None}) == 0
+
+
+def test_velocity_interval_is_time_to_gain_the_target():
+    policy = VelocityPolicy(target_delta=20)
+    # 40 points in 600s: 20 more take 300s
+    snapshots = [snapshot(1600, favorite_count=50), snapshot(1000, favorite_count=10)]
+    assert policy.next_interval(2 * HOUR, snapshots, 600) == 300
+
+
+def test_velocity_interval_is_clamped_to_the_tier():
+    policy = VelocityPolicy(target_delta=20)
+    fast = [snapshot(1600, favorite_count=10_000), snapshot(1000, favorite_count=0)]
+    slow = [snapshot(1600, favorite_count=1), snapshot(1000, favorite_count=0)]
+    assert policy.next_interval(600, fast, None) == 120
+    assert policy.next_interval(600, slow, None) == 900
+    assert policy.next_interval(10 * HOUR, fast, None) == 900
+    assert policy.next_interval(10 * HOUR, slow, None) == 7200
+
+
+def test_idle_tweet_backs_off_up_to_the_tier_maximum():
+    policy = VelocityPolicy()
+    idle = [snapshot(1600, favorite_count=5), snapshot(1000, favorite_count=5)]
+    assert policy.next_interval(2 * HOUR, idle, None) == 1800
+    assert policy.next_interval(600, idle, None) == 600
+    assert policy.next_interval(600, idle, 600) == 900
+    # Never below the tier minimum, even from a short previous interval
+    assert policy.next_interval(10 * HOUR, idle, 100) == 900
+
+
+def test_velocity_without_two_snapshots_uses_the_base_interval():
+    policy = VelocityPolicy()
+    assert policy.next_interval(600, [], None) == 300
+    assert policy.next_interval(600, [snapshot(1000, favorite_count=5)], None) == 300
+    same_time = [snapshot(1000, favorite_count=50), snapshot(1000, favorite_count=5)]
+    assert policy.next_interval(2 * HOUR, same_time, None) == 900
+
+
+def test_policy_from_config(monkeypatch):
+    monkeypatch.setattr(config, 'POLLING_POLICY', 'velocity')
+    monkeypatch.setattr(config, 'POLLING_TARGET_DELTA', 50)
+    policy = policy_from_config()
+    assert isinstance(policy, VelocityPolicy) and policy.target_delta == 50
+
+    monkeypatch.setattr(config, 'POLLING_POLICY', 'unknown')
+    assert type(policy_from_config()) is AgeTierPolicy
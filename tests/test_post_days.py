@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from db.tw.tweet_db import TweetDataRepository
+from db.users.user_db import UserDataRepository
+
+DAY = 86400
+# 2024-05-01T12:00:00Z
+POSTED = 1714564800
+
+
+def details(tweet_id, posted, favorite_count=1):
+    return {
+        'id_str': tweet_id,
+        'full_text': f'post {tweet_id}',
+        # The post time, not the snapshot time, picks the day
+        'tweet_created_at': datetime.fromtimestamp(posted, timezone.utc).strftime('%a %b %d %H:%M:%S +0000 %Y'),
+        'favorite_count': favorite_count,
+        'user': {'id_str': '42', 'screen_name': 'someone'},
+    }
+
+
+@pytest.fixture
+def repositories(database):
+    return TweetDataRepository(), UserDataRepository()
+
+
+async def snapshot(repository, tweet_id, posted, timestamp, favorite_count=1):
+    await repository.save_tweet_details(tweet_id, details(tweet_id, posted, favorite_count), timestamp=timestamp)
+
+
+def test_tweet_is_counted_once_on_its_first_snapshot(repositories, run):
+    tweets, users = repositories
+
+    async def main():
+        await users.create_user('user', 'user@example.com')
+        await tweets.add_monitored_tweet('1', 'someone')
+        await users.add_tracked_item('user', 'tweet', '1')
+        before = await tweets.get_user_post_days('user')
+        await snapshot(tweets, '1', POSTED, 100)
+        first = await tweets.get_user_post_days('user')
+        # Later snapshots, with or without changes, are not new posts
+        await snapshot(tweets, '1', POSTED, 200)
+        await snapshot(tweets, '1', POSTED, 300, favorite_count=9)
+        return before, first, await tweets.get_user_post_days('user')
+
+    before, first, later = run(main())
+    assert before == {}
+    assert first == {'2024-05-01': 1}
+    assert later == first
+
+
+def test_account_tweets_count_for_every_follower(repositories, run):
+    tweets, users = repositories
+
+    async def main():
+        for user_id in ('a', 'b'):
+            await users.create_user(user_id, f'{user_id}@example.com')
+            await users.add_tracked_item(user_id, 'account', '42')
+        for index, tweet_id in enumerate(('1', '2', '3')):
+            await tweets.add_monitored_tweet(tweet_id, 'someone')
+            await tweets.add_account_info_to_monitored_tweet('42', tweet_id, 'someone')
+            await snapshot(tweets, tweet_id, POSTED + (index // 2) * DAY, 100)
+        return await tweets.get_user_post_days('a'), await tweets.get_user_post_days('b')
+
+    assert run(main()) == ({'2024-05-01': 2, '2024-05-02': 1},) * 2
+
+
+def test_rebuild_after_untracking_matches_incremental_counts(repositories, run):
+    tweets, users = repositories
+
+    async def main():
+        await users.create_user('a', 'a@example.com')
+        await users.create_user('b', 'b@example.com')
+        for user_id in ('a', 'b'):
+            await users.add_tracked_item(user_id, 'tweet', '1')
+            await users.add_tracked_item(user_id, 'account', '42')
+        await users.add_tracked_item('a', 'tweet', '3')
+
+        await tweets.add_monitored_tweet('1', 'other')
+        await snapshot(tweets, '1', POSTED, 100)
+        for index, tweet_id in enumerate(('2', '3')):
+            await tweets.add_monitored_tweet(tweet_id, 'someone')
+            if tweet_id == '2':
+                await tweets.add_account_info_to_monitored_tweet('42', tweet_id, 'someone')
+            await snapshot(tweets, tweet_id, POSTED + (index + 1) * DAY, 100)
+        incremental = await tweets.get_user_post_days('a')
+
+        # A rebuild with nothing changed gives the same counts
+        await tweets.rebuild_user_post_days('a')
+        rebuilt = await tweets.get_user_post_days('a')
+
+        # Untracking tweet 3 leaves a with the same feed as b, who never tracked it
+        await users.remove_tracked_item('a', 'tweet', '3')
+        await tweets.rebuild_user_post_days('a')
+        return incremental, rebuilt, await tweets.get_user_post_days('a'), await tweets.get_user_post_days('b')
+
+    incremental, rebuilt, untracked, never_tracked = run(main())
+    assert incremental == {'2024-05-01': 1, '2024-05-02': 1, '2024-05-03': 1}
+    assert rebuilt == incremental
+    assert untracked == never_tracked == {'2024-05-01': 1, '2024-05-02': 1}
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import pytest
+
+from api_client import BASE_URL
+from rate_limiter import APIBudgetExceeded, APIPaused, RateLimiter
+
+
+def test_token_bucket_paces_requests_after_the_burst(run):
+    limiter = RateLimiter(requests_per_second=20, burst=2, default_concurrency=10)
+
+    async def take(n):
+        for _ in range(n):
+            async with limiter.acquire('tweets'):
+                pass
+
+    started = time.monotonic()
+    run(take(2))
+    assert time.monotonic() - started < 0.05
+    started = time.monotonic()
+    run(take(3))
+    # Burst spent: three more tokens at 20/s take about 0.15s
+    assert time.monotonic() - started >= 0.1
+
+
+def test_endpoint_concurrency_is_capped(run):
+    limiter = RateLimiter(0, 1, default_concurrency=5, endpoint_concurrency={'search': 2})
+    peak = {'search': 0, 'tweets': 0}
+
+    async def call(endpoint):
+        async with limiter.acquire(endpoint):
+            peak[endpoint] = max(peak[endpoint], limiter._in_flight[endpoint])
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(call('search') for _ in range(6)), *(call('tweets') for _ in range(6)))
+
+    run(main())
+    assert peak == {'search': 2, 'tweets': 5}
+    assert limiter.requests_by_endpoint == {'search': 6, 'tweets': 6}
+
+
+def test_daily_budget_is_charged_and_enforced(run):
+    limiter = RateLimiter(0, 1, 10, daily_credit_budget=3)
+
+    async def take():
+        async with limiter.acquire('tweets'):
+            pass
+
+    for _ in range(3):
+        run(take())
+    assert limiter.credits_used == 3
+    assert limiter.budget_remaining() == 0
+    with pytest.raises(APIBudgetExceeded):
+        run(take())
+    assert limiter.credits_used == 3
+
+
+def test_budget_resets_on_a_new_day():
+    limiter = RateLimiter(0, 1, 10, daily_credit_budget=3)
+    limiter.credits_used = 3
+    limiter.requests_by_endpoint = {'tweets': 3}
+    limiter._budget_day = '2000-01-01'
+
+    assert limiter.budget_remaining() == 3
+    assert limiter.requests_by_endpoint == {}
+
+
+def test_pause_blocks_calls_until_resumed_or_expired(run):
+    limiter = RateLimiter(0, 1, 10)
+
+    async def take():
+        async with limiter.acquire('tweets'):
+            pass
+
+    limiter.pause('Insufficient balance', 60)
+    with pytest.raises(APIPaused):
+        run(take())
+    limiter.resume()
+    run(take())
+
+    limiter.pause('Insufficient balance', 60)
+    limiter.paused_until = time.time() - 1
+    assert not limiter.is_paused()
+    run(take())
+    assert limiter.credits_used == 2
+
+
+def test_insufficient_balance_response_pauses_every_endpoint(stub, client, run):
+    stub.balance_error_rate = 1
+
+    data = run(client._request_json(f'{BASE_URL}/tweets/1700000000000000000'))
+    assert data['message'] == 'Insufficient balance'
+    assert client.limiter.is_paused()
+    with pytest.raises(APIPaused):
+        run(client._request_json(f'{BASE_URL}/user/someone'))
+
+    stub.balance_error_rate = 0
+    client.limiter.resume()
+    assert run(client._request_json(f'{BASE_URL}/user/someone'))['screen_name'] == 'someone'
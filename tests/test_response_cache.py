@@ -0,0 +1,122 @@
+import time
+
+import pytest
+
+from db.api.cache_db import APICacheRepository
+from response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted(run):
+    cache = ResponseCache({'user': 60}, max_entries=2)
+
+    async def main():
+        await cache.set('user', 'a', {'id': 'a'})
+        await cache.set('user', 'b', {'id': 'b'})
+        await cache.get('user', 'a')
+        await cache.set('user', 'c', {'id': 'c'})
+        return [await cache.get('user', key) for key in ('a', 'b', 'c')]
+
+    assert run(main()) == [{'id': 'a'}, None, {'id': 'c'}]
+    assert cache.stats['user'] == {'hits': 3, 'persistent_hits': 0, 'misses': 1}
+
+
+def test_entries_expire_after_their_endpoint_ttl(run, clock):
+    cache = ResponseCache({'user': 60, 'community': 600})
+
+    async def main():
+        await cache.set('user', 'u', {'id': 'u'})
+        await cache.set('community', 'c', {'id': 'c'})
+        clock[0] += 61
+        return await cache.get('user', 'u'), await cache.get('community', 'c')
+
+    assert run(main()) == (None, {'id': 'c'})
+    assert 'u' not in cache._entries
+
+
+def test_uncached_endpoints_are_not_stored(run):
+    cache = ResponseCache({'user': 60})
+
+    async def main():
+        await cache.set('tweets', 't', {'id': 't'})
+        return await cache.get('tweets', 't')
+
+    assert not cache.caches('tweets')
+    assert run(main()) is None
+
+
+def test_cached_values_are_copies(run):
+    cache = ResponseCache({'user': 60})
+    data = {'id': 'a', 'user': {'followers_count': 1}}
+
+    async def main():
+        await cache.set('user', 'a', data)
+        data['user']['followers_count'] = 2
+        first = await cache.get('user', 'a')
+        first['user']['followers_count'] = 3
+        return await cache.get('user', 'a')
+
+    assert run(main())['user']['followers_count'] == 1
+
+
+def test_purge_drops_only_expired_entries(run, clock):
+    cache = ResponseCache({'user': 60, 'community': 600})
+
+    async def main():
+        await cache.set('user', 'u', {'id': 'u'})
+        await cache.set('community', 'c', {'id': 'c'})
+        clock[0] += 61
+        return await cache.purge_expired()
+
+    assert run(main()) == 1
+    assert list(cache._entries) == ['c']
+
+
+def test_client_serves_repeat_lookups_from_the_cache(stub, client, run, monkeypatch):
+    monkeypatch.setattr(type(client), 'response_cache', ResponseCache({'user': 60}))
+
+    async def main():
+        first = await client.api_get_account_by_screen_name('Someone')
+        second = await client.api_get_account_by_screen_name('someone')
+        return first, second
+
+    first, second = run(main())
+    assert first == second
+    assert client.coalesce_stats['sent'] == 1
+    assert client.response_cache.stats['user'] == {'hits': 1, 'persistent_hits': 0, 'misses': 1}
+
+
+def test_error_responses_are_not_cached(stub, client, run, monkeypatch):
+    monkeypatch.setattr(type(client), 'response_cache', ResponseCache({'user': 60}))
+    stub.balance_error_rate = 1
+    run(client.api_get_account_by_screen_name('someone'))
+    stub.balance_error_rate = 0
+    client.limiter.resume()
+
+    assert run(client.api_get_account_by_screen_name('someone'))['screen_name'] == 'someone'
+    assert client.coalesce_stats['sent'] == 2
+
+
+def test_persistent_entries_survive_a_new_cache_and_are_purged(database, run):
+    repository = APICacheRepository()
+
+    async def main():
+        await ResponseCache({'user': 60}, persist=True).set('user', 'a', {'id': 'a'})
+        await repository.save_cached_response('old', 'user', '{"id": "old"}', int(time.time()) - 10)
+
+        restarted = ResponseCache({'user': 60}, persist=True)
+        found = await restarted.get('user', 'a')
+        purged = await restarted.purge_expired()
+        return found, restarted.stats['user'], purged, await repository.get_cached_response('a')
+
+    found, stats, purged, kept = run(main())
+    assert found == {'id': 'a'}
+    assert stats['persistent_hits'] == 1
+    assert purged == 1
+    assert kept[0] == {'id': 'a'}
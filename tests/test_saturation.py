@@ -0,0 +1,78 @@
+import math
+
+from db.migrations import get_async_session
+from db.schemas import TweetMetric
+from db.tw.tweet_db import TweetDataRepository
+from saturation import SaturationDetector
+
+HOUR = 3600
+
+
+def curve(hours, e_max, tau_hours):
+    """Snapshots of a saturating engagement curve for a tweet created at 0"""
+    return [
+        {'captured_at': int(h * HOUR), 'favorite_count': round(e_max * (1 - math.exp(-h / tau_hours)))}
+        for h in hours
+    ]
+
+
+def test_saturated_tweet_is_stopped():
+    snapshots = curve([0.5, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10], e_max=1000, tau_hours=2)
+
+    decision = SaturationDetector().evaluate(0, snapshots, 10 * HOUR, 24 * HOUR)
+
+    assert decision['action'] == 'stop'
+    assert decision['projected_remaining'] < 20
+
+
+def test_growing_tweet_near_the_end_of_its_window_is_extended():
+    snapshots = curve([18, 19, 20, 21, 22, 23, 23.5], e_max=1000, tau_hours=20)
+    detector = SaturationDetector(extend_by=24 * HOUR, max_window=72 * HOUR)
+
+    assert detector.evaluate(0, snapshots, 23.5 * HOUR, 24 * HOUR)['until'] == 48 * HOUR
+    # Extensions never go past the maximum window
+    assert detector.evaluate(0, snapshots, 59.5 * HOUR, 60 * HOUR)['until'] == 72 * HOUR
+    assert detector.evaluate(0, snapshots, 71.5 * HOUR, 72 * HOUR) is None
+    # Far from the end of the window there is nothing to decide yet
+    assert detector.evaluate(0, snapshots, 23.5 * HOUR, 30 * HOUR) is None
+
+
+def test_steady_growth_without_a_fit_is_extended():
+    snapshots = [{'captured_at': h * HOUR, 'favorite_count': 100 * h} for h in (20, 21, 22, 23)]
+
+    decision = SaturationDetector().evaluate(0, snapshots, 23 * HOUR, 24 * HOUR)
+
+    assert decision['action'] == 'extend'
+    assert 'without slowing down' in decision['reason']
+
+
+def test_young_or_sparsely_polled_tweets_are_left_alone():
+    detector = SaturationDetector(min_age=2 * HOUR, min_snapshots=4)
+    snapshots = curve([0.5, 1, 1.5, 1.9], e_max=1000, tau_hours=0.2)
+
+    assert detector.evaluate(0, snapshots, 1.9 * HOUR, 24 * HOUR) is None
+    assert detector.evaluate(0, snapshots[-3:], 10 * HOUR, 24 * HOUR) is None
+
+
+def test_only_the_recent_window_is_fitted():
+    # Accelerating early growth hides the later saturation from a fit over the whole history
+    early = [{'captured_at': int(h * HOUR), 'favorite_count': int(h * 10) ** 2} for h in (0.5, 1, 1.5, 2)]
+    snapshots = early + curve(range(3, 11), e_max=1000, tau_hours=2)
+
+    assert SaturationDetector(max_snapshots=100).evaluate(0, snapshots, 10 * HOUR, 24 * HOUR) is None
+    assert SaturationDetector(max_snapshots=5).evaluate(0, snapshots, 10 * HOUR, 24 * HOUR)['action'] == 'stop'
+
+
+def test_snapshot_query_returns_the_most_recent_window(database, run):
+    repository = TweetDataRepository()
+
+    async def main():
+        await repository.add_monitored_tweet('1', 'someone')
+        async with get_async_session() as session:
+            session.add_all(TweetMetric(tweet_id='1', captured_at=t, favorite_count=t) for t in range(1, 31))
+            await session.commit()
+        return await repository.get_tweet_snapshots('1', limit=5), await repository.get_tweet_snapshots('1')
+
+    window, history = run(main())
+    assert [snapshot['captured_at'] for snapshot in window] == [26, 27, 28, 29, 30]
+    assert len(history) == 30
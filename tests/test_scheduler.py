@@ -0,0 +1,139 @@
+import time
+
+from polling import AgeTierPolicy
+from scheduler import RefreshScheduler
+
+HOUR = 3600
+
+
+class FakeRefreshableTweets:
+    def __init__(self, tweets):
+        self.tweets = tweets
+
+    async def get_refreshable_tweets(self, created_after):
+        return [tweet for tweet in self.tweets if tweet['created_at'] >= created_after]
+
+
+def test_pop_due_returns_due_tweets_in_due_order():
+    scheduler = RefreshScheduler(AgeTierPolicy())
+    now = int(time.time())
+    # Never checked, so due at creation
+    scheduler.schedule('b', now - 200, None)
+    scheduler.schedule('a', now - 300, None)
+    scheduler.schedule('later', now + 100, None)
+
+    assert scheduler.pop_due(now) == [('a', now - 300, now - 300), ('b', now - 200, now - 200)]
+    assert scheduler.pop_due(now) == []
+    assert scheduler.pop_due(now + 100) == [('later', now + 100, now + 100)]
+
+
+def test_lag_is_measured_from_the_due_time():
+    scheduler = RefreshScheduler(AgeTierPolicy())
+    now = int(time.time())
+    for index in range(10):
+        scheduler.schedule(str(index), now - 10 * index, None)
+
+    for tweet_id, due_at, _ in scheduler.pop_due(now):
+        scheduler.record_lag(due_at, now)
+    # A run that starts early is not negative lag
+    scheduler.record_lag(now + 30, now)
+
+    lag = scheduler.state()['lag_seconds']
+    assert scheduler.polls == 11
+    assert lag['max'] == 90
+    assert lag['p50'] == 40
+    assert lag['avg'] == round(sum(range(0, 100, 10)) / 11, 1)
+
+
+def test_rescheduling_leaves_stale_entries_that_are_skipped():
+    scheduler = RefreshScheduler(AgeTierPolicy())
+    now = int(time.time())
+    created = now - 600
+    scheduler.schedule('a', created, None)
+    scheduler.schedule('b', now - 60, None)
+    # Checked just now: the next check is one first-hour tier later
+    scheduler.record_check('a', now)
+
+    assert scheduler.state()['heap_size'] == 3
+    assert scheduler.pop_due(now) == [('b', now - 60, now - 60)]
+    assert scheduler.pop_due(now + 299) == []
+    assert scheduler.pop_due(now + 300) == [('a', now + 300, created)]
+
+
+def test_retry_brings_a_tweet_forward_without_a_check():
+    scheduler = RefreshScheduler(AgeTierPolicy())
+    now = int(time.time())
+    scheduler.record_check('a', now - 10, created_at=now - 2 * HOUR)
+    scheduler.retry('a', delay=60)
+    scheduler.retry('unknown')
+
+    due = scheduler.pop_due(now + 120)
+    assert [tweet_id for tweet_id, _, _ in due] == ['a']
+    # The tier interval entry is stale now
+    assert scheduler.pop_due(now + HOUR) == []
+
+
+def test_tweets_past_their_window_are_dropped_and_counted():
+    scheduler = RefreshScheduler(AgeTierPolicy())
+    now = int(time.time())
+    scheduler.schedule('a', now - 23 * HOUR - 30 * 60, None)
+    assert not scheduler.record_check('a', now)
+
+    assert scheduler.finished == 1
+    assert scheduler.created_at('a') is None
+    assert scheduler.pop_due(now + 2 * HOUR) == []
+    assert scheduler.state()['scheduled'] == 0
+
+
+def test_extended_window_keeps_a_tweet_scheduled():
+    scheduler = RefreshScheduler(AgeTierPolicy())
+    now = int(time.time())
+    created = now - 23 * HOUR - 30 * 60
+    scheduler.schedule('a', created, None)
+    assert scheduler.window_end('a') == created + 24 * HOUR
+
+    scheduler.extend('a', now + 6 * HOUR)
+    assert scheduler.record_check('a', now)
+
+    assert scheduler.finished == 0
+    assert scheduler.window_end('a') == now + 6 * HOUR
+    assert scheduler.pop_due(now + HOUR) == [('a', now + HOUR, created)]
+    # Dropping forgets the extension too
+    scheduler.drop('a')
+    assert scheduler.state()['extended'] == 0
+
+
+def test_heap_is_compacted_when_stale_entries_pile_up():
+    scheduler = RefreshScheduler(AgeTierPolicy())
+    now = int(time.time())
+    scheduler.schedule('a', now - 600, None)
+    for offset in range(1100):
+        scheduler.retry('a', delay=1000 + offset)
+    assert scheduler.state()['heap_size'] == 1101
+
+    scheduler.pop_due(now)
+    assert scheduler.state()['heap_size'] == 1
+    assert [tweet_id for tweet_id, _, _ in scheduler.pop_due(now + 2200)] == ['a']
+
+
+def test_invalidate_reseeds_from_the_database(run):
+    scheduler = RefreshScheduler(AgeTierPolicy())
+    now = int(time.time())
+    store = FakeRefreshableTweets([
+        {'tweet_id': 'a', 'created_at': now - HOUR, 'last_check': now - 60, 'monitor_until': None},
+        {'tweet_id': 'old', 'created_at': now - 30 * HOUR, 'last_check': None, 'monitor_until': None},
+    ])
+    run(scheduler.seed(store))
+    assert scheduler.seeded
+    assert scheduler.state()['scheduled'] == 1
+
+    scheduler.invalidate()
+    assert not scheduler.seeded
+    store.tweets.append({'tweet_id': 'b', 'created_at': now - 60, 'last_check': None, 'monitor_until': now + HOUR})
+    scheduler.record_check('stale', now)
+    run(scheduler.seed(store))
+
+    assert scheduler.seeded
+    assert [tweet_id for tweet_id, _, _ in scheduler.pop_due(now + HOUR)] == ['b', 'a']
+    assert scheduler.window_end('b') == now + HOUR
+    assert scheduler.created_at('stale') is None
@@ -0,0 +1,64 @@
+import pytest
+
+from db.migrations import AsyncSessionLocal, session_scope
+from db.tw.tweet_db import TweetDataRepository
+
+
+@pytest.fixture
+def repository(database, run):
+    repository = TweetDataRepository()
+    run(repository.add_monitored_tweet('1', 'someone'))
+    return repository
+
+
+async def last_check(repository):
+    latest = await repository.get_latest_monitoring_run('1')
+    return latest[0] if latest else None
+
+
+def test_own_session_commits_when_the_block_succeeds(repository, run):
+    async def main():
+        await repository.update_tweet_last_check('1', 100)
+        return await last_check(repository)
+
+    assert run(main()) == 100
+
+
+def test_own_session_is_not_committed_when_the_block_fails(repository, run):
+    async def main():
+        with pytest.raises(RuntimeError):
+            async with session_scope() as session:
+                await repository.update_tweet_last_check('1', 100, session=session)
+                raise RuntimeError('failed')
+        return await last_check(repository)
+
+    assert run(main()) is None
+
+
+def test_joined_session_is_flushed_but_left_to_the_caller(repository, run):
+    async def main():
+        async with AsyncSessionLocal() as session:
+            await repository.update_tweet_last_check('1', 100, session=session)
+            await repository.save_tweet_details('1', {'favorite_count': 5, 'user': {}}, timestamp=100, session=session)
+            # Flushed: visible inside the caller's transaction, not outside it
+            inside = await repository.get_latest_tweet_metrics('1', session=session)
+            outside = await repository.get_latest_tweet_metrics('1')
+            await session.rollback()
+        return inside, outside, await last_check(repository), await repository.get_latest_tweet_metrics('1')
+
+    inside, outside, checked, metrics = run(main())
+    assert inside['favorite_count'] == 5
+    assert outside is None
+    assert checked is None and metrics is None
+
+
+def test_joined_calls_commit_as_one_unit(repository, run):
+    async def main():
+        async with session_scope() as session:
+            await repository.update_tweet_last_check('1', 100, session=session)
+            await repository.save_tweet_details('1', {'favorite_count': 5, 'user': {}}, timestamp=100, session=session)
+        return await last_check(repository), await repository.get_latest_tweet_metrics('1')
+
+    checked, metrics = run(main())
+    assert checked == 100
+    assert metrics['favorite_count'] == 5
@@ -0,0 +1,89 @@
+import pytest
+
+from api_client import SocialDataError
+from conftest import PAGE_SIZE
+from monitor import MonitoringRun
+
+
+class FakeStreamStore:
+    """In-memory stand-in for the stream methods of TweetDataRepository"""
+
+    def __init__(self, after_save=None):
+        self.saved = []
+        self.marks = {}
+        self.after_save = after_save
+
+    async def get_saved_stream_ids(self, tweet_id, stream, item_ids):
+        return set(item_ids) & set(self.saved)
+
+    async def save_tweet_quotes(self, tweet_id, quotes, timestamp=None):
+        new = [quote['id_str'] for quote in quotes if quote['id_str'] not in self.saved]
+        self.saved.extend(new)
+        if self.after_save:
+            self.after_save(self)
+        return len(new)
+
+    save_tweet_comments = save_tweet_retweeters = save_tweet_quotes
+
+    async def save_stream_mark(self, tweet_id, stream, last_id, cursor=None, pending_id=None):
+        self.marks[stream] = {'last_id': last_id, 'cursor': cursor, 'pending_id': pending_id}
+
+
+def test_paginator_raises_on_error_page(stub, client, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+    pages = client.iter_tweet_quotes(tweet_id)
+    seen = []
+
+    async def read():
+        async for page in pages:
+            seen.extend(item['id_str'] for item in page)
+            # Unrecorded fixtures answer with an error body from here on
+            stub.mode = 'replay'
+
+    with pytest.raises(SocialDataError):
+        run(read())
+    assert seen == ids[:PAGE_SIZE]
+    assert pages.page_cursor is None
+    assert pages.cursor == str(PAGE_SIZE)
+
+
+def test_interrupted_pass_resumes_from_saved_cursor(stub, monitor, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+
+    def fail_after_two_pages(store):
+        if len(store.saved) == 2 * PAGE_SIZE:
+            stub.mode = 'replay'
+
+    store = FakeStreamStore(after_save=fail_after_two_pages)
+    monitor.tweet_data = store
+    first = MonitoringRun(tweet_id, 0)
+    run(monitor._ingest_stream(first, tweet_id, 'quotes', None, None, None, 0))
+
+    # The failed pass must not advance the mark past pages it never read
+    assert first.errors and not first.quotes_saved
+    assert store.saved == ids[:2 * PAGE_SIZE]
+    assert store.marks['quotes'] == {'last_id': None, 'cursor': str(PAGE_SIZE), 'pending_id': ids[0]}
+
+    stub.mode = 'synthetic'
+    store.after_save = None
+    second = MonitoringRun(tweet_id, 0)
+    saved = run(monitor._ingest_stream(second, tweet_id, 'quotes', None, None, store.marks['quotes'], 0))
+
+    assert not second.errors and second.quotes_saved
+    assert saved == len(ids) - 2 * PAGE_SIZE
+    assert sorted(store.saved, key=int, reverse=True) == ids
+    assert store.marks['quotes'] == {'last_id': ids[0], 'cursor': None, 'pending_id': None}
+
+
+def test_completed_pass_only_reads_new_items(stub, monitor, run, quoted_tweet):
+    tweet_id, ids = quoted_tweet
+    store = FakeStreamStore()
+    store.saved = ids[5:]
+    monitor.tweet_data = store
+
+    monitoring_run = MonitoringRun(tweet_id, 0)
+    saved = run(monitor._ingest_stream(monitoring_run, tweet_id, 'quotes', None, None, {'last_id': ids[5]}, 0))
+
+    assert saved == 5
+    assert monitoring_run.api_calls['quote_api_calls'] == 1
+    assert store.marks['quotes']['last_id'] == ids[0]
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import event
+
+from db.migrations import engine
+from db.tw import tweet_db
+from db.tw.tweet_db import TweetDataRepository
+
+
+@pytest.fixture
+def repository(database, run):
+    repository = TweetDataRepository()
+
+    async def add_tweets():
+        await repository.add_monitored_tweet('1', 'someone')
+        await repository.add_monitored_tweet('2', 'someone')
+
+    run(add_tweets())
+    return repository
+
+
+def items(*ids):
+    return [{'id': item_id} for item_id in ids]
+
+
+def test_saved_ids_are_looked_up_by_primary_key(repository, run):
+    async def main():
+        await repository.save_tweet_quotes('1', items(10, 11, 12))
+        await repository.save_tweet_comments('1', items(20))
+        return (
+            await repository.get_saved_stream_ids('1', 'quotes', ['9', '10', '12', '13']),
+            await repository.get_saved_stream_ids('1', 'comments', ['10', '20']),
+            await repository.get_saved_stream_ids('1', 'quotes', []),
+        )
+
+    assert run(main()) == ({'10', '12'}, {'20'}, set())
+
+
+def test_saved_retweeters_are_scoped_to_their_tweet(repository, run):
+    async def main():
+        await repository.save_tweet_retweeters('1', items(100, 101))
+        await repository.save_tweet_retweeters('2', items(101))
+        return (
+            await repository.get_saved_stream_ids('1', 'retweeters', ['100', '101', '102']),
+            await repository.get_saved_stream_ids('2', 'retweeters', ['100', '101', '102']),
+        )
+
+    assert run(main()) == ({'100', '101'}, {'101'})
+
+
+def test_rows_are_inserted_in_chunks(repository, run, monkeypatch):
+    monkeypatch.setattr(tweet_db, 'INSERT_CHUNK_SIZE', 3)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO tweet_quotes'):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', record)
+    try:
+        inserted = run(repository.save_tweet_quotes('1', items(*range(10, 17))))
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', record)
+
+    assert inserted == 7
+    assert len(statements) == 3
+    assert all('ON CONFLICT DO NOTHING' in statement for statement in statements)
+
+
+def test_insert_counts_only_new_rows(repository, run):
+    async def main():
+        first = await repository.save_tweet_quotes('1', items(10, 11))
+        # Already saved rows and repeats within a page are skipped, not errors
+        second = await repository.save_tweet_quotes('1', items(11, 12, 12, 10, 13))
+        again = await repository.save_tweet_quotes('1', items(10, 13))
+        return first, second, again, await repository.get_tweet_quotes('1')
+
+    first, second, again, rows = run(main())
+    assert (first, second, again) == (2, 2, 0)
+    assert sorted(row.quote_id for row in rows) == ['10', '11', '12', '13']
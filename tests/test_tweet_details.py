@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import func, select
+
+from db.migrations import get_async_session
+from db.schemas import (AIAnalysis, MonitoredTweet, TweetComment, TweetDetail, TweetMetric, TweetQuote,
+                        TweetRetweeter, TweetStreamMark)
+from db.tw.tweet_db import TweetDataRepository
+from db.users.user_db import UserDataRepository
+
+DETAILS = {
+    'id_str': '1',
+    'full_text': 'first version',
+    'tweet_created_at': '2024-05-01T12:00:00.000000Z',
+    'favorite_count': 5,
+    'retweet_count': 1,
+    'user': {'id_str': '42', 'screen_name': 'someone', 'followers_count': 100},
+}
+
+
+@pytest.fixture
+def repository(database, run):
+    repository = TweetDataRepository()
+    run(repository.add_monitored_tweet('1', 'someone'))
+    return repository
+
+
+def test_unchanged_details_write_nothing(repository, run):
+    async def main():
+        first = await repository.save_tweet_details('1', DETAILS, timestamp=100)
+        again = await repository.save_tweet_details('1', dict(DETAILS), timestamp=200)
+        return first, again, await repository.get_tweet_snapshots('1'), await repository.get_all_tweet_details('1')
+
+    first, again, snapshots, details = run(main())
+    assert first == {'metrics': True, 'details': True}
+    assert again == {'metrics': False, 'details': False}
+    assert [snapshot['captured_at'] for snapshot in snapshots] == [100]
+    assert [captured_at for _, captured_at in details] == [100]
+
+
+def test_counter_change_writes_only_metrics(repository, run):
+    changed = dict(DETAILS, favorite_count=9, user=dict(DETAILS['user'], followers_count=120))
+
+    async def main():
+        await repository.save_tweet_details('1', DETAILS, timestamp=100)
+        saved = await repository.save_tweet_details('1', changed, timestamp=200)
+        return saved, await repository.get_latest_tweet_metrics('1'), await repository.get_all_tweet_details('1')
+
+    saved, metrics, details = run(main())
+    assert saved == {'metrics': True, 'details': False}
+    assert metrics['captured_at'] == 200
+    assert metrics['favorite_count'] == 9
+    assert metrics['author_followers'] == 120
+    assert len(details) == 1
+
+
+def test_content_change_writes_the_details(repository, run):
+    edited = dict(DETAILS, full_text='edited version')
+
+    async def main():
+        await repository.save_tweet_details('1', DETAILS, timestamp=100)
+        saved = await repository.save_tweet_details('1', edited, timestamp=200)
+        async with get_async_session() as session:
+            tweet = await session.get(MonitoredTweet, '1')
+        return saved, await repository.get_all_tweet_details('1'), await repository.get_tweet_snapshots('1'), tweet
+
+    saved, details, snapshots, tweet = run(main())
+    assert saved == {'metrics': False, 'details': True}
+    assert [captured_at for _, captured_at in details] == [100, 200]
+    assert len(snapshots) == 1
+    assert tweet.text == 'edited version'
+    assert tweet.latest_captured_at == 200
+
+
+def test_removing_a_tweet_deletes_its_rows_and_recounts_feeds(repository, run):
+    users = UserDataRepository()
+    models = (TweetDetail, TweetMetric, TweetComment, TweetQuote, TweetRetweeter, TweetStreamMark, AIAnalysis, MonitoredTweet)
+
+    async def row_counts():
+        async with get_async_session() as session:
+            return [(await session.execute(select(func.count()).select_from(model))).scalar() for model in models]
+
+    async def main():
+        await users.create_user('user', 'user@example.com')
+        await users.add_tracked_item('user', 'tweet', '1')
+        await repository.add_monitored_tweet('2', 'someone')
+        await users.add_tracked_item('user', 'tweet', '2')
+        for tweet_id in ('1', '2'):
+            await repository.save_tweet_details(tweet_id, dict(DETAILS, id_str=tweet_id), timestamp=100)
+        await repository.save_tweet_comments('1', [{'id': 10}])
+        await repository.save_tweet_quotes('1', [{'id': 11}])
+        await repository.save_tweet_retweeters('1', [{'id': 12}])
+        await repository.save_stream_mark('1', 'quotes', '11')
+        before = await repository.get_user_post_days('user')
+
+        await repository.remove_all_tweet_data('1')
+        return before, await repository.get_user_post_days('user'), await row_counts()
+
+    before, after, counts = run(main())
+    assert before == {'2024-05-01': 2}
+    assert after == {'2024-05-01': 1}
+    # Only tweet 2's details, metrics and monitored row remain
+    assert counts == [1, 1, 0, 0, 0, 0, 0, 1]
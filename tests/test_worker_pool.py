@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from config import config
+from worker_pool import RunTimeoutError, WorkerPool
+
+
+def test_workers_are_capped_by_the_database_pool(monkeypatch):
+    monkeypatch.setattr(config, 'DB_POOL_SIZE', 10)
+    monkeypatch.setattr(config, 'DB_MAX_OVERFLOW', 4)
+    monkeypatch.setattr(config, 'MONITOR_DB_RESERVED_CONNECTIONS', 2)
+    monkeypatch.setattr(config, 'MONITOR_DB_SESSIONS_PER_RUN', 3)
+    monkeypatch.setattr(config, 'MONITOR_RUN_TIMEOUT', 30)
+
+    monkeypatch.setattr(config, 'MONITOR_WORKERS', 50)
+    assert WorkerPool.from_config().workers == 4
+    monkeypatch.setattr(config, 'MONITOR_WORKERS', 3)
+    assert WorkerPool.from_config().workers == 3
+    # A pool too small for one run still gets a worker
+    monkeypatch.setattr(config, 'MONITOR_DB_RESERVED_CONNECTIONS', 14)
+    assert WorkerPool.from_config().workers == 1
+
+
+def test_runs_never_exceed_the_worker_count(run):
+    running = {'now': 0, 'peak': 0}
+
+    async def job(value):
+        running['now'] += 1
+        running['peak'] = max(running['peak'], running['now'])
+        await asyncio.sleep(0.01)
+        running['now'] -= 1
+        return value
+
+    async def main():
+        pool = WorkerPool(workers=3, run_timeout=5)
+        try:
+            return await pool.run_all([(str(n), lambda n=n: job(n)) for n in range(10)]), pool.state()
+        finally:
+            await pool.stop()
+
+    results, state = run(main())
+    assert results == list(range(10))
+    assert running['peak'] == 3
+    assert state['completed'] == 10
+    assert state['queue_depth'] == 0
+
+
+def test_slow_run_times_out_without_holding_its_worker(run):
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def fast():
+        return 'done'
+
+    async def main():
+        pool = WorkerPool(workers=1, run_timeout=0.05)
+        try:
+            return await pool.run_all([('slow', slow), ('fast', fast)]), pool
+        finally:
+            await pool.stop()
+
+    (timed_out, result), pool = run(main())
+    assert isinstance(timed_out, RunTimeoutError)
+    assert result == 'done'
+    assert (pool.timed_out, pool.completed) == (1, 1)
+
+
+def test_failed_run_does_not_affect_the_others(run):
+    async def fail():
+        raise ValueError('bad tweet')
+
+    async def succeed():
+        return 'ok'
+
+    async def main():
+        pool = WorkerPool(workers=2, run_timeout=5)
+        try:
+            results = await pool.run_all([('a', succeed), ('b', fail), ('c', succeed), ('d', fail), ('e', succeed)])
+            # The workers survive failures and keep serving new runs
+            return results, await pool.submit('f', succeed), pool
+        finally:
+            await pool.stop()
+
+    results, later, pool = run(main())
+    assert results[0::2] == ['ok', 'ok', 'ok']
+    assert all(isinstance(result, ValueError) for result in results[1::2])
+    assert later == 'ok'
+    assert (pool.failed, pool.completed) == (2, 4)
+
+
+def test_stop_cancels_queued_runs(run):
+    async def block():
+        await asyncio.sleep(5)
+
+    async def main():
+        pool = WorkerPool(workers=1, run_timeout=10)
+        running = pool.submit('running', block)
+        await asyncio.sleep(0.01)
+        await pool.stop()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        return pool.busy
+
+    assert run(main()) == 0
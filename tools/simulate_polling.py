@@ -0,0 +1,315 @@
+"""Offline simulator for tweet polling policies.
+
+Replays engagement histories through the polling policies in polling.py
+(optionally with the saturation detector) and reports what each policy
+costs and how fresh its data stays:
+
+    api_calls        details calls plus comment, retweeter and quote pages
+    mean_error       mean relative error of the last polled engagement score
+                     against ground truth, sampled every minute
+    final_error      relative error of the last snapshot against the final truth
+    max_staleness    longest time the polled data was out of date
+
+Histories come from synthetic curves, from raw history JSON files (the
+output of GET /tweet/{id}/history?format=raw, one object or a list), or
+from the database.
+
+Usage:
+    python -m tools.simulate_polling --tweets 500
+    python -m tools.simulate_polling --history exported.json --policies age velocity --saturation
+    python -m tools.simulate_polling --db 1889000000000000000 1889000000000000001
+    python -m tools.simulate_polling --benchmark --tweets 2000
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import random
+import time
+from typing import Dict, Any, Optional, List, Tuple
+
+from polling import POLICIES, PollingPolicy, AgeTierPolicy, VelocityPolicy, engagement_score
+from saturation import SaturationDetector
+
+METRIC_KEYS = ('favorite_count', 'retweet_count', 'reply_count', 'quote_count', 'bookmark_count', 'views_count')
+STREAM_COUNTERS = {'comments': 'reply_count', 'retweeters': 'retweet_count', 'quotes': 'quote_count'}
+PAGE_SIZE = 20
+TICK = 60
+# Policies read a zero last check as "never polled", so synthetic tweets start at a real timestamp
+SYNTHETIC_START = 1700000000
+
+
+class TweetHistory:
+    """Ground truth for one tweet: counter values over time and stream item arrival times"""
+
+    def __init__(self, tweet_id: str, created_at: float, times: List[float], metrics: List[Dict[str, float]],
+                 stream_items: Optional[Dict[str, List[float]]] = None):
+        self.tweet_id = tweet_id
+        self.created_at = created_at
+        self.times = times
+        self.metrics = metrics
+        self.stream_items = {stream: sorted(items) for stream, items in (stream_items or {}).items()}
+        self.end = times[-1]
+        self._grid: Optional[List[Tuple[float, float]]] = None
+
+    def at(self, t: float) -> Dict[str, float]:
+        """Counters at time t, interpolated linearly between recorded points"""
+        i = bisect.bisect_right(self.times, t)
+        if i == 0:
+            return {key: 0 for key in METRIC_KEYS}
+        if i == len(self.times):
+            return self.metrics[-1]
+        t0, t1 = self.times[i - 1], self.times[i]
+        m0, m1 = self.metrics[i - 1], self.metrics[i]
+        share = (t - t0) / (t1 - t0) if t1 > t0 else 1
+        return {key: m0.get(key, 0) + (m1.get(key, 0) - m0.get(key, 0)) * share for key in METRIC_KEYS}
+
+    def score_grid(self) -> List[Tuple[float, float]]:
+        """True engagement score every tick, computed once and shared by all policies"""
+        if self._grid is None:
+            ticks = int((self.end - self.created_at) // TICK) + 1
+            self._grid = [
+                (self.created_at + n * TICK, engagement_score(self.at(self.created_at + n * TICK)))
+                for n in range(ticks)
+            ]
+        return self._grid
+
+    def stream_count(self, stream: str, t: float) -> float:
+        """Items of a stream available by time t, from recorded items or the matching counter"""
+        if self.stream_items.get(stream):
+            return bisect.bisect_right(self.stream_items[stream], t)
+        return self.at(t).get(STREAM_COUNTERS[stream], 0)
+
+
+def synthetic_histories(count: int, seed: int = 0, hours: float = 72) -> List[TweetHistory]:
+    """Saturating engagement curves with a mix of quick deaths, normal tweets and slow burners"""
+    rng = random.Random(seed)
+    histories = []
+    for n in range(count):
+        final_views = rng.lognormvariate(8, 1.6)
+        kind = rng.random()
+        tau = rng.uniform(0.3, 1.5) if kind < 0.4 else rng.uniform(2, 8) if kind < 0.9 else rng.uniform(12, 40)
+        tau *= 3600
+        ratios = {
+            'favorite_count': rng.uniform(0.005, 0.04),
+            'retweet_count': rng.uniform(0.001, 0.008),
+            'reply_count': rng.uniform(0.001, 0.006),
+            'quote_count': rng.uniform(0.0002, 0.002),
+            'bookmark_count': rng.uniform(0.001, 0.005),
+            'views_count': 1,
+        }
+        times = list(range(0, int(hours * 3600) + 1, TICK))
+        metrics = [
+            {key: int(final_views * ratio * (1 - math.exp(-t / tau))) for key, ratio in ratios.items()}
+            for t in times
+        ]
+        histories.append(TweetHistory(
+            f"synthetic-{n}", SYNTHETIC_START, [float(SYNTHETIC_START + t) for t in times], metrics
+        ))
+    return histories
+
+
+def history_from_raw(raw: Dict[str, Any]) -> Optional[TweetHistory]:
+    """Build ground truth from a raw tweet history (metrics or details, comments, retweeters, quotes)"""
+    if raw.get('metrics'):
+        snapshots = [dict(item) for item in raw['metrics']]
+    else:
+        # Exports from before the compact metrics table carry counters in the details JSON
+        snapshots = [dict(item['data'], captured_at=item['captured_at']) for item in raw.get('details', [])]
+    snapshots.sort(key=lambda item: item['captured_at'])
+    if len(snapshots) < 2:
+        return None
+    times = [float(item['captured_at']) for item in snapshots]
+    metrics = [{key: item.get(key) or 0 for key in METRIC_KEYS} for item in snapshots]
+    stream_items = {
+        stream: [float(item['captured_at']) for item in raw.get(stream, [])]
+        for stream in STREAM_COUNTERS
+    }
+    # Recorded monitoring starts at the first snapshot, which stands in for creation
+    return TweetHistory(raw.get('tweet_id', '?'), times[0], times, metrics, stream_items)
+
+
+def load_history_files(paths: List[str]) -> List[TweetHistory]:
+    histories = []
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        for raw in data if isinstance(data, list) else [data]:
+            history = history_from_raw(raw)
+            if history:
+                histories.append(history)
+    return histories
+
+
+async def load_db_histories(tweet_ids: List[str]) -> List[TweetHistory]:
+    from db.tw.structured import TweetStructuredRepository
+    repository = TweetStructuredRepository()
+    histories = []
+    for tweet_id in tweet_ids:
+        history = history_from_raw(await repository.get_raw_tweet_history(tweet_id))
+        if history:
+            histories.append(history)
+    return histories
+
+
+def simulate(history: TweetHistory, policy: PollingPolicy,
+             saturation: Optional[SaturationDetector] = None) -> Dict[str, Any]:
+    """Poll one tweet on a one-minute tick the way TweetMonitor would"""
+    created_at = history.created_at
+    calls = {'details': 0, 'comments': 0, 'retweeters': 0, 'quotes': 0}
+    polled: List[Dict[str, Any]] = []
+    seen = {stream: 0 for stream in STREAM_COUNTERS}
+    interval = None
+    until = None
+    stopped_early = False
+
+    due = created_at
+    while due is not None and due <= history.end:
+        # Runs start on the first tick at or after the due time
+        t = created_at + math.ceil((due - created_at) / TICK) * TICK
+        if t > history.end:
+            break
+        truth = history.at(t)
+        calls['details'] += 1
+        previous = polled[-1] if polled else None
+        for stream, counter in STREAM_COUNTERS.items():
+            if previous is None or previous[counter] != truth[counter]:
+                available = history.stream_count(stream, t)
+                calls[stream] += max(math.ceil((available - seen[stream]) / PAGE_SIZE), 1)
+                seen[stream] = max(seen[stream], available)
+        snapshot = dict(truth, captured_at=t)
+        polled.append(snapshot)
+
+        if saturation:
+            window_end = until or created_at + policy.window
+            decision = saturation.evaluate(created_at, polled, t, window_end)
+            if decision and decision['action'] == 'stop':
+                stopped_early = True
+                break
+            if decision and decision['action'] == 'extend':
+                until = decision['until']
+
+        next_run = policy.next_due(created_at, t, list(reversed(polled[-2:])), interval, until)
+        if next_run is None:
+            break
+        due, interval = next_run
+
+    return {
+        'calls': calls,
+        'polls': polled,
+        'stopped_early': stopped_early,
+        **measure(history, polled)
+    }
+
+
+def measure(history: TweetHistory, polled: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Compare what was polled with the truth, minute by minute up to the end of the history"""
+    poll_times = [snapshot['captured_at'] for snapshot in polled]
+    errors = []
+    max_staleness = 0.0
+    for t, truth in history.score_grid():
+        i = bisect.bisect_right(poll_times, t)
+        observed = engagement_score(polled[i - 1]) if i else 0
+        errors.append(abs(truth - observed) / max(truth, 1))
+        if truth - observed > 0.5:
+            stale_since = poll_times[i - 1] if i else history.created_at
+            max_staleness = max(max_staleness, t - stale_since)
+
+    final_truth = engagement_score(history.metrics[-1])
+    final_observed = engagement_score(polled[-1]) if polled else 0
+    return {
+        'mean_error': sum(errors) / len(errors) if errors else 0,
+        'final_error': abs(final_truth - final_observed) / max(final_truth, 1),
+        'max_staleness': max_staleness
+    }
+
+
+def build_policy(name: str, target_delta: float) -> PollingPolicy:
+    if name == VelocityPolicy.name:
+        return VelocityPolicy(target_delta)
+    return POLICIES[name]()
+
+
+def run(histories: List[TweetHistory], policy_names: List[str], use_saturation: bool,
+        target_delta: float) -> List[Dict[str, Any]]:
+    reports = []
+    variants = [(name, False) for name in policy_names]
+    if use_saturation:
+        variants += [(name, True) for name in policy_names]
+    for name, with_saturation in variants:
+        policy = build_policy(name, target_delta)
+        detector = SaturationDetector() if with_saturation else None
+        started = time.perf_counter()
+        results = [simulate(history, policy, detector) for history in histories]
+        elapsed = time.perf_counter() - started
+
+        totals = {stream: sum(result['calls'][stream] for result in results) for stream in results[0]['calls']}
+        reports.append({
+            'policy': name + ('+saturation' if with_saturation else ''),
+            'tweets': len(results),
+            'api_calls': sum(totals.values()),
+            'calls_by_stream': totals,
+            'calls_per_tweet': round(sum(totals.values()) / len(results), 1),
+            'mean_error': round(sum(result['mean_error'] for result in results) / len(results), 4),
+            'final_error': round(sum(result['final_error'] for result in results) / len(results), 4),
+            'max_staleness_minutes': round(max(result['max_staleness'] for result in results) / 60, 1),
+            'stopped_early': sum(result['stopped_early'] for result in results),
+            'simulated_tweets_per_second': round(len(results) / elapsed, 1) if elapsed else None
+        })
+    return reports
+
+
+def print_table(reports: List[Dict[str, Any]]):
+    columns = ['policy', 'tweets', 'api_calls', 'calls_per_tweet', 'mean_error', 'final_error',
+               'max_staleness_minutes', 'stopped_early', 'simulated_tweets_per_second']
+    widths = {column: max(len(column), *(len(str(report[column])) for report in reports)) for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for report in reports:
+        print('  '.join(str(report[column]).ljust(widths[column]) for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate tweet polling policies over recorded or synthetic histories")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--history", nargs="+", help="Raw tweet history JSON files")
+    source.add_argument("--db", nargs="+", metavar="TWEET_ID", help="Load raw histories for these tweets from the database")
+    parser.add_argument("--tweets", type=int, default=200, help="Number of synthetic tweets")
+    parser.add_argument("--hours", type=float, default=72, help="Length of synthetic histories")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policies", nargs="+", choices=sorted(POLICIES), default=[AgeTierPolicy.name, VelocityPolicy.name])
+    parser.add_argument("--target-delta", type=float, default=20, help="Engagement points per poll for the velocity policy")
+    parser.add_argument("--saturation", action="store_true", help="Also run each policy with the saturation detector")
+    parser.add_argument("--benchmark", action="store_true", help="Repeat the run and report simulation throughput")
+    parser.add_argument("--repeat", type=int, default=3, help="Benchmark repetitions")
+    parser.add_argument("--json", action="store_true", help="Print reports as JSON")
+    args = parser.parse_args()
+
+    if args.history:
+        histories = load_history_files(args.history)
+    elif args.db:
+        histories = asyncio.run(load_db_histories(args.db))
+    else:
+        histories = synthetic_histories(args.tweets, args.seed, args.hours)
+    if not histories:
+        parser.error("No histories with at least two snapshots to simulate")
+
+    if args.benchmark:
+        best: Dict[str, Dict[str, Any]] = {}
+        for _ in range(args.repeat):
+            for report in run(histories, args.policies, args.saturation, args.target_delta):
+                current = best.get(report['policy'])
+                if not current or report['simulated_tweets_per_second'] > current['simulated_tweets_per_second']:
+                    best[report['policy']] = report
+        reports = list(best.values())
+    else:
+        reports = run(histories, args.policies, args.saturation, args.target_delta)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_table(reports)
+
+
+if __name__ == "__main__":
+    main()
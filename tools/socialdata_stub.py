@@ -0,0 +1,494 @@
+"""Offline stand-in for SocialData and the OpenAI-compatible LLM backend.
+
+Serves the SocialData routes used by api_client.py and a /v1/chat/completions
+route for litellm, so TweetMonitor, AccountAnalyzer and Workshop can be
+load-tested without spending credits.
+
+Modes:
+    synthetic  deterministic generated data whose engagement grows over time
+    replay     responses loaded from recorded fixtures
+    record     requests proxied to the real APIs and saved as fixtures
+
+Usage:
+    python -m tools.socialdata_stub --mode synthetic --port 8090 --latency-ms 80 --error-rate 0.02
+
+Then run the app with:
+    SOCIAL_DATA_BASE_URL=http://localhost:8090
+    OPENAI_API_BASE=http://localhost:8090/v1
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+import aiohttp
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+TWITTER_EPOCH_MS = 1288834974657
+SOCIALDATA_UPSTREAM = "https://api.socialdata.tools"
+OPENAI_UPSTREAM = "https://api.openai.com"
+
+
+class StubSettings:
+    def __init__(self, mode: str = "synthetic", fixtures_dir: str = "tools/fixtures", page_size: int = 20,
+                 latency_ms: float = 0, latency_jitter_ms: float = 0, error_rate: float = 0,
+                 throttle_rate: float = 0, balance_error_rate: float = 0, seed: int = 0,
+                 replay_fallback: bool = False):
+        self.mode = mode
+        self.fixtures_dir = Path(fixtures_dir)
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.balance_error_rate = balance_error_rate
+        self.seed = seed
+        self.replay_fallback = replay_fallback
+
+
+def snowflake(timestamp: float, sequence: int = 0) -> int:
+    """Build a Twitter-style id that sorts by creation time"""
+    return ((int(timestamp * 1000) - TWITTER_EPOCH_MS) << 22) | (sequence & 0x3FFFFF)
+
+
+def snowflake_time(tweet_id: int) -> float:
+    return ((tweet_id >> 22) + TWITTER_EPOCH_MS) / 1000
+
+
+def twitter_time(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000000Z', time.gmtime(timestamp))
+
+
+class SyntheticData:
+    """Deterministic fake SocialData objects.
+
+    Every value is derived from a hash of the object's id and the seed, so
+    repeated requests agree with each other. Engagement follows a saturating
+    curve `total * (1 - exp(-age / tau))`, and the n-th reply, retweet or
+    quote always gets the same id and timestamp, so incremental ingestion and
+    dedupe behave as they would against the real API.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.started_at = time.time()
+        self.authors: Dict[str, str] = {}
+
+    def _rand(self, *key) -> random.Random:
+        digest = hashlib.sha1(f"{self.seed}:{':'.join(map(str, key))}".encode()).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def user(self, identifier: str) -> Dict[str, Any]:
+        rng = self._rand('user', identifier.lower())
+        user_id = identifier if identifier.isdigit() else str(rng.randint(10**8, 10**18))
+        screen_name = identifier if not identifier.isdigit() else f"user_{identifier[-6:]}"
+        return {
+            'id': int(user_id),
+            'id_str': user_id,
+            'name': screen_name.replace('_', ' ').title(),
+            'screen_name': screen_name,
+            'description': f"Synthetic account {screen_name}",
+            'followers_count': int(rng.lognormvariate(7, 1.5)),
+            'friends_count': rng.randint(10, 3000),
+            'statuses_count': rng.randint(100, 50000),
+            'verified': rng.random() < 0.1,
+            'profile_image_url_https': f"https://pbs.twimg.com/profile_images/{user_id}/avatar_normal.jpg",
+            'created_at': twitter_time(self.started_at - rng.randint(30, 4000) * 86400)
+        }
+
+    def _tweet_created(self, tweet_id: str) -> float:
+        created = snowflake_time(int(tweet_id)) if tweet_id.isdigit() else 0
+        if created < 1.2e9 or created > time.time() + 60:
+            created = self.started_at - 1800
+        return created
+
+    def _curve(self, tweet_id: str) -> Tuple[float, float]:
+        rng = self._rand('curve', tweet_id)
+        return rng.lognormvariate(8, 1.6), rng.uniform(0.5, 12) * 3600
+
+    def _totals(self, tweet_id: str, at: Optional[float] = None) -> Dict[str, int]:
+        at = at or time.time()
+        final_views, tau = self._curve(tweet_id)
+        age = max(at - self._tweet_created(tweet_id), 0)
+        views = final_views * (1 - math.exp(-age / tau))
+        return {
+            'views_count': int(views),
+            'favorite_count': int(views * 0.02),
+            'reply_count': int(views * 0.002),
+            'retweet_count': int(views * 0.004),
+            'quote_count': int(views * 0.001),
+            'bookmark_count': int(views * 0.003)
+        }
+
+    def tweet(self, tweet_id: str, author: Optional[str] = None, text: Optional[str] = None,
+              in_reply_to: Optional[str] = None) -> Dict[str, Any]:
+        author = author or self.authors.get(tweet_id) or f"author_{int(tweet_id) % 97 if tweet_id.isdigit() else 0}"
+        created = self._tweet_created(tweet_id)
+        rng = self._rand('tweet', tweet_id)
+        tweet = {
+            'id': int(tweet_id) if tweet_id.isdigit() else 0,
+            'id_str': tweet_id,
+            'conversation_id_str': in_reply_to or tweet_id,
+            'in_reply_to_status_id_str': in_reply_to,
+            'tweet_created_at': twitter_time(created),
+            'full_text': text or f"Synthetic post {tweet_id} #{rng.randint(1, 999)}",
+            'lang': 'en',
+            'is_quote_status': False,
+            'quoted_status_id_str': None,
+            'retweeted_status': None,
+            'entities': {'media': [{'type': 'photo'}] if rng.random() < 0.3 else []},
+            'source': 'synthetic',
+            'type': 'reply' if in_reply_to else 'tweet',
+            'user': self.user(author)
+        }
+        tweet.update(self._totals(tweet_id))
+        return tweet
+
+    def _engagement_items(self, tweet_id: str, kind: str) -> List[Tuple[int, float]]:
+        """Stable (sequence, timestamp) pairs for every reply, retweet or quote so far, newest first"""
+        count_key = {'comments': 'reply_count', 'retweeters': 'retweet_count', 'quotes': 'quote_count'}[kind]
+        final_views, tau = self._curve(tweet_id)
+        current = self._totals(tweet_id)[count_key]
+        ratio = {'comments': 0.002, 'retweeters': 0.004, 'quotes': 0.001}[kind]
+        final = max(final_views * ratio, current + 1)
+        created = self._tweet_created(tweet_id)
+        items = []
+        for i in range(current):
+            # Invert the growth curve so item i keeps the same timestamp forever
+            offset = -tau * math.log(1 - (i + 0.5) / final)
+            items.append((i, created + offset))
+        return list(reversed(items))
+
+    def comments(self, tweet_id: str) -> List[Dict[str, Any]]:
+        replies = []
+        for i, ts in self._engagement_items(tweet_id, 'comments'):
+            reply_id = str(snowflake(ts, i))
+            replies.append(self.tweet(reply_id, author=f"replier_{tweet_id[-4:]}_{i}", in_reply_to=tweet_id,
+                                      text=f"Reply {i} to {tweet_id}"))
+        return replies
+
+    def retweeters(self, tweet_id: str) -> List[Dict[str, Any]]:
+        return [self.user(f"rt_{tweet_id[-4:]}_{i}") for i, _ in self._engagement_items(tweet_id, 'retweeters')]
+
+    def quotes(self, tweet_id: str) -> List[Dict[str, Any]]:
+        quotes = []
+        for i, ts in self._engagement_items(tweet_id, 'quotes'):
+            quote = self.tweet(str(snowflake(ts, 1000 + i)), author=f"quoter_{tweet_id[-4:]}_{i}",
+                               text=f"Quoting {tweet_id} ({i})")
+            quote['is_quote_status'] = True
+            quote['quoted_status_id_str'] = tweet_id
+            quotes.append(quote)
+        return quotes
+
+    def timeline(self, screen_name: str, since: Optional[float] = None, limit: int = 200) -> List[Dict[str, Any]]:
+        """Posts by a user at a steady per-user cadence, newest first"""
+        rng = self._rand('cadence', screen_name.lower())
+        interval = rng.uniform(0.5, 8) * 3600
+        now = time.time()
+        tweets = []
+        slot = math.floor(now / interval)
+        while len(tweets) < limit:
+            posted = slot * interval + rng.uniform(0, interval * 0.5)
+            if since and posted <= since:
+                break
+            if posted <= now:
+                tweet_id = str(snowflake(posted, hash(screen_name) & 0xFFF))
+                self.authors[tweet_id] = screen_name
+                tweets.append(self.tweet(tweet_id, author=screen_name))
+            slot -= 1
+        return tweets
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        terms = dict(re.findall(r'(\w+):(\S+)', query))
+        if 'conversation_id' in terms:
+            results = self.comments(terms['conversation_id'])
+            if 'to' in terms:
+                results = [r for r in results if r['user']['screen_name'] != terms['to']]
+        elif 'from' in terms:
+            since = float(terms['since_time']) if terms.get('since_time', '').isdigit() else None
+            # Synthetic timelines hold original posts only, so filter:replies matches nothing
+            results = [] if re.search(r'(?<!-)filter:replies', query) else self.timeline(terms['from'], since=since)
+        else:
+            results = []
+        if terms.get('since_id', '').isdigit():
+            results = [r for r in results if int(r['id_str']) > int(terms['since_id'])]
+        return results
+
+    def community(self, community_id: str) -> Dict[str, Any]:
+        rng = self._rand('community', community_id)
+        return {
+            'id_str': community_id,
+            'name': f"Synthetic community {community_id}",
+            'description': 'Generated by the SocialData stub',
+            'member_count': rng.randint(100, 100000),
+            'created_at': twitter_time(self.started_at - rng.randint(30, 900) * 86400)
+        }
+
+    def community_tweets(self, community_id: str) -> List[Dict[str, Any]]:
+        rng = self._rand('community_members', community_id)
+        members = [f"member_{community_id[-4:]}_{i}" for i in range(rng.randint(5, 20))]
+        tweets = [t for member in members for t in self.timeline(member, limit=10)]
+        return sorted(tweets, key=lambda t: t['favorite_count'], reverse=True)
+
+    def list_tweets(self, list_id: str) -> List[Dict[str, Any]]:
+        rng = self._rand('list_members', list_id)
+        members = [f"listed_{list_id[-4:]}_{i}" for i in range(rng.randint(3, 12))]
+        tweets = [t for member in members for t in self.timeline(member, limit=20)]
+        return sorted(tweets, key=lambda t: int(t['id_str']), reverse=True)
+
+    def thread(self, thread_id: str) -> List[Dict[str, Any]]:
+        head = self.tweet(thread_id)
+        author = head['user']['screen_name']
+        created = self._tweet_created(thread_id)
+        return [head] + [
+            self.tweet(str(snowflake(created + i * 30, i)), author=author, in_reply_to=thread_id,
+                       text=f"Thread part {i + 1} of {thread_id}")
+            for i in range(1, self._rand('thread', thread_id).randint(2, 6))
+        ]
+
+
+def paginate(items: List[Dict[str, Any]], items_key: str, cursor: Optional[str], page_size: int) -> Dict[str, Any]:
+    start = int(cursor) if cursor and cursor.isdigit() else 0
+    page = items[start:start + page_size]
+    next_start = start + page_size
+    return {
+        items_key: page,
+        'next_cursor': str(next_start) if next_start < len(items) else None
+    }
+
+
+class FixtureStore:
+    """Recorded responses keyed by request method, path, query and body"""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, method: str, path: str, params: Dict[str, Any], body: Optional[bytes]) -> Path:
+        signature = json.dumps({
+            'method': method,
+            'path': path,
+            'params': sorted(params.items()),
+            'body': hashlib.sha1(body).hexdigest() if body else None
+        })
+        digest = hashlib.sha1(signature.encode()).hexdigest()
+        return self.root / path.strip('/').split('/')[0] / f"{digest}.json"
+
+    def load(self, method: str, path: str, params: Dict[str, Any], body: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        fixture = self._path(method, path, params, body)
+        if not fixture.exists():
+            return None
+        return json.loads(fixture.read_text())
+
+    def save(self, method: str, path: str, params: Dict[str, Any], body: Optional[bytes], status: int, payload: Any):
+        fixture = self._path(method, path, params, body)
+        fixture.parent.mkdir(parents=True, exist_ok=True)
+        fixture.write_text(json.dumps({
+            'method': method,
+            'path': path,
+            'params': params,
+            'status': status,
+            'body': payload,
+            'recorded_at': int(time.time())
+        }, indent=2))
+
+
+def create_app(settings: StubSettings) -> FastAPI:
+    app = FastAPI(title="SocialData stub", description="Offline stand-in for SocialData and the LLM backend")
+    data = SyntheticData(settings.seed)
+    fixtures = FixtureStore(settings.fixtures_dir)
+    stats = {'requests': 0, 'errors_injected': 0, 'by_route': {}}
+    upstream: Dict[str, aiohttp.ClientSession] = {}
+
+    async def inject_faults(route: str) -> Optional[JSONResponse]:
+        stats['requests'] += 1
+        stats['by_route'][route] = stats['by_route'].get(route, 0) + 1
+        if settings.latency_ms or settings.latency_jitter_ms:
+            delay = settings.latency_ms + random.uniform(0, settings.latency_jitter_ms)
+            await asyncio.sleep(delay / 1000)
+        roll = random.random()
+        if roll < settings.balance_error_rate:
+            stats['errors_injected'] += 1
+            return JSONResponse({'status': 'error', 'message': 'Insufficient balance'}, status_code=402)
+        roll -= settings.balance_error_rate
+        if roll < settings.throttle_rate:
+            stats['errors_injected'] += 1
+            return JSONResponse({'status': 'error', 'message': 'Too many requests'}, status_code=429,
+                                headers={'Retry-After': '1'})
+        roll -= settings.throttle_rate
+        if roll < settings.error_rate:
+            stats['errors_injected'] += 1
+            return JSONResponse({'status': 'error', 'message': 'Service unavailable'}, status_code=503)
+        return None
+
+    async def proxy(request: Request, base_url: str, api_key_env: str) -> JSONResponse:
+        if 'session' not in upstream:
+            upstream['session'] = aiohttp.ClientSession()
+        params = dict(request.query_params)
+        body = await request.body()
+        headers = {'Authorization': f"Bearer {os.getenv(api_key_env, '')}", 'Accept': 'application/json'}
+        if body:
+            headers['Content-Type'] = 'application/json'
+        async with upstream['session'].request(request.method, f"{base_url}{request.url.path}",
+                                               params=params, data=body or None, headers=headers) as response:
+            payload = await response.json(content_type=None)
+            status = response.status
+        fixtures.save(request.method, request.url.path, params, body, status, payload)
+        return JSONResponse(payload, status_code=status)
+
+    async def serve(request: Request, route: str, synthesize) -> JSONResponse:
+        fault = await inject_faults(route)
+        if fault is not None:
+            return fault
+        if settings.mode == 'record':
+            return await proxy(request, SOCIALDATA_UPSTREAM, 'SOCIAL_DATA_API_KEY')
+        if settings.mode == 'replay':
+            recorded = fixtures.load(request.method, request.url.path, dict(request.query_params))
+            if recorded:
+                return JSONResponse(recorded['body'], status_code=recorded['status'])
+            if not settings.replay_fallback:
+                return JSONResponse({'status': 'error', 'message': 'No recorded fixture'}, status_code=404)
+        return JSONResponse(synthesize(request.query_params.get('cursor')))
+
+    @app.on_event("shutdown")
+    async def close_upstream():
+        if 'session' in upstream:
+            await upstream['session'].close()
+
+    @app.get("/twitter/user/{identifier}")
+    async def get_user(identifier: str, request: Request):
+        return await serve(request, 'user', lambda cursor: data.user(identifier))
+
+    @app.get("/twitter/tweets/{tweet_id}")
+    async def get_tweet(tweet_id: str, request: Request):
+        return await serve(request, 'tweets', lambda cursor: data.tweet(tweet_id))
+
+    @app.get("/twitter/tweets/{tweet_id}/retweeted_by")
+    async def get_retweeters(tweet_id: str, request: Request):
+        return await serve(request, 'retweeted_by',
+                           lambda cursor: paginate(data.retweeters(tweet_id), 'users', cursor, settings.page_size))
+
+    @app.get("/twitter/tweets/{tweet_id}/quotes")
+    async def get_quotes(tweet_id: str, request: Request):
+        return await serve(request, 'quotes',
+                           lambda cursor: paginate(data.quotes(tweet_id), 'tweets', cursor, settings.page_size))
+
+    @app.get("/twitter/search")
+    async def search(request: Request):
+        query = request.query_params.get('query', '')
+        return await serve(request, 'search',
+                           lambda cursor: paginate(data.search(query), 'tweets', cursor, settings.page_size))
+
+    @app.get("/twitter/thread/{thread_id}")
+    async def get_thread(thread_id: str, request: Request):
+        return await serve(request, 'thread',
+                           lambda cursor: paginate(data.thread(thread_id), 'tweets', cursor, settings.page_size))
+
+    @app.get("/twitter/list/{list_id}/tweets")
+    async def get_list_tweets(list_id: str, request: Request):
+        return await serve(request, 'list',
+                           lambda cursor: paginate(data.list_tweets(list_id), 'tweets', cursor, settings.page_size))
+
+    @app.get("/twitter/community/{community_id}")
+    async def get_community(community_id: str, request: Request):
+        return await serve(request, 'community', lambda cursor: data.community(community_id))
+
+    @app.get("/twitter/community/{community_id}/tweets")
+    async def get_community_tweets(community_id: str, request: Request):
+        return await serve(request, 'community_tweets',
+                           lambda cursor: paginate(data.community_tweets(community_id), 'tweets', cursor, settings.page_size))
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        """OpenAI-compatible completion endpoint for litellm"""
+        fault = await inject_faults('chat_completions')
+        if fault is not None:
+            return fault
+        if settings.mode == 'record':
+            return await proxy(request, OPENAI_UPSTREAM, 'OPENAI_API_KEY')
+
+        body = await request.body()
+        if settings.mode == 'replay':
+            recorded = fixtures.load(request.method, request.url.path, {}, body)
+            if recorded:
+                return JSONResponse(recorded['body'], status_code=recorded['status'])
+            if not settings.replay_fallback:
+                return JSONResponse({'error': {'message': 'No recorded fixture'}}, status_code=404)
+
+        payload = json.loads(body or b'{}')
+        prompt = ' '.join(str(m.get('content', '')) for m in payload.get('messages', []))
+        if (payload.get('response_format') or {}).get('type') == 'json_object':
+            content = json.dumps({'stub': True, 'summary': f"Synthetic analysis of {len(prompt)} prompt characters"})
+        else:
+            content = f"Synthetic analysis of {len(prompt)} prompt characters."
+        prompt_tokens = max(len(prompt) // 4, 1)
+        completion_tokens = max(len(content) // 4, 1)
+        return JSONResponse({
+            'id': f"chatcmpl-stub-{hashlib.sha1(body).hexdigest()[:12]}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        })
+
+    @app.get("/stub/stats")
+    async def get_stats():
+        return {'mode': settings.mode, **stats}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline SocialData and LLM stand-in server")
+    parser.add_argument("--mode", choices=["synthetic", "replay", "record"], default="synthetic")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--fixtures", default="tools/fixtures", help="Directory for recorded responses")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Base latency added to every response")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0, help="Random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Share of requests answered with 429")
+    parser.add_argument("--balance-error-rate", type=float, default=0, help="Share answered with Insufficient balance")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay-fallback", action="store_true", help="Synthesize responses missing from fixtures")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    settings = StubSettings(
+        mode=args.mode,
+        fixtures_dir=args.fixtures,
+        page_size=args.page_size,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        balance_error_rate=args.balance_error_rate,
+        seed=args.seed,
+        replay_fallback=args.replay_fallback
+    )
+    uvicorn.run(create_app(settings), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class RunTimeoutError(Exception):
+    """Raised when a queued run exceeds the pool's per-run timeout"""
+    pass
+
+
+class WorkerPool:
+    """Fixed set of async workers pulling monitoring runs from a queue.
+
+    Bounds how many runs touch the database and SocialData at once, so a
+    backlog after downtime queues up instead of opening thousands of
+    coroutines against the connection pool. Each run gets a timeout, and
+    queue depth, throughput and run durations are kept for the admin API.
+    """
+
+    def __init__(self, workers: int, run_timeout: float, name: str = 'monitor', sample_size: int = 500):
+        self.name = name
+        self.workers = max(workers, 1)
+        self.run_timeout = run_timeout
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self.busy = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self._finished_at: deque = deque(maxlen=sample_size)
+        self._durations: deque = deque(maxlen=sample_size)
+        self._waits: deque = deque(maxlen=sample_size)
+
+    @classmethod
+    def from_config(cls) -> 'WorkerPool':
+        """Size the pool so that concurrent runs cannot exhaust the database pool"""
+        capacity = config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW - config.MONITOR_DB_RESERVED_CONNECTIONS
+        db_limit = max(capacity // max(config.MONITOR_DB_SESSIONS_PER_RUN, 1), 1)
+        workers = config.MONITOR_WORKERS
+        if workers > db_limit:
+            logger.warning(f"Capping monitor workers at {db_limit} (requested {workers}) to fit the database pool")
+            workers = db_limit
+        return cls(workers, config.MONITOR_RUN_TIMEOUT)
+
+    def _ensure_started(self):
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker(len(self._tasks))))
+
+    async def _worker(self, index: int):
+        while True:
+            key, factory, future, enqueued_at = await self._queue.get()
+            started_at = time.monotonic()
+            self._waits.append(started_at - enqueued_at)
+            self.busy += 1
+            try:
+                if future.cancelled():
+                    continue
+                result = await asyncio.wait_for(factory(), timeout=self.run_timeout)
+                if not future.done():
+                    future.set_result(result)
+                self.completed += 1
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                logger.error(f"{self.name} run {key} timed out after {self.run_timeout}s")
+                if not future.done():
+                    future.set_exception(RunTimeoutError(f"{self.name} run {key} timed out"))
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"{self.name} run {key} failed in worker {index}: {str(e)}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.busy -= 1
+                finished_at = time.monotonic()
+                self._durations.append(finished_at - started_at)
+                self._finished_at.append(finished_at)
+                self._queue.task_done()
+
+    def submit(self, key: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Queue a run; `factory` is called by a worker to create the coroutine"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((key, factory, future, time.monotonic()))
+        self.submitted += 1
+        return future
+
+    async def run_all(self, jobs: List[Tuple[str, Callable[[], Awaitable[Any]]]]) -> List[Any]:
+        """Run jobs through the pool, returning results or exceptions in order like gather"""
+        futures = [self.submit(key, factory) for key, factory in jobs]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def state(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        durations = sorted(self._durations)
+        waits = list(self._waits)
+        return {
+            'workers': self.workers,
+            'busy': self.busy,
+            'queue_depth': self._queue.qsize(),
+            'run_timeout': self.run_timeout,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+            'runs_last_minute': sum(1 for finished in self._finished_at if now - finished <= 60),
+            'run_seconds': {
+                'avg': round(sum(durations) / len(durations), 2) if durations else None,
+                'p95': round(durations[int(len(durations) * 0.95)], 2) if durations else None,
+                'max': round(durations[-1], 2) if durations else None
+            },
+            'queue_wait_seconds': round(sum(waits) / len(waits), 2) if waits else None
+        }
+
+
+# Shared by every TweetMonitor in the process
+monitor_pool = WorkerPool.from_config()